@@ -1,34 +1,71 @@
 import json
 import os
+import atexit
+import threading
+from PyQt5.QtCore import QObject, pyqtSignal
+
+# Every Config is a view of one set of settings shared by the whole process: config.json is read once, setters
+# only change memory, and the file is rewritten in the background once the settings have been left alone for
+# SAVE_DELAY seconds. The write goes to a temporary file that then replaces config.json, so the file is never
+# seen half written. Pending changes are written out when the process exits.
+
+SAVE_DELAY = 0.5
+
+DEFAULTS = {
+    "safe_area_size": 0,
+    "text_size": "small",  # Default text size
+    "theme": "dark",       # Default theme
+    "recent_tools": [],    # Default recent tools
+    "tool_usage": {},      # Default tool usage
+    "legacy_encodings": ["shift_jis", "cp1252"],  # Tried for subtitle files that are not UTF-8, double-byte codecs first
+    "conversion_cache_dir": "conversion_cache",  # Relative to this folder; an empty string turns the cache off
+    "conversion_cache_size_mb": 256,
+    "cue_sidecars": True,  # Keep parsed cues of large subtitle files in the conversion cache
+    "cue_sidecars_next_to_source": False  # Keep them in .subtl files next to the subtitle files instead
+}
+
+class ConfigSignals(QObject):
+    # Setting name and its new value, after every setter and for every setting a load() changes
+    changed = pyqtSignal(str, object)
+
+# data: the settings, or None until the first Config; pending: JSON still to be written; timer: the pending write
+SHARED = {"data": None, "signals": None, "pending": None, "timer": None}
+# Guards SHARED; the write lock keeps the background write and save() from writing at the same time
+SHARED_LOCK = threading.RLock()
+WRITE_LOCK = threading.Lock()
 
 class Config:
     CONFIG_FILE = os.path.join(os.path.dirname(__file__), "config.json")
-    
+
     def __init__(self, source=None):
-        self.data = {
-            "safe_area_size": 0,
-            "text_size": "small",  # Default text size
-            "theme": "dark",       # Default theme
-            "recent_tools": [],    # Default recent tools
-            "tool_usage": {}       # Default tool usage
-        }
         self.source = source
-        self.load()
+        with SHARED_LOCK:
+            if SHARED["data"] is None:
+                SHARED["data"] = json.loads(json.dumps(DEFAULTS))
+                SHARED["signals"] = ConfigSignals()
+                self.load()
+                atexit.register(self.flush)
+        self.data = SHARED["data"]
+        self.changed = SHARED["signals"].changed
 
     def load(self):
-        """Load configuration data from the config file."""
+        """Load configuration data from the config file, dropping changes that were not written yet.
+
+        Listeners of changed hear about every setting that comes out different, as if it had been set.
+        """
+        data = json.loads(json.dumps(DEFAULTS))
         if os.path.exists(self.CONFIG_FILE):
             try:
                 with open(self.CONFIG_FILE, "r") as file:
                     loaded_data = json.load(file)
-                
+
                 # Validate loaded data
                 if not isinstance(loaded_data, dict):
                     raise ValueError("Invalid config file: Root element must be a dictionary.")
-                
+
                 # Merge loaded data with defaults to ensure no keys are missing
-                self.data.update(loaded_data)
-            
+                data.update(loaded_data)
+
             except json.JSONDecodeError as decode_error:
                 print(f"Failed to decode JSON: {decode_error}. Using default values.")
             except ValueError as ve:
@@ -36,25 +73,66 @@ class Config:
         else:
             print("Config file does not exist, using default values.")
 
-        if self.source:
-            print(f"Config loaded by {self.source}: {self.data}")
-        else:
-            print(f"Config loaded: {self.data}")
+        with SHARED_LOCK:
+            self.cancel_pending_save()
+            previous = dict(SHARED["data"])
+            # Updated in place, so every Config keeps seeing the same settings
+            SHARED["data"].clear()
+            SHARED["data"].update(data)
+        for key, value in data.items():
+            if key not in previous or previous[key] != value:
+                SHARED["signals"].changed.emit(key, value)
+
     def save(self):
-        """Save configuration data to the config file."""
-        try:
-            with open(self.CONFIG_FILE, "w") as file:
-                json.dump(self.data, file, indent=4)
-                file.flush()  # Ensure data is written to disk
-                os.fsync(file.fileno())  # Ensure file is fully written and closed
-            
-            if self.source:
-                print(f"Config saved by {self.source}: {self.data}")
-            else:
-                print(f"Config saved: {self.data}")
-        
-        except Exception as e:
-            print(f"Failed to save config file: {e}")
+        """Save configuration data to the config file right away."""
+        with SHARED_LOCK:
+            self.cancel_pending_save()
+            SHARED["pending"] = json.dumps(SHARED["data"], indent=4)
+        self.flush()
+
+    def schedule_save(self):
+        """Saves the settings as they are now once they have not changed for SAVE_DELAY seconds."""
+        with SHARED_LOCK:
+            # Serialized here rather than in the background, where a setter could change the settings mid-dump
+            SHARED["pending"] = json.dumps(SHARED["data"], indent=4)
+            if SHARED["timer"] is not None:
+                SHARED["timer"].cancel()
+            SHARED["timer"] = threading.Timer(SAVE_DELAY, self.flush)
+            SHARED["timer"].daemon = True
+            SHARED["timer"].start()
+
+    def cancel_pending_save(self):
+        with SHARED_LOCK:
+            if SHARED["timer"] is not None:
+                SHARED["timer"].cancel()
+                SHARED["timer"] = None
+            SHARED["pending"] = None
+
+    def flush(self):
+        """Writes pending changes to the config file, if there are any."""
+        with WRITE_LOCK:
+            with SHARED_LOCK:
+                content = SHARED["pending"]
+                SHARED["pending"] = None
+                SHARED["timer"] = None
+            if content is None:
+                return
+            temporary_file = self.CONFIG_FILE + ".tmp"
+            try:
+                with open(temporary_file, "w") as file:
+                    file.write(content)
+                    file.flush()
+                    os.fsync(file.fileno())  # On disk before it replaces the old file
+                os.replace(temporary_file, self.CONFIG_FILE)
+            except Exception as e:
+                print(f"Failed to save config file: {e}")
+
+    def set_value(self, key, value):
+        """Changes one setting, tells the listeners of changed about it and schedules a save."""
+        with SHARED_LOCK:
+            self.data[key] = value
+        self.schedule_save()
+        self.changed.emit(key, value)
 
     def get_safe_area_size(self):
         return self.data.get("safe_area_size", 0)
@@ -62,8 +140,7 @@ class Config:
     def set_safe_area_size(self, size):
         if not isinstance(size, int):
             raise ValueError(f"Invalid type for safe_area_size: Expected int, got {type(size).__name__}")
-        self.data["safe_area_size"] = size
-        self.save()
+        self.set_value("safe_area_size", size)
 
     def get_text_size(self):
         return self.data.get("text_size", "small")
@@ -71,8 +148,7 @@ class Config:
     def set_text_size(self, size):
         if not isinstance(size, str):
             raise ValueError(f"Invalid type for text_size: Expected str, got {type(size).__name__}")
-        self.data["text_size"] = size
-        self.save()
+        self.set_value("text_size", size)
 
     def get_theme(self):
         return self.data.get("theme", "dark")
@@ -80,8 +156,7 @@ class Config:
     def set_theme(self, theme):
         if not isinstance(theme, str):
             raise ValueError(f"Invalid type for theme: Expected str, got {type(theme).__name__}")
-        self.data["theme"] = theme
-        self.save()
+        self.set_value("theme", theme)
 
     def get_tool_usage(self):
         return self.data.get("tool_usage", {})
@@ -89,8 +164,51 @@ class Config:
     def set_tool_usage(self, tool_usage):
         if not isinstance(tool_usage, dict):
             raise ValueError(f"Invalid type for tool_usage: Expected dict, got {type(tool_usage).__name__}")
-        self.data["tool_usage"] = tool_usage
-        self.save()
+        self.set_value("tool_usage", tool_usage)
+
+    def get_legacy_encodings(self):
+        return self.data.get("legacy_encodings", ["shift_jis", "cp1252"])
+
+    def set_legacy_encodings(self, encodings):
+        if not isinstance(encodings, list):
+            raise ValueError(f"Invalid type for legacy_encodings: Expected list, got {type(encodings).__name__}")
+        self.set_value("legacy_encodings", encodings)
+
+    def get_conversion_cache_dir(self):
+        """Absolute path of the conversion cache folder, or None when the cache is off."""
+        directory = self.data.get("conversion_cache_dir", "conversion_cache")
+        if not directory:
+            return None
+        return os.path.join(os.path.dirname(self.CONFIG_FILE), directory)
+
+    def set_conversion_cache_dir(self, directory):
+        if not isinstance(directory, str):
+            raise ValueError(f"Invalid type for conversion_cache_dir: Expected str, got {type(directory).__name__}")
+        self.set_value("conversion_cache_dir", directory)
+
+    def get_conversion_cache_size_mb(self):
+        return self.data.get("conversion_cache_size_mb", 256)
+
+    def set_conversion_cache_size_mb(self, size):
+        if not isinstance(size, int):
+            raise ValueError(f"Invalid type for conversion_cache_size_mb: Expected int, got {type(size).__name__}")
+        self.set_value("conversion_cache_size_mb", size)
+
+    def get_cue_sidecars(self):
+        return self.data.get("cue_sidecars", True)
+
+    def set_cue_sidecars(self, enabled):
+        if not isinstance(enabled, bool):
+            raise ValueError(f"Invalid type for cue_sidecars: Expected bool, got {type(enabled).__name__}")
+        self.set_value("cue_sidecars", enabled)
+
+    def get_cue_sidecars_next_to_source(self):
+        return self.data.get("cue_sidecars_next_to_source", False)
+
+    def set_cue_sidecars_next_to_source(self, enabled):
+        if not isinstance(enabled, bool):
+            raise ValueError(f"Invalid type for cue_sidecars_next_to_source: Expected bool, got {type(enabled).__name__}")
+        self.set_value("cue_sidecars_next_to_source", enabled)
 
     def get_recent_tools(self):
         return self.data.get("recent_tools", [])
@@ -98,5 +216,4 @@ class Config:
     def set_recent_tools(self, recent_tools):
         if not isinstance(recent_tools, list):
             raise ValueError(f"Invalid type for recent_tools: Expected list, got {type(recent_tools).__name__}")
-        self.data["recent_tools"] = recent_tools
-        self.save()
+        self.set_value("recent_tools", recent_tools)
@@ -1,7 +1,6 @@
 from PyQt5.QtWidgets import QWidget, QHBoxLayout, QPushButton, QTabBar, QApplication, QSpacerItem, QSizePolicy
 from PyQt5.QtCore import Qt, QPoint
 from PyQt5.QtGui import QPalette, QColor, QCursor
-import qtawesome as qta 
 
 class CustomWindowBar(QWidget):
     def __init__(self, parent=None, app=None):
@@ -13,6 +12,7 @@ class CustomWindowBar(QWidget):
         self.resize_handle_size = 5  # Size of the resize handle (smaller for better sensitivity)
         self.pressing = False  # Tracks if the mouse is pressed
         self.start = QPoint(0, 0)  # Tracks the initial mouse position
+        self.icons_loaded = False  # The icon font loads after the first frame, see load_icons()
         self.current_palette()
 
         self.init_ui()
@@ -136,7 +136,7 @@ class CustomWindowBar(QWidget):
         self.tab_bar.tabButton = lambda index, button_type: self._tab_button_wrapper(index, button_type)
 
         # Add the "add tab" button directly to the right of the tabs
-        self.new_tab_button = QPushButton(qta.icon('fa.plus'), '')
+        self.new_tab_button = QPushButton('')
         self.new_tab_button.setFixedSize(50, 50)
         self.new_tab_button.clicked.connect(lambda: self.add_tab("Subtl"))  # Change tab name to "Subtl"
         self.layout.addWidget(self.new_tab_button)
@@ -157,27 +157,43 @@ class CustomWindowBar(QWidget):
         return QTabBar.tabButton(self.tab_bar, index, button_type)
 
     def create_close_button(self, index):
-        close_button = QPushButton(qta.icon('fa.close'), '')
+        close_button = QPushButton('')
+        if self.icons_loaded:
+            import qtawesome as qta
+            close_button.setIcon(qta.icon('fa.close'))
         close_button.setFixedSize(20, 20)
         close_button.clicked.connect(lambda: self.tab_bar.tabCloseRequested.emit(index))
         return close_button
 
     def create_buttons(self):
-        self.min_button = QPushButton(qta.icon('fa.window-minimize'), '')
+        self.min_button = QPushButton('')
         self.min_button.setFixedSize(50, 50)
         self.min_button.clicked.connect(self.parent.showMinimized)
         self.layout.addWidget(self.min_button)
 
-        self.max_button = QPushButton(qta.icon('fa.window-maximize'), '')
+        self.max_button = QPushButton('')
         self.max_button.setFixedSize(50, 50)
         self.max_button.clicked.connect(self.toggle_maximize_restore)
         self.layout.addWidget(self.max_button)
 
-        self.close_button = QPushButton(qta.icon('fa.close'), '')
+        self.close_button = QPushButton('')
         self.close_button.setFixedSize(50, 50)
         self.close_button.clicked.connect(self.parent.close)
         self.layout.addWidget(self.close_button)
 
+    def load_icons(self):
+        """Puts the icons on the buttons; called once the window is on screen, as loading the icon font is slow."""
+        import qtawesome as qta
+        self.icons_loaded = True
+        self.new_tab_button.setIcon(qta.icon('fa.plus'))
+        self.min_button.setIcon(qta.icon('fa.window-minimize'))
+        self.max_button.setIcon(qta.icon('fa.window-maximize'))
+        self.close_button.setIcon(qta.icon('fa.close'))
+        for index in range(self.tab_bar.count()):
+            close_button = self.tab_bar.tabButton(index, QTabBar.RightSide)
+            if close_button is not None:
+                close_button.setIcon(qta.icon('fa.close'))
+
     def add_tab(self, title):
         self.tab_bar.addTab(title)
         self.tab_bar.setCurrentIndex(self.tab_bar.count() - 1)
@@ -0,0 +1,156 @@
+# assets/modules/job_runner.py
+import threading
+from PyQt5.QtWidgets import QWidget, QHBoxLayout, QLabel, QPushButton, QProgressBar
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QPalette
+
+# Per-cue progress is only sent every this many cues so the GUI thread is not flooded
+CUE_REPORT_INTERVAL = 1000
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job once the user has asked to cancel it."""
+
+
+class JobSignals(QObject):
+    progress = pyqtSignal(int, int, str)  # files done, files total, current file name
+    cue_progress = pyqtSignal(int)  # cues handled in the current file
+    finished = pyqtSignal(object)  # whatever the job function returned
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+
+class Job(QRunnable):
+    """Runs function(*args, job=self, **kwargs) on the global thread pool and reports back through signals."""
+
+    def __init__(self, function, *args, **kwargs):
+        super().__init__()
+        # The widget keeps a reference so cancel() can still be called after run() returns
+        self.setAutoDelete(False)
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = JobSignals()
+        self.cancel_event = threading.Event()
+        self.cue_count = 0
+
+    def run(self):
+        try:
+            result = self.function(*self.args, job=self, **self.kwargs)
+        except JobCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def check_cancelled(self):
+        if self.cancel_event.is_set():
+            raise JobCancelled()
+
+    def report(self, done, total, message=""):
+        """Reports per-file progress; also the point where a cancelled job stops."""
+        self.check_cancelled()
+        self.cue_count = 0
+        self.signals.progress.emit(done, total, message)
+
+    def tick(self):
+        """Counts one handled cue, reporting every CUE_REPORT_INTERVAL cues."""
+        self.check_cancelled()
+        self.cue_count += 1
+        if self.cue_count % CUE_REPORT_INTERVAL == 0:
+            self.signals.cue_progress.emit(self.cue_count)
+
+    def track(self, cues):
+        """Passes cues through unchanged while reporting per-cue progress and honouring cancellation."""
+        for cue in cues:
+            self.tick()
+            yield cue
+        self.signals.cue_progress.emit(self.cue_count)
+
+
+class JobProgress(QWidget):
+    """A progress bar with a Cancel button that follows one running job at a time."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.job = None
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label, 2)
+
+        self.progress_bar = QProgressBar()
+        layout.addWidget(self.progress_bar, 3)
+
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.cancel)
+        layout.addWidget(self.cancel_button)
+
+        if parent is not None:
+            palette = parent.palette()
+            text_color = palette.color(QPalette.WindowText).name()
+            button_color = palette.color(QPalette.Button).name()
+            button_text_color = palette.color(QPalette.ButtonText).name()
+            self.status_label.setStyleSheet(f"color: {text_color};")
+            self.progress_bar.setStyleSheet(f"color: {text_color};")
+            self.cancel_button.setStyleSheet(f"background-color: {button_color}; color: {button_text_color}; border-radius: 5px; padding: 5px 10px;")
+
+        self.hide()
+
+    def is_running(self):
+        return self.job is not None
+
+    def start(self, function, *args, on_finished=None, on_failed=None, on_cancelled=None, **kwargs):
+        """Starts function in the background; the callbacks run on the GUI thread when it is done."""
+        if self.is_running():
+            return None
+
+        job = Job(function, *args, **kwargs)
+        job.signals.progress.connect(self.update_progress)
+        job.signals.cue_progress.connect(self.update_cue_progress)
+        for signal, callback in ((job.signals.finished, on_finished), (job.signals.failed, on_failed), (job.signals.cancelled, on_cancelled)):
+            signal.connect(self.stop)
+            if callback is not None:
+                signal.connect(callback)
+
+        self.job = job
+        # Closing the tool destroys this widget with it; the job must not go on writing files with no UI left
+        self.destroyed.connect(job.cancel)
+        self.current_file = ""
+        self.progress_bar.setRange(0, 0)  # Busy indicator until the first report arrives
+        self.status_label.setText("Working...")
+        self.cancel_button.setEnabled(True)
+        self.show()
+        QThreadPool.globalInstance().start(job)
+        return job
+
+    def cancel(self):
+        if self.job is not None:
+            self.job.cancel()
+            self.cancel_button.setEnabled(False)
+            self.status_label.setText("Cancelling...")
+
+    def stop(self, *args):
+        if self.job is not None:
+            self.destroyed.disconnect(self.job.cancel)
+        self.job = None
+        self.hide()
+
+    def update_progress(self, done, total, message):
+        self.current_file = message
+        if total:
+            self.progress_bar.setRange(0, total)
+            self.progress_bar.setValue(done)
+        self.status_label.setText(message)
+
+    def update_cue_progress(self, count):
+        if self.current_file:
+            self.status_label.setText(f"{self.current_file}: {count} cues")
+        else:
+            self.status_label.setText(f"{count} cues")
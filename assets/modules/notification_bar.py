@@ -2,12 +2,12 @@
 from PyQt5.QtWidgets import QWidget, QHBoxLayout, QLabel, QPushButton, QFrame
 from PyQt5.QtCore import Qt, QTimer, QPropertyAnimation, QRect, QEasingCurve
 from PyQt5.QtGui import QPalette, QFontMetrics
-import qtawesome as qta  # Import QtAwesome for icons
 
 
 class NotificationBar(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
+        import qtawesome as qta  # Imported here so starting the app does not wait for the icon font
 
         # Main layout
         self.layout = QHBoxLayout(self)
@@ -18,6 +18,8 @@ class Settings(QWidget):
         self.setFont(QFont("Inter Regular"))
         self.config = Config(source="Settings")
         self.initial_theme = self.config.get_theme()
+        # Only goes into the shared config once the settings are saved
+        self.selected_theme = self.initial_theme
         self.init_ui()
 
     def init_ui(self):
@@ -173,7 +175,7 @@ class Settings(QWidget):
         current_state = self.theme_toggle.get_state()
         new_state = "light" if current_state == "dark" else "dark"
         self.theme_toggle.set_state(new_state)
-        self.config.data["theme"] = new_state
+        self.selected_theme = new_state
         self.apply_theme()
 
     def apply_theme(self):
@@ -184,9 +186,8 @@ class Settings(QWidget):
         # Save the settings
         self.config.set_safe_area_size(self.safe_area_slider.value())
         self.config.set_text_size(self.text_size_dropdown.currentText())
-        self.config.set_theme(self.config.data["theme"])
+        self.config.set_theme(self.selected_theme)
         self.config.save()
-        self.config.load()
         # Check if the theme has changed
         self.new_theme = self.config.get_theme()
         if self.initial_theme != self.new_theme:
@@ -219,6 +220,7 @@ class Settings(QWidget):
             else:
                 self.config.set_theme(self.initial_theme)
                 self.theme_toggle.set_state(self.initial_theme)  # Update toggle position
+                self.selected_theme = self.initial_theme
                 self.config.save()
                 # If the user chooses not to relaunch, just refresh the settings
                 if self.main_window is not None:
@@ -399,6 +401,7 @@ class Settings(QWidget):
                     # Revert to the original theme if the user chooses not to relaunch
                     self.config.set_theme(current_theme)
                     self.theme_toggle.set_state(current_theme)  # Update toggle position
+                    self.selected_theme = current_theme
                     self.config.save()
 
             QMessageBox.information(self, "Load Successful", "Settings loaded successfully.")
@@ -414,3 +417,4 @@ class Settings(QWidget):
         self.safe_area_value_label.setText(f"{self.config.get_safe_area_size()} px")
         self.text_size_dropdown.setCurrentText(self.config.get_text_size())
         self.theme_toggle.set_state(self.config.get_theme())
+        self.selected_theme = self.config.get_theme()
@@ -0,0 +1,28 @@
+# assets/modules/startup_trace.py
+import time
+
+# Time spent in each startup phase, measured from when main.py starts importing. Turned on with --trace-startup,
+# which prints one line per phase once the main menu is up, so a slower start shows up as a bigger number.
+TRACE = {"enabled": False, "start": time.perf_counter(), "last": time.perf_counter(), "phases": []}
+
+
+def enable_trace():
+    TRACE["enabled"] = True
+
+
+def mark(phase):
+    """Ends phase: everything since the previous mark is counted towards it."""
+    if not TRACE["enabled"]:
+        return
+    now = time.perf_counter()
+    TRACE["phases"].append((phase, now - TRACE["last"]))
+    TRACE["last"] = now
+
+
+def report():
+    if not TRACE["enabled"]:
+        return
+    print("Startup trace:")
+    for phase, seconds in TRACE["phases"]:
+        print(f"  {phase:<24}{seconds * 1000:8.1f} ms")
+    print(f"  {'total':<24}{(TRACE['last'] - TRACE['start']) * 1000:8.1f} ms")
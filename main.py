@@ -1,17 +1,67 @@
 import sys
-import qtawesome as qta
+# First, so the startup trace counts the imports below
+from assets.modules.startup_trace import enable_trace, mark, report
 from PyQt5.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QPushButton, QWidget, QLabel, QScrollArea, QMessageBox, QSplitter, QFrame, QStackedWidget, QLineEdit, QGridLayout, QSizePolicy
 from PyQt5.QtGui import QPalette, QColor, QFont, QFontDatabase
 from PyQt5.QtCore import Qt, QPropertyAnimation, QPoint, QTimer 
 
-from tools.subtitle_converter import SubtitleConverter
-from tools.subtitle_shifter import SubtitleShifter
 from assets.modules.side_panel import SidePanel
-from assets.modules.settings import Settings
 from assets.modules.config import Config
 from assets.modules.custom_window_bar import CustomWindowBar  # Import the CustomWindowBar
 from assets.modules.notification_bar import NotificationBar  # Import the NotificationBar
 
+# A tool's module is only imported when the tool is opened. Each import is a literal one inside its own loader,
+# so that PyInstaller still finds the tool modules for the frozen build.
+def load_longer_appearance():
+    from tools.longer_appearance import LongerAppearanceSRT
+    return LongerAppearanceSRT
+
+def load_merge_srt():
+    from tools.merge_srt import MergeSRT
+    return MergeSRT
+
+def load_subtitle_converter():
+    from tools.subtitle_converter import SubtitleConverter
+    return SubtitleConverter
+
+def load_subtitle_shifter():
+    from tools.subtitle_shifter import SubtitleShifter
+    return SubtitleShifter
+
+def load_multilingual_tool():
+    from tools.multilingual_tool import MultilingualTool
+    return MultilingualTool
+
+# Tool name -> loader returning its widget class
+TOOL_WIDGETS = {
+    "Longer Appearance SRT": load_longer_appearance,
+    "Merge SRT Files": load_merge_srt,
+    "Subtitle Converter": load_subtitle_converter,
+    "Subtitle Shifter": load_subtitle_shifter,
+    "Multilingual Merge": load_multilingual_tool,
+}
+
+# (name, description, categories) of every tool on the main menu, in menu order
+TOOLS = [
+    ("Longer Appearance SRT", "Increase the duration each subtitle appears.", ["appearance", "timing"]),
+    ("Merge SRT Files", "Combine multiple SRT files into one.", ["merge"]),
+    ("Subtitle Converter", "Convert subtitles between different formats.", ["conversion"]),
+    ("Subtitle Shifter", "Shift subtitles by milliseconds.", ["timing"]),
+    ("Multilingual Merge", "Merge subtitles in different languages with colors.", ["merge", "translation"]),
+    ("Coming Soon", "More tools will be added in the future.", ["other"])
+]
+TOOLS_BY_NAME = {name: (description, categories) for name, description, categories in TOOLS}
+
+# A placeholder emoji for each tool (you can customize these later)
+TOOL_EMOJIS = {
+    "Longer Appearance SRT": "⏳",
+    "Merge SRT Files": "✨",
+    "Subtitle Converter": "🔄",
+    "Subtitle Shifter": "➡️",
+    "Multilingual Merge": "🌍",
+    "Coming Soon": "🚀"
+}
+
 class MainWindow(QMainWindow):
     def __init__(self, app):
         super().__init__()
@@ -32,8 +82,14 @@ class MainWindow(QMainWindow):
         self.inter_regular_font = QFont("Inter Regular")
         self.inter_extra_bold_font = QFont("Inter ExtraBold")
 
-        self.active_categories = set()
-        self.category_buttons = {}
+        # Tab splitter -> its MainMenu, built the first time the tab shows the menu
+        self.menus = {}
+        # Hover popup shared by every tool button of every menu, created on the first hover
+        self.description_label = None
+
+        # The settings shared by the whole app; every Config() elsewhere sees the same values
+        self.config = Config(source="MainWindow")
+        self.config.changed.connect(self.config_changed)
 
         self.apply_theme()
 
@@ -41,15 +97,18 @@ class MainWindow(QMainWindow):
         self.layout = QVBoxLayout(self.central_widget)
         self.setCentralWidget(self.central_widget)
 
-        self.config = Config(source="MainWindow")
         self.main_menu_active = True
+        # Set up when the first tool opens, which is when the subtitle modules are first imported
+        self.subtitle_reading_configured = False
+        mark("config and theme")
 
+        # Until the first frame is painted, tabs get no menu and the window bar no icons; finish_startup() adds them
+        self.startup_done = False
         self.custom_window_bar = CustomWindowBar(self, self.app)
         self.layout.addWidget(self.custom_window_bar)
 
         self.custom_window_bar.setup_initial_tabs()  # Add this line to create initial tabs
 
-        self.tab_contents = QStackedWidget()
         self.layout.addWidget(self.tab_contents)
 
         self.side_panel = SidePanel(self, self.open_settings)
@@ -63,11 +122,42 @@ class MainWindow(QMainWindow):
         self.top_bar = QHBoxLayout()
         self.top_bar_added = False
         self.menu_button = None
-
-        self.create_new_tab_content()
+        mark("window bar and tabs")
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.startup_done and not hasattr(self, 'first_frame_painted'):
+            self.first_frame_painted = True
+            mark("first frame")
+            # Runs once the event loop is idle, after the frame is on screen
+            QTimer.singleShot(0, self.finish_startup)
+
+    def finish_startup(self):
+        """Loads what the first frame did without: the icon font and the main menu of the open tab."""
+        self.custom_window_bar.load_icons()
+        mark("icon font")
+        self.startup_done = True
+        self.main_menu()
+        mark("main menu")
+        report()
+
+    def configure_subtitle_reading(self):
+        # Imported here: the subtitle modules bring numpy along, which the first frame has no use for
+        from tools.subtitleconverter.decoding import set_legacy_encodings
+        from tools.subtitleconverter.cache import configure_cache
+        from tools.subtitleconverter.sidecar import configure_sidecars
+        self.subtitle_reading_configured = True
+        set_legacy_encodings(self.config.get_legacy_encodings())
+        configure_cache(self.config.get_conversion_cache_dir(), self.config.get_conversion_cache_size_mb() * 1024 * 1024)
+        configure_sidecars(self.config.get_cue_sidecars(), next_to_source=self.config.get_cue_sidecars_next_to_source())
+
+    def config_changed(self, key, value):
+        if key in ("legacy_encodings", "conversion_cache_dir", "conversion_cache_size_mb", "cue_sidecars",
+                   "cue_sidecars_next_to_source"):
+            if self.subtitle_reading_configured:
+                self.configure_subtitle_reading()
 
     def apply_theme(self):
-        self.config = Config(source="MainWindow")
         theme = self.config.get_theme()
         print(f"Applying theme: {theme}")
         palette = QPalette()
@@ -138,92 +228,279 @@ class MainWindow(QMainWindow):
         self.tab_contents.addWidget(new_splitter)
         self.tab_contents.setCurrentWidget(new_splitter)
 
-        # Replicate the main menu layout in the new tab
-        self.main_menu(new_main_content_layout)
+        # Replicate the main menu layout in the new tab; the tabs made at startup get theirs in finish_startup()
+        if self.startup_done:
+            self.main_menu()
 
     def remove_tab_content(self, index):
         widget = self.tab_contents.widget(index)
         if widget is not None:
+            self.menus.pop(widget, None)
             self.tab_contents.removeWidget(widget)
             widget.deleteLater()  # Clean up the widget
 
     def display_tab_content(self, index):
         self.tab_contents.setCurrentIndex(index)
 
-    def main_menu(self, layout=None):
+    def main_menu(self):
         # Get the current main content layout for the active tab
         current_splitter = self.tab_contents.currentWidget()
         if current_splitter is not None:
             main_content = current_splitter.widget(1)  # Main content is the second widget in the splitter
             main_content_layout = main_content.layout()
             self.main_menu_active = True
-            # Clear the existing layout
+
+            # The menu is built once per tab and kept while tools are open; coming back only refreshes
+            # the Most Used and Recent rows
+            menu = self.menus.get(current_splitter)
+            if menu is None:
+                self.apply_text_size()
+                menu = MainMenu(self, main_content)
+                self.menus[current_splitter] = menu
+                # Forgotten when its tab goes away with it, unless a newer menu has taken its place by then
+                menu.destroyed.connect(lambda _=None, splitter=current_splitter, menu=menu: self.forget_menu(splitter, menu))
+            else:
+                menu.refresh_sections()
+
+            # Clear the existing layout (the tool that was open) and put the menu back
             self.clear_layout(main_content_layout)
+            main_content_layout.addWidget(menu)
+            menu.show()
+
+    def current_menu(self):
+        """The MainMenu of the active tab, or None if it has not shown its menu yet."""
+        return self.menus.get(self.tab_contents.currentWidget())
+
+    def description_popup(self):
+        """The window's one tool description popup, created the first time a tool button is hovered."""
+        if self.description_label is None:
+            self.description_label = QLabel(self)
+            self.description_label.setWordWrap(True)
+            self.description_label.setFixedSize(300, 200)
+            self.description_label.hide()
+        return self.description_label
+
+    def hide_description(self):
+        if self.description_label is not None:
+            self.description_label.hide()
+
+    def invalidate_menus(self):
+        """Drops the cached menus that are not on screen, so they are rebuilt with the current theme and text size."""
+        for splitter, menu in list(self.menus.items()):
+            if menu.isHidden():
+                del self.menus[splitter]
+                menu.deleteLater()
+
+    def forget_menu(self, splitter, menu):
+        """Drops the cached menu of splitter once menu is destroyed, if it is still the one cached."""
+        if self.menus.get(splitter) is menu:
+            del self.menus[splitter]
 
-            # Add the top bar with the menu button
-            top_bar_widget = QWidget()
-            self.top_bar = QHBoxLayout(top_bar_widget)
-            self.top_bar.setContentsMargins(0, 0, 0, 0)
-
-            self.menu_button = QPushButton()
-            menu_icon = qta.icon('fa.bars')
-            self.menu_button.setIcon(menu_icon)
-            self.menu_button.setFixedSize(30, 30)
-            self.menu_button.setStyleSheet("color: {button_text_color}; background-color: transparent; border: none; border-radius: 3px;")
-            self.menu_button.clicked.connect(self.toggle_side_panel)
-
-            self.search_field = QLineEdit()
-            self.search_field.setPlaceholderText("Search tools...")
-            self.search_field.setFixedWidth(700)
-            
-            palette = self.app.palette()
-            self.text_color = palette.color(QPalette.Text).name()
-            self.background_color = palette.color(QPalette.Base).name()
-            self.placeholder_color = palette.color(QPalette.PlaceholderText).name()
-            self.button_color = palette.color(QPalette.Button).name()
-            self.button_text_color = palette.color(QPalette.ButtonText).name()
-            self.highlight_color = self.app.palette().color(QPalette.Highlight).name()
-            self.base_color = self.app.palette().color(QPalette.Base).name()
-            self.text_color = self.app.palette().color(QPalette.Text).name()
-            self.highlight_text_color = self.app.palette().color(QPalette.HighlightedText).name()
-            self.border_color = palette.color(QPalette.Highlight).name()
-            self.button_color = palette.color(QPalette.Button).name()
-            self.hover_background_color = palette.color(QPalette.Highlight).name()
-            self.hover_border_color = palette.color(QPalette.Highlight).darker().name()
-            
-            search_icon = qta.icon('fa5s.search', color=self.text_color)
-            self.search_field.addAction(search_icon, QLineEdit.LeadingPosition)
-            self.search_field.setStyleSheet(f"""
-                QLineEdit {{
-                    background-color: {self.button_color};
-                    color: {self.button_text_color};
-                    border: 2px solid {self.highlight_color};
-                    border-radius: 20px;
-                    padding: 5px 5px 5px 35px;
-                }}
-                QLineEdit::placeholder {{
-                    color: {self.placeholder_color};
-                }}
-            """)
-
-            self.search_field.textChanged.connect(self.filter_tools)
-
-            self.top_bar.addWidget(self.menu_button, alignment=Qt.AlignLeft)
-            self.top_bar.addWidget(self.search_field, alignment=Qt.AlignRight)
-            main_content_layout.addWidget(top_bar_widget)
-    
-            # Add the NotificationBar below the top bar
-            self.notification_bar = NotificationBar(self)
-            if hasattr(self, 'notification_bar'):
-                main_content_layout.addWidget(self.notification_bar)
-    
-            # Add categories and tools dynamicallym
-            self.add_categories_and_tools(main_content_layout)
-    
-            # Apply theme and text size
-            self.apply_text_size()
-            self.apply_theme()
-            self.update_tool_button_visibility()
+    def tool_selected(self, tool_name):
+        tool_usage = dict(self.config.get_tool_usage())
+        tool_usage[tool_name] = tool_usage.get(tool_name, 0) + 1
+
+        # Update recent tools
+        recent_tools = [tool_name] + [name for name in self.config.get_recent_tools() if name != tool_name]
+
+        self.config.set_tool_usage(tool_usage)
+        self.config.set_recent_tools(recent_tools[:3])
+
+        menu = self.current_menu()
+        if menu is not None:
+            menu.notification_bar.add_notification("⏰", f"Reminder: You last used the {tool_name} tool just now.")
+        # Get the current splitter for the active tab
+        current_splitter = self.tab_contents.currentWidget()
+        if current_splitter is not None:
+            # Get the main content widget for the current tab
+            main_content = current_splitter.widget(1)  # Main content is the second widget in the splitter
+            main_content_layout = main_content.layout()
+            if tool_name in TOOL_WIDGETS:
+                if not self.subtitle_reading_configured:
+                    self.configure_subtitle_reading()
+                tool_class = TOOL_WIDGETS[tool_name]()
+                tool_widget = tool_class(parent=main_content, back_callback=self.main_menu)
+                if tool_name == "Longer Appearance SRT":
+                    tool_widget.setFont(self.inter_regular_font)
+                self.load_tool(tool_widget, main_content_layout)
+            else:
+                msg_box = QMessageBox()
+                msg_box.setText("More tools will be added soon!")
+                msg_box.setWindowTitle("Coming Soon!")
+                msg_box.setStyleSheet("""
+                QMessageBox {
+                color: black;
+                }
+                QMessageBox QLabel {
+                color: black;
+                }
+                QMessageBox QPushButton {
+                color: black;
+                }
+                """)
+                msg_box.exec_()
+                # The menu stays up, so show the new usage right away
+                if menu is not None:
+                    menu.refresh_sections()
+                return
+
+    def clear_layout(self, layout):
+        while layout.count():
+            child = layout.takeAt(0)
+            if isinstance(child.widget(), MainMenu):
+                # Cached for the next return home, so only taken off screen
+                child.widget().hide()
+            elif child.widget():
+                child.widget().deleteLater()
+
+    def load_tool(self, tool_widget, layout):
+        self.main_menu_active = False
+
+            # Clear the existing layout
+        while layout.count():
+            child = layout.takeAt(0)  # Remove items sequentially
+            if isinstance(child.widget(), MainMenu):
+                child.widget().hide()  # Kept for the next return home
+            elif child.widget():
+                child.widget().deleteLater()  # Properly destroy widgets
+            elif child.layout():
+                # Recursively clear nested layouts (if any exist)
+                self.clear_layout(child.layout())
+        # Add the tool widget to the layout
+        layout.addWidget(tool_widget)
+        tool_widget.show()
+
+    def toggle_side_panel(self):
+        # Get the current splitter for the active tab
+        current_splitter = self.tab_contents.currentWidget()
+        if current_splitter is not None:
+            side_panel = current_splitter.widget(0)  # Side panel is the first widget in the splitter
+            if side_panel.isVisible():
+                current_splitter.setSizes([0, 1])  # Hide the side panel
+                side_panel.setVisible(False)
+            else:
+                side_panel.setVisible(True)
+                current_splitter.setSizes([self.width() // 2, self.width() // 2])  # Show the side panel
+
+    def open_settings(self, item=None):
+        # Get the current splitter for the active tab
+        current_splitter = self.tab_contents.currentWidget()
+        if current_splitter is not None:
+            # Get the main content widget for the current tab
+            main_content = current_splitter.widget(1)  # Main content is the second widget in the splitter
+            main_content_layout = main_content.layout()
+
+            # Create the settings widget
+            from assets.modules.settings import Settings
+            settings_widget = Settings(parent=self.main_content, back_callback=self.main_menu, main_window=self)
+            settings_widget.setFont(self.inter_regular_font)
+            settings_widget.settings_saved.connect(self.apply_theme)
+
+            # Load the settings widget into the current tab's main content layout
+            self.load_tool(settings_widget, main_content_layout)
+
+    def apply_text_size(self):
+        text_size = self.config.get_text_size()
+        font_size = {
+            "small": 18,
+            "default": 26,
+            "large": 34,
+            "huge": 42
+        }.get(text_size, 26)
+
+        self.setStyleSheet(f"""
+            * {{
+                font-size: {font_size}px;
+            }}
+        """)
+
+    def refresh_settings(self):
+        print("refreshing the settings")
+        self.apply_text_size()  # Update text size
+        self.apply_theme()  # Update theme
+        self.invalidate_menus()  # Their styles were built from the old settings
+
+        self.custom_window_bar.current_palette()
+        self.custom_window_bar.update_colors()
+        self.side_panel.current_palette()
+        self.side_panel.update_colors()
+
+class MainMenu(QWidget):
+    """The home screen of one tab: top bar, notifications, category filters and tool sections.
+
+    Built once per tab and kept while a tool is open; refresh_sections() brings Most Used and Recent up to date.
+    """
+
+    def __init__(self, main_window, parent=None):
+        super().__init__(parent)
+        self.main_window = main_window
+        self.active_categories = set()
+        self.category_buttons = {}
+        self.tool_buttons = []
+        # Per section: the tool names shown and every button the section has created so far, by tool name
+        self.section_tools = {"most_used": [], "recent": []}
+        self.section_buttons = {"most_used": {}, "recent": {}}
+
+        palette = main_window.app.palette()
+        self.text_color = palette.color(QPalette.Text).name()
+        self.placeholder_color = palette.color(QPalette.PlaceholderText).name()
+        self.button_color = palette.color(QPalette.Button).name()
+        self.button_text_color = palette.color(QPalette.ButtonText).name()
+        self.highlight_color = palette.color(QPalette.Highlight).name()
+        self.base_color = palette.color(QPalette.Base).name()
+        self.highlight_text_color = palette.color(QPalette.HighlightedText).name()
+        self.hover_background_color = palette.color(QPalette.Highlight).name()
+        self.hover_border_color = palette.color(QPalette.Highlight).darker().name()
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        # Add the top bar with the menu button
+        top_bar_widget = QWidget()
+        top_bar = QHBoxLayout(top_bar_widget)
+        top_bar.setContentsMargins(0, 0, 0, 0)
+
+        import qtawesome as qta  # Loaded by finish_startup() before the first menu is built
+        self.menu_button = QPushButton()
+        menu_icon = qta.icon('fa.bars')
+        self.menu_button.setIcon(menu_icon)
+        self.menu_button.setFixedSize(30, 30)
+        self.menu_button.setStyleSheet("color: {button_text_color}; background-color: transparent; border: none; border-radius: 3px;")
+        self.menu_button.clicked.connect(main_window.toggle_side_panel)
+
+        self.search_field = QLineEdit()
+        self.search_field.setPlaceholderText("Search tools...")
+        self.search_field.setFixedWidth(700)
+
+        search_icon = qta.icon('fa5s.search', color=self.text_color)
+        self.search_field.addAction(search_icon, QLineEdit.LeadingPosition)
+        self.search_field.setStyleSheet(f"""
+            QLineEdit {{
+                background-color: {self.button_color};
+                color: {self.button_text_color};
+                border: 2px solid {self.highlight_color};
+                border-radius: 20px;
+                padding: 5px 5px 5px 35px;
+            }}
+            QLineEdit::placeholder {{
+                color: {self.placeholder_color};
+            }}
+        """)
+
+        self.search_field.textChanged.connect(self.filter_tools)
+
+        top_bar.addWidget(self.menu_button, alignment=Qt.AlignLeft)
+        top_bar.addWidget(self.search_field, alignment=Qt.AlignRight)
+        layout.addWidget(top_bar_widget)
+
+        # Add the NotificationBar below the top bar
+        self.notification_bar = NotificationBar(self)
+        layout.addWidget(self.notification_bar)
+
+        # Add categories and tools dynamically
+        self.add_categories_and_tools(layout)
+        self.refresh_sections()
+        self.update_tool_button_visibility()
 
     def add_categories_and_tools(self, layout):
         # Create main horizontal layout (categories + scroll area)
@@ -237,56 +514,41 @@ class MainWindow(QMainWindow):
         category_layout.setContentsMargins(0, 0, 0, 0)
         category_layout.setSpacing(8)
 
-        # Initialize tool buttons
-        self.tool_buttons = []
-
-        # Define tools
-        tools = [
-            ("Longer Appearance SRT", "Increase the duration each subtitle appears.", ["appearance", "timing"]),
-            ("Merge SRT Files", "Combine multiple SRT files into one.", ["merge"]),
-            ("Subtitle Converter", "Convert subtitles between different formats.", ["conversion"]),
-            ("Subtitle Shifter", "Shift subtitles by milliseconds.", ["timing"]),
-            ("Multilingual Merge", "Merge subtitles in different languages with colors.", ["merge", "translation"]),
-            ("Coming Soon", "More tools will be added in the future.", ["other"])
-        ]
-        tools_dict = {name: (desc, categories) for name, desc, categories in tools}
-
-        self.tools = tools
-        self.tools_dict = tools_dict
-
         # Get unique categories
         all_categories = set()
-        for tool in tools:
+        for tool in TOOLS:
             all_categories.update(tool[2])
 
+        # Apply dynamic text size based on app's configuration
+        text_size = self.main_window.config.get_text_size()
+        font_size = {
+            "small": 10,
+            "default": 18,
+            "large": 26,
+            "huge": 34
+        }.get(text_size, 26) # Default to 26 if text size is unknown
+        # The same style for every category button, so it is only built once
+        category_style = f"""
+            QPushButton {{
+                border: 2px solid {self.highlight_color};
+                border-radius: 15px;
+                padding: 8px;
+                margin: 4px;
+                background-color: {self.base_color};
+                color: {self.text_color};
+            }}
+            QPushButton:checked {{
+                background-color: {self.highlight_color};
+                color: {self.highlight_text_color};
+            }}
+        """
+
         # Create category buttons
         for category in sorted(all_categories):
             btn = QPushButton(category.upper())
             btn.setCheckable(True)
-            # Apply dynamic text size based on app's configuration
-            self.config = Config(source="MainWindow")
-            text_size = self.config.get_text_size()
-            font_size = {
-                "small": 10,
-                "default": 18,
-                "large": 26,
-                "huge": 34
-            }.get(text_size, 26) # Default to 26 if text size is unknown
             btn.setFont(QFont("Inter Regular", font_size))
-            btn.setStyleSheet(f"""
-                QPushButton {{
-                    border: 2px solid {self.highlight_color};
-                    border-radius: 15px;
-                    padding: 8px;
-                    margin: 4px;
-                    background-color: {self.base_color};
-                    color: {self.text_color};
-                }}
-                QPushButton:checked {{
-                    background-color: {self.highlight_color};
-                    color: {self.highlight_text_color};
-                }}
-            """)
+            btn.setStyleSheet(category_style)
             btn.clicked.connect(self.update_category_filters)
             self.category_buttons[category] = btn
             category_layout.addWidget(btn)
@@ -308,61 +570,39 @@ class MainWindow(QMainWindow):
         self.scroll_area = scroll_area
 
         # Add tools dynamically
-        self.add_tool_sections(main_scroll_layout, tools)
+        self.add_tool_sections(main_scroll_layout)
 
         main_h_layout.addWidget(self.scroll_area, stretch=4)
         layout.addLayout(main_h_layout)
 
-    def add_tool_sections(self, layout, tools):
-        # Add Most Used Tools section
+    def add_tool_sections(self, layout):
+        # Add Most Used Tools section; its buttons are filled in by refresh_sections
         most_used_label = QLabel("Most Used Tools")
-        most_used_label.setFont(self.inter_extra_bold_font)
+        most_used_label.setFont(self.main_window.inter_extra_bold_font)
         layout.addWidget(most_used_label)
         self.most_used_label = most_used_label
 
         most_used_widget = QWidget()
-        most_used_layout = QHBoxLayout(most_used_widget)
-        most_used_layout.setContentsMargins(0, 0, 0, 0)
+        self.most_used_layout = QHBoxLayout(most_used_widget)
+        self.most_used_layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(most_used_widget)
         self.most_used_widget = most_used_widget
 
-        self.tool_usage = self.config.get_tool_usage()
-        has_tool_usage = any(self.tool_usage.values())
-
-        if has_tool_usage:
-            for tool_name in sorted(self.tool_usage, key=lambda x: -self.tool_usage[x])[:3]:
-                button, _ = self.create_tool_button(tool_name, self.tools_dict.get(tool_name, ("Popular tool", []))[0], self.tools_dict.get(tool_name, ("Popular tool", []))[1])
-                most_used_layout.addWidget(button)
-            layout.addWidget(most_used_widget)
-        else:
-            most_used_label.hide()
-            most_used_widget.hide()
-
         # Add Recent Tools section
         recent_label = QLabel("Recent Tools")
-        recent_label.setFont(self.inter_extra_bold_font)
+        recent_label.setFont(self.main_window.inter_extra_bold_font)
         layout.addWidget(recent_label)
         self.recent_label = recent_label
 
         recent_widget = QWidget()
-        recent_layout = QHBoxLayout(recent_widget)
-        recent_layout.setContentsMargins(0, 0, 0, 0)
+        self.recent_layout = QHBoxLayout(recent_widget)
+        self.recent_layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(recent_widget)
         self.recent_widget = recent_widget
 
-        self.recent_tools = self.config.get_recent_tools()
-        has_recent_tools = len(self.recent_tools) > 0
-
-        if has_recent_tools:
-            for tool_name in self.recent_tools[:3]:
-                button, _ = self.create_tool_button(tool_name, self.tools_dict.get(tool_name, ("Recently used tool", []))[0], self.tools_dict.get(tool_name, ("Recently used tool", []))[1])
-                recent_layout.addWidget(button)
-            layout.addWidget(recent_widget)
-        else:
-            recent_label.hide()
-            recent_widget.hide()
-
         # Add All Tools section
         all_tools_label = QLabel("All Tools")
-        all_tools_label.setFont(self.inter_extra_bold_font)
+        all_tools_label.setFont(self.main_window.inter_extra_bold_font)
         layout.addWidget(all_tools_label)
 
         all_tools_widget = QWidget()
@@ -375,8 +615,8 @@ class MainWindow(QMainWindow):
         all_tools_grid.setRowStretch(0, 0)     # Prevent row stretching
         all_tools_grid.setRowStretch(1, 0)
         columns = 3
-        for index, tool in enumerate(tools):
-            button, _ = self.create_tool_button(tool[0], tool[1], tool[2])
+        for index, tool in enumerate(TOOLS):
+            button = self.create_tool_button(tool[0], tool[1], tool[2])
             row = index // columns
             col = index % columns
             all_tools_grid.addWidget(button, row, col)
@@ -384,6 +624,31 @@ class MainWindow(QMainWindow):
 
         layout.addWidget(all_tools_widget)
 
+    def refresh_sections(self):
+        """Brings the Most Used and Recent rows up to date with the config, only touching a row that changed."""
+        tool_usage = self.main_window.config.get_tool_usage()
+        most_used = sorted(tool_usage, key=lambda x: -tool_usage[x])[:3] if any(tool_usage.values()) else []
+        self.update_section("most_used", self.most_used_layout, most_used, "Popular tool")
+        self.update_section("recent", self.recent_layout, self.main_window.config.get_recent_tools()[:3], "Recently used tool")
+        # Shows or hides the rows according to the search and category filters still set
+        self.filter_tools(self.search_field.text())
+
+    def update_section(self, section, layout, tool_names, fallback_description):
+        """Shows one button per tool of tool_names in order, creating only buttons this row has never shown."""
+        if tool_names == self.section_tools[section]:
+            return
+        self.section_tools[section] = tool_names
+        buttons = self.section_buttons[section]
+        for button in buttons.values():
+            layout.removeWidget(button)
+            button.hide()
+        for tool_name in tool_names:
+            if tool_name not in buttons:
+                description, categories = TOOLS_BY_NAME.get(tool_name, (fallback_description, []))
+                buttons[tool_name] = self.create_tool_button(tool_name, description, categories)
+            layout.addWidget(buttons[tool_name])
+            buttons[tool_name].show()
+
     def create_tool_button(self, tool_name, tool_description, categories):
         # Create the button
         button = QPushButton()
@@ -404,22 +669,12 @@ class MainWindow(QMainWindow):
                 background-color: {self.hover_background_color};
             }}
         """)
-        # Define a placeholder emoji for each tool (you can customize these later)
-        emojis = {
-            "Longer Appearance SRT": "⏳",
-            "Merge SRT Files": "✨",
-            "Subtitle Converter": "🔄",
-            "Subtitle Shifter": "➡️",
-            "Multilingual Merge": "🌍",
-            "Coming Soon": "🚀"
-        }
-    
         # Get the emoji for the current tool
-        emoji = emojis.get(tool_name, "❓")  # Default to question mark if no emoji is defined
+        emoji = TOOL_EMOJIS.get(tool_name, "❓")  # Default to question mark if no emoji is defined
     
         # Combine the emoji and tool name into a single label
         combined_text = f"{emoji} {tool_name}"
-        text_size = self.config.get_text_size()
+        text_size = self.main_window.config.get_text_size()
         font_size = {
             "small": 18,
             "default": 26,
@@ -440,23 +695,22 @@ class MainWindow(QMainWindow):
         button_layout.addStretch()
         button_layout.setAlignment(Qt.AlignCenter)
     
-        # Create the description label (hidden by default)
-        description_label = QLabel(tool_description)
-        description_label.setFont(QFont("Inter Regular", font_size))
-        description_label.setStyleSheet(f"""
+        # The description is shown in the window's one shared popup while the pointer is over the button
+        def show_description(event):
+            description_label = self.main_window.description_popup()
+            description_label.setText(tool_description)
+            description_label.setFont(QFont("Inter Regular", font_size))
+            description_style = f"""
             color: {self.text_color};
             background-color: {self.base_color};
             padding: 10px;
             border: 2px solid {self.highlight_color};
             border-radius: 10px;
-        """)
-        description_label.setWordWrap(True)
-        description_label.hide()  # Hide initially
-        description_label.setFixedSize(300, 200)
-        description_label.setParent(self)  # Set MainWindow as the parent
-    
-        # Show description on hover
-        def show_description(event):
+        """
+            # Restyling is costly, so only when this menu's colors differ from the last ones used
+            if description_label.styleSheet() != description_style:
+                description_label.setStyleSheet(description_style)
+
             # Get the global position of the button
             button_global_pos = button.mapToGlobal(QPoint(0, 0))
             
@@ -465,8 +719,8 @@ class MainWindow(QMainWindow):
             description_size = description_label.size()
             
             # Get the current window geometry (global coordinates)
-            window_geometry = self.geometry()
-            window_top_left = self.mapToGlobal(QPoint(0, 0))
+            window_geometry = self.main_window.geometry()
+            window_top_left = self.main_window.mapToGlobal(QPoint(0, 0))
             window_bottom_right = window_top_left + QPoint(window_geometry.width(), window_geometry.height())
             
             # Calculate potential positions for the description label
@@ -496,168 +750,44 @@ class MainWindow(QMainWindow):
                 # If it doesn't fit above, move it back below the button
                 final_pos.setY(button_global_pos.y())
             
-            # Move and show the description label
-            description_label.move(final_pos)
+            # Move and show the description label (it is a child of the window, so in window coordinates)
+            description_label.move(self.main_window.mapFromGlobal(final_pos))
+            description_label.raise_()
             description_label.show()
             
         def hide_description(event):
-            description_label.hide()
+            self.main_window.hide_description()
     
         # Assign custom event handlers for hover events
         button.enterEvent = lambda event: show_description(event)  # On hover enter
         button.leaveEvent = lambda event: hide_description(event)  # On hover leave
     
         # Connect the tool selection action
-        button.clicked.connect(lambda: self.tool_selected(tool_name))
+        button.clicked.connect(lambda: self.main_window.tool_selected(tool_name))
     
-        return button, description_label
+        return button
+
+    def hideEvent(self, event):
+        # A tool opened from a hovered button never sends the button a leave event
+        self.main_window.hide_description()
+        super().hideEvent(event)
     
     def on_tag_selected(self):
-        self.most_used_label.hide()
-        self.most_used_widget.hide()
-        self.recent_label.hide()
-        self.recent_widget.hide()
+        self.set_sections_visible(False)
 
     def on_tag_deselected(self):
-        self.most_used_label.show()
-        self.most_used_widget.show()
-        self.recent_label.show()
-        self.recent_widget.show()
-
-    def tool_selected(self, tool_name):
-        self.tool_usage[tool_name] = self.tool_usage.get(tool_name, 0) + 1
-
-        # Update recent tools
-        if tool_name in self.recent_tools:
-            self.recent_tools.remove(tool_name)
-        self.recent_tools.insert(0, tool_name)
-        if len(self.recent_tools) > 3:
-            self.recent_tools = self.recent_tools[:3]
+        self.set_sections_visible(True)
 
-        self.config.set_tool_usage(self.tool_usage)
-        self.config.set_recent_tools(self.recent_tools)
-
-        self.notification_bar.add_notification("⏰", f"Reminder: You last used the {tool_name} tool just now.")
-        # Get the current splitter for the active tab
-        current_splitter = self.tab_contents.currentWidget()
-        if current_splitter is not None:
-            # Get the main content widget for the current tab
-            main_content = current_splitter.widget(1)  # Main content is the second widget in the splitter
-            main_content_layout = main_content.layout()
-            if tool_name == "Longer Appearance SRT":
-                from tools.longer_appearance import LongerAppearanceSRT
-                tool_widget = LongerAppearanceSRT(parent=main_content, back_callback=self.main_menu)
-                tool_widget.setFont(self.inter_regular_font)
-                self.load_tool(tool_widget, main_content_layout)
-            elif tool_name == "Merge SRT Files":
-                from tools.merge_srt import MergeSRT
-                tool_widget = MergeSRT(parent=main_content, back_callback=self.main_menu)
-                self.load_tool(tool_widget, main_content_layout)
-            elif tool_name == "Subtitle Converter":
-                tool_widget = SubtitleConverter(parent=main_content, back_callback=self.main_menu)
-                self.load_tool(tool_widget, main_content_layout)
-            elif tool_name == "Subtitle Shifter":
-                tool_widget = SubtitleShifter(parent=main_content, back_callback=self.main_menu)
-                self.load_tool(tool_widget, main_content_layout)
-            elif tool_name == "Multilingual Merge":
-                from tools.multilingual_tool import MultilingualTool
-                tool_widget = MultilingualTool(parent=main_content, back_callback=self.main_menu)
-                self.load_tool(tool_widget, main_content_layout)
-            else:
-                msg_box = QMessageBox()
-                msg_box.setText("More tools will be added soon!")
-                msg_box.setWindowTitle("Coming Soon!")
-                msg_box.setStyleSheet("""
-                QMessageBox {
-                color: black;
-                }
-                QMessageBox QLabel {
-                color: black;
-                }
-                QMessageBox QPushButton {
-                color: black;
-                }
-                """)
-                msg_box.exec_()
-                return
-
-    def clear_layout(self, layout):
-        while layout.count():
-            child = layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-
-    def load_tool(self, tool_widget, layout):
-        self.main_menu_active = False
-
-            # Clear the existing layout
-        while layout.count():
-            child = layout.takeAt(0)  # Remove items sequentially
-            if child.widget():
-                child.widget().deleteLater()  # Properly destroy widgets
-            elif child.layout():
-                # Recursively clear nested layouts (if any exist)
-                self.clear_layout(child.layout())
-        # Add the tool widget to the layout
-        layout.addWidget(tool_widget)
-        tool_widget.show()
-
-    def toggle_side_panel(self):
-        # Get the current splitter for the active tab
-        current_splitter = self.tab_contents.currentWidget()
-        if current_splitter is not None:
-            side_panel = current_splitter.widget(0)  # Side panel is the first widget in the splitter
-            if side_panel.isVisible():
-                current_splitter.setSizes([0, 1])  # Hide the side panel
-                side_panel.setVisible(False)
-            else:
-                side_panel.setVisible(True)
-                current_splitter.setSizes([self.width() // 2, self.width() // 2])  # Show the side panel
-
-    def open_settings(self, item=None):
-        # Get the current splitter for the active tab
-        current_splitter = self.tab_contents.currentWidget()
-        if current_splitter is not None:
-            # Get the main content widget for the current tab
-            main_content = current_splitter.widget(1)  # Main content is the second widget in the splitter
-            main_content_layout = main_content.layout()
-
-            # Create the settings widget
-            settings_widget = Settings(parent=self.main_content, back_callback=self.main_menu, main_window=self)
-            settings_widget.setFont(self.inter_regular_font)
-            settings_widget.settings_saved.connect(self.apply_theme)
-
-            # Load the settings widget into the current tab's main content layout
-            self.load_tool(settings_widget, main_content_layout)
-
-    def apply_text_size(self):
-        self.config = Config(source="MainWindow")
-        text_size = self.config.get_text_size()
-        font_size = {
-            "small": 18,
-            "default": 26,
-            "large": 34,
-            "huge": 42
-        }.get(text_size, 26)
-
-        self.setStyleSheet(f"""
-            * {{
-                font-size: {font_size}px;
-            }}
-        """)
-
-    def refresh_settings(self):
-        print("refreshing the settings")
-        self.apply_text_size()  # Update text size
-        self.apply_theme()  # Update theme
-
-        self.custom_window_bar.current_palette()
-        self.custom_window_bar.update_colors()
-        self.side_panel.current_palette()
-        self.side_panel.update_colors()
+    def set_sections_visible(self, visible):
+        # A row without tools stays hidden either way
+        for label, widget, section in ((self.most_used_label, self.most_used_widget, "most_used"),
+                                       (self.recent_label, self.recent_widget, "recent")):
+            shown = visible and bool(self.section_tools[section])
+            label.setVisible(shown)
+            widget.setVisible(shown)
 
     def update_tool_button_visibility(self, event=None):
-        if self.main_menu_active and self.tool_buttons:
+        if self.main_window.main_menu_active and self.tool_buttons:
             # Only handle automatic visibility if there's no search filter
             if not self.search_field.text():
                 container_width = self.scroll_area.width()
@@ -670,32 +800,27 @@ class MainWindow(QMainWindow):
                     button.setVisible(True)
 
     def update_category_filters(self):
-        current_splitter = self.tab_contents.currentWidget()
-        if current_splitter is not None:
-            # Get the main content widget for the current tab
-            main_content = current_splitter.widget(1)  # Main content is the second widget in the splitter
-            main_content_layout = main_content.layout()
-
-            self.active_categories.clear()
-            for category, btn in self.category_buttons.items():
-                if btn.isChecked():
-                    self.active_categories.add(category)
+        self.active_categories.clear()
+        for category, btn in self.category_buttons.items():
+            if btn.isChecked():
+                self.active_categories.add(category)
 
-            if self.active_categories:
-                self.on_tag_selected()
-            else:
-                self.on_tag_deselected()
-            self.filter_tools(self.search_field.text())
+        if self.active_categories:
+            self.on_tag_selected()
+        else:
+            self.on_tag_deselected()
+        self.filter_tools(self.search_field.text())
 
     def filter_tools(self, search_text):
         search_text = search_text.lower()
 
-        if search_text.strip():  # Check if there is any non-whitespace text
+        # The Most Used and Recent rows only show while nothing is filtered
+        if search_text.strip() or self.active_categories:
             self.on_tag_selected()
         else:
             self.on_tag_deselected()
 
-        for index, tool in enumerate(self.tools):
+        for index, tool in enumerate(TOOLS):
             button = self.tool_buttons[index]
             name = tool[0].lower()
             desc = tool[1].lower()
@@ -707,7 +832,18 @@ class MainWindow(QMainWindow):
             button.setVisible(visible)
 
 if __name__ == "__main__":
+    # Lets the frozen build start the worker processes used by batch conversion
+    from multiprocessing import freeze_support
+    freeze_support()
+
+    if "--trace-startup" in sys.argv:
+        sys.argv.remove("--trace-startup")
+        enable_trace()
+    mark("imports")
+
     app = QApplication(sys.argv)
+    mark("QApplication")
     window = MainWindow(app)
     window.show()
+    mark("show")
     sys.exit(app.exec_())
@@ -0,0 +1 @@
+"""Headless entry point for Subtl's subtitle tools; run ``python -m subtl --help``."""
@@ -0,0 +1,172 @@
+import argparse
+import os
+import sys
+
+# Only Qt-free modules are imported here, so the CLI runs on machines without a display.
+# Each command imports what it needs, keeping `subtl shift` from loading the converters and so on.
+
+def convert_command(args):
+    from tools.subtitleconverter.batch import convert_file, convert_fan_out
+    from tools.subtitleconverter.cache import configure_cache
+    from tools.subtitleconverter.sidecar import configure_sidecars
+
+    if args.cache:
+        configure_cache(args.cache, args.cache_size * 1024 * 1024)
+    # Into the cache when there is one, otherwise next to the inputs
+    configure_sidecars(args.sidecars, next_to_source=not args.cache)
+
+    if args.output:
+        if len(args.inputs) != 1 or len(args.to) != 1:
+            raise SystemExit("subtl convert: --output takes a single input and format; use --output-dir for several")
+        convert_file(args.inputs[0], args.output, args.to[0], frame_rate=args.fps, target_frame_rate=args.target_fps)
+        return 0
+
+    # Each input is parsed once however many formats it is written in
+    report = convert_fan_out(args.inputs, args.output_dir, args.to, args.name, processes=args.jobs,
+                             frame_rate=args.fps, target_frame_rate=args.target_fps)
+    print(report.summary())
+    return 1 if report.failed else 0
+
+def shift_command(args):
+    from tools.srt_transforms import shift_subtitle, shift_subtitle_partial
+
+    if args.start or args.end:
+        shift_subtitle_partial(args.input, args.start or "00:00:00,000", args.end or "99:59:59,999", args.ms, args.output)
+    else:
+        shift_subtitle(args.input, args.ms, args.output)
+    return 0
+
+def stretch_command(args):
+    from tools.srt_transforms import stretch_subtitle
+
+    stretch_subtitle(args.input, args.factor, args.output)
+    return 0
+
+def conform_command(args):
+    from tools.srt_transforms import conform_subtitle
+
+    # Drop-frame only changes how timecodes are labelled, not the rate, so only the fps matters here
+    conform_subtitle(args.input, args.source_fps[0], args.target_fps[0], args.output)
+    return 0
+
+def merge_command(args):
+    from tools.smprocessing import merge_subtitles, write_file
+
+    write_file(args.output, merge_subtitles(args.main, args.secondary, args.color, args.overlap, args.tolerance))
+    return 0
+
+def extend_command(args):
+    from tools.srt_transforms import extend_subtitle
+
+    if args.output and len(args.inputs) != 1:
+        raise SystemExit("subtl extend: --output takes a single input; use --output-dir for several files")
+
+    failed = 0
+    for file_path in args.inputs:
+        if args.output:
+            save_path = args.output
+        else:
+            # Same default name the Longer Appearance tool suggests
+            directory = args.output_dir or os.path.dirname(file_path)
+            save_path = os.path.join(directory, f"modified_{os.path.basename(file_path)}")
+        try:
+            extend_subtitle(file_path, args.seconds, save_path, clamp=args.no_overlap)
+        except Exception as e:
+            print(f"Failed to process {file_path}: {e}", file=sys.stderr)
+            failed += 1
+    return 1 if failed else 0
+
+def format_list(value):
+    """argparse type for one or more comma-separated target formats, e.g. srt,vtt,ttml."""
+    from tools.subtitleconverter.formats import FORMATS
+
+    formats = [format.strip().lower() for format in value.split(',') if format.strip()]
+    unknown = [format for format in formats if format not in FORMATS]
+    if not formats or unknown:
+        raise argparse.ArgumentTypeError(f"unknown format {', '.join(unknown) or value!r}; choose from {', '.join(FORMATS)}")
+    # Listing a format twice would only write the same file twice
+    return list(dict.fromkeys(formats))
+
+def frame_rate(value):
+    """argparse type for frame rates such as 25, 23.976 or 29.97df."""
+    from tools.subtitleconverter.timestamps import parse_frame_rate
+
+    try:
+        return parse_frame_rate(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="subtl", description="Convert, shift, merge and extend subtitle files without the GUI.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    convert = commands.add_parser("convert", help="convert subtitles to another format (the source format is detected)")
+    convert.add_argument("inputs", nargs="+", help="subtitle files to convert")
+    convert.add_argument("-t", "--to", required=True, type=format_list,
+                         help="target format, or several separated by commas, e.g. srt or srt,vtt,ttml,ass")
+    convert.add_argument("-o", "--output", help="output file (single input only)")
+    convert.add_argument("-d", "--output-dir", default=".", help="output folder for batch conversion (default: current folder)")
+    convert.add_argument("-n", "--name", default="{stem}.{format}",
+                         help="output file name template inside the output folder (default: {stem}.{format})")
+    convert.add_argument("--cache", metavar="DIR",
+                         help="reuse outputs of unchanged files from this folder, so re-runs only convert files whose bytes changed")
+    convert.add_argument("--cache-size", type=int, default=256, metavar="MB",
+                         help="size limit of the cache; least recently used outputs are dropped first (default: 256)")
+    convert.add_argument("--sidecars", action="store_true",
+                         help="keep the parsed cues of large inputs in .subtl files, so reading them again is instant; "
+                              "they go into the --cache folder, or next to the inputs without one")
+    convert.add_argument("-j", "--jobs", type=int, help="worker processes for batch conversion (default: one per CPU core)")
+    convert.add_argument("--fps", type=frame_rate,
+                         help="frame rate of frame-based sources (SUB, CAP, STL), e.g. 23.976 or 29.97df (default: detected)")
+    convert.add_argument("--target-fps", type=frame_rate,
+                         help="frame rate to write frame-based targets in (default: 25)")
+    convert.set_defaults(handler=convert_command)
+
+    shift = commands.add_parser("shift", help="shift SRT timings, optionally only within a time range")
+    shift.add_argument("input", help="SRT file to shift")
+    shift.add_argument("ms", type=int, help="milliseconds to shift by (may be negative)")
+    shift.add_argument("-o", "--output", required=True, help="output file (may be the input file)")
+    shift.add_argument("--start", help="only shift cues starting at or after this time (hh:mm:ss,fff)")
+    shift.add_argument("--end", help="only shift cues ending at or before this time (hh:mm:ss,fff)")
+    shift.set_defaults(handler=shift_command)
+
+    stretch = commands.add_parser("stretch", help="scale all SRT timings, e.g. after a frame-rate conversion")
+    stretch.add_argument("input", help="SRT file to stretch")
+    stretch.add_argument("factor", type=float, help="factor to multiply every time by, e.g. 1.04271 for 25 -> 23.976 fps")
+    stretch.add_argument("-o", "--output", required=True, help="output file (may be the input file)")
+    stretch.set_defaults(handler=stretch_command)
+
+    conform = commands.add_parser("conform", help="retime SRT timings for a frame-rate change of the video, e.g. 25 -> 23.976")
+    conform.add_argument("input", help="SRT file to conform")
+    conform.add_argument("source_fps", type=frame_rate, help="frame rate the subtitles were timed for, e.g. 25")
+    conform.add_argument("target_fps", type=frame_rate, help="frame rate of the video they are for now, e.g. 23.976")
+    conform.add_argument("-o", "--output", required=True, help="output file (may be the input file)")
+    conform.set_defaults(handler=conform_command)
+
+    merge = commands.add_parser("merge", help="stack secondary SRT files onto a main SRT file")
+    merge.add_argument("main", help="main SRT file")
+    merge.add_argument("secondary", nargs="+", help="secondary SRT files")
+    merge.add_argument("-o", "--output", required=True, help="output file")
+    merge.add_argument("--color", help="hex color for the secondary subtitles, e.g. #FFFF00")
+    merge.add_argument("--overlap", choices=["merge", "split"], default="merge",
+                       help="merge: join overlapping cues into one; split: cut them at every start and end (default: merge)")
+    merge.add_argument("--tolerance", type=int, default=0, help="treat timings less than this many ms apart as touching")
+    merge.set_defaults(handler=merge_command)
+
+    extend = commands.add_parser("extend", help="keep SRT cues on screen longer (Longer Appearance)")
+    extend.add_argument("inputs", nargs="+", help="SRT files to extend")
+    extend.add_argument("-s", "--seconds", type=float, required=True, help="seconds to add to every stop time")
+    extend.add_argument("-o", "--output", help="output file (single input only)")
+    extend.add_argument("--no-overlap", action="store_true", help="never extend a cue past the start of the next one")
+    extend.add_argument("-d", "--output-dir", help="output folder (default: next to each input, as modified_<name>)")
+    extend.set_defaults(handler=extend_command)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except (OSError, ValueError) as e:
+        print(f"subtl {args.command}: {e}", file=sys.stderr)
+        return 1
@@ -0,0 +1,61 @@
+import os
+import pickle
+
+import pytest
+
+from tools.subtitleconverter.batch import convert_fan_out, convert_task, fan_out_paths
+
+SOURCE = "1\r\n00:00:01,000 --> 00:00:02,000\r\nHello\r\n\r\n"
+
+
+def test_same_stem_in_different_folders_gets_numbered():
+    paths = fan_out_paths(["a/movie.srt", "b/movie.srt", "c/movie.srt"], "out", ["vtt"])
+    assert paths == [{"vtt": os.path.join("out", "movie.vtt")}, {"vtt": os.path.join("out", "movie (2).vtt")},
+                     {"vtt": os.path.join("out", "movie (3).vtt")}]
+
+
+def test_same_stem_with_different_extensions_gets_numbered():
+    paths = fan_out_paths(["movie.srt", "movie.ass"], "out", ["vtt", "txt"])
+    assert paths == [
+        {"vtt": os.path.join("out", "movie.vtt"), "txt": os.path.join("out", "movie.txt")},
+        {"vtt": os.path.join("out", "movie (2).vtt"), "txt": os.path.join("out", "movie (2).txt")},
+    ]
+
+
+def test_names_only_collide_case_insensitively_within_the_template():
+    paths = fan_out_paths(["Movie.srt", "movie.srt"], "out", ["vtt"], "{format}/{stem}.{format}")
+    assert paths == [{"vtt": os.path.join("out", "vtt", "Movie.vtt")}, {"vtt": os.path.join("out", "vtt", "movie (2).vtt")}]
+
+
+def test_template_without_the_stem_still_gives_every_file_its_own_name():
+    paths = fan_out_paths(["one.srt", "two.srt"], "out", ["vtt"], "subtitles.{format}")
+    assert [save_paths["vtt"] for save_paths in paths] == [os.path.join("out", "subtitles.vtt"),
+                                                           os.path.join("out", "subtitles (2).vtt")]
+
+
+def test_invalid_template_is_reported():
+    with pytest.raises(ValueError, match="Invalid output name template"):
+        fan_out_paths(["one.srt"], "out", ["vtt"], "{name}.{format}")
+
+
+def test_worker_function_pickles_by_reference():
+    # Spawned workers import the function by name, so it has to stay a top-level function of the module
+    assert pickle.loads(pickle.dumps(convert_task)) is convert_task
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_each_failed_file_is_reported_without_stopping_the_batch(tmp_path, processes):
+    good = [tmp_path / "one.srt", tmp_path / "two.srt"]
+    for path in good:
+        path.write_bytes(SOURCE.encode('utf-8'))
+    bad = tmp_path / "broken.bin"
+    bad.write_bytes(b"\x00\x01 not a subtitle")
+    output_dir = tmp_path / "out"
+
+    report = convert_fan_out([str(good[0]), str(bad), str(good[1])], str(output_dir), ["vtt"], processes=processes)
+
+    assert sorted(report.converted) == sorted([(str(good[0]), str(output_dir / "one.vtt")),
+                                               (str(good[1]), str(output_dir / "two.vtt"))])
+    assert [(source, "Could not detect" in error) for source, error in report.failed] == [(str(bad), True)]
+    assert sorted(os.listdir(output_dir)) == ["one.vtt", "two.vtt"]
+    assert "broken.bin: Could not detect" in report.summary()
@@ -0,0 +1,75 @@
+import os
+
+import pytest
+
+from tools.subtitleconverter import batch, cache
+from tools.subtitleconverter.batch import convert_file
+from tools.subtitleconverter.cache import cache_key, cached_output, configure_cache, entry_path, store_output
+
+SOURCE = "1\r\n00:00:01,000 --> 00:00:02,000\r\nHello\r\n\r\n"
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_SETTINGS", dict(cache.CACHE_SETTINGS))
+    directory = tmp_path / "cache"
+    configure_cache(str(directory))
+    return directory
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    """Counts the files actually parsed, as opposed to served from the cache."""
+    parsed = []
+    open_cues = batch.open_cues
+
+    def counting_open_cues(source_path, *args):
+        parsed.append(source_path)
+        return open_cues(source_path, *args)
+    monkeypatch.setattr(batch, "open_cues", counting_open_cues)
+    return parsed
+
+
+def test_identical_bytes_are_served_from_the_cache(tmp_path, cache_dir, parses):
+    first, second = tmp_path / "first.srt", tmp_path / "second.srt"
+    first.write_bytes(SOURCE.encode('utf-8'))
+    second.write_bytes(SOURCE.encode('utf-8'))
+    convert_file(str(first), str(tmp_path / "first.vtt"), "vtt")
+    convert_file(str(second), str(tmp_path / "second.vtt"), "vtt")
+
+    assert parses == [str(first)]
+    assert (tmp_path / "second.vtt").read_bytes() == (tmp_path / "first.vtt").read_bytes()
+
+
+def test_a_one_byte_change_misses_the_cache(tmp_path, cache_dir, parses):
+    source = tmp_path / "input.srt"
+    source.write_bytes(SOURCE.encode('utf-8'))
+    convert_file(str(source), str(tmp_path / "output.vtt"), "vtt")
+    source.write_bytes(SOURCE.replace("Hello", "Hellp").encode('utf-8'))
+    convert_file(str(source), str(tmp_path / "output.vtt"), "vtt")
+
+    assert parses == [str(source), str(source)]
+    assert "Hellp" in (tmp_path / "output.vtt").read_text(encoding='utf-8')
+    assert len(os.listdir(cache_dir)) == 2
+
+
+def test_options_are_part_of_the_key():
+    assert cache_key(b"data", ".srt", None) != cache_key(b"data", ".srt", (25, False))
+    assert cache_key(b"data", ".srt", None) == cache_key(b"data", ".srt", None)
+
+
+def test_least_recently_used_entries_are_evicted_first(tmp_path, cache_dir):
+    configure_cache(str(cache_dir), max_bytes=3500)
+    output = tmp_path / "output.vtt"
+    output.write_bytes(b"x" * 1000)
+    for age, key in enumerate(["newest", "middle", "oldest"]):
+        store_output(key, "vtt", str(output))
+        # Entries only differ in when they were last used
+        os.utime(entry_path(key, "vtt"), (1000000 - age * 100, 1000000 - age * 100))
+    # Using an entry makes it the most recent one
+    assert cached_output("oldest", "vtt") is not None
+
+    store_output("added", "vtt", str(output))
+
+    assert sorted(os.listdir(cache_dir)) == ["added.vtt", "newest.vtt", "oldest.vtt"]
+    assert cached_output("middle", "vtt") is None
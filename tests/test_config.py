@@ -0,0 +1,76 @@
+import json
+import os
+import time
+
+import pytest
+
+pytest.importorskip("PyQt5.QtCore")
+from assets.modules import config as config_module
+from assets.modules.config import Config
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    """A fresh set of shared settings backed by a config.json in tmp_path."""
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"theme": "light", "conversion_cache_size_mb": 64}))
+    monkeypatch.setattr(Config, "CONFIG_FILE", str(path))
+    monkeypatch.setattr(config_module, "SHARED", {"data": None, "signals": None, "pending": None, "timer": None})
+    monkeypatch.setattr(config_module, "SAVE_DELAY", 0.05)
+    monkeypatch.setattr(config_module.atexit, "register", lambda function: None)
+    yield path
+    if config_module.SHARED["timer"] is not None:
+        config_module.SHARED["timer"].cancel()
+
+
+def wait_for_write(seconds=2):
+    deadline = time.monotonic() + seconds
+    while (config_module.SHARED["timer"] is not None or config_module.SHARED["pending"] is not None) \
+            and time.monotonic() < deadline:
+        time.sleep(0.01)
+    # The pending changes are taken before they are written, so also wait for the write to finish
+    with config_module.WRITE_LOCK:
+        pass
+
+
+def test_changes_are_written_once_in_the_background(config_file, monkeypatch):
+    replaced = []
+    replace = os.replace
+    monkeypatch.setattr(os, "replace", lambda source, target: (replaced.append((source, target)), replace(source, target)))
+    config = Config()
+    for size in (128, 256, 512):
+        config.set_conversion_cache_size_mb(size)
+    # Nothing is written while the settings keep changing
+    assert json.loads(config_file.read_text())["conversion_cache_size_mb"] == 64
+
+    wait_for_write()
+    assert json.loads(config_file.read_text())["conversion_cache_size_mb"] == 512
+    # Written once, through a temporary file that replaced config.json
+    assert replaced == [(str(config_file) + ".tmp", str(config_file))]
+    assert not os.path.exists(str(config_file) + ".tmp")
+
+
+def test_every_config_shares_the_same_settings(config_file):
+    first, second = Config(), Config()
+    first.set_theme("dark")
+    assert second.get_theme() == "dark"
+
+
+def test_load_tells_listeners_about_the_settings_it_changed(config_file):
+    config = Config()
+    heard = []
+    config.changed.connect(lambda key, value: heard.append((key, value)))
+    config_file.write_text(json.dumps({"theme": "light", "conversion_cache_size_mb": 32,
+                                       "legacy_encodings": ["cp1252"]}))
+    config.load()
+    assert sorted(heard) == [("conversion_cache_size_mb", 32), ("legacy_encodings", ["cp1252"])]
+    assert config.get_legacy_encodings() == ["cp1252"]
+
+
+def test_load_drops_changes_not_written_yet(config_file):
+    config = Config()
+    config.set_theme("dark")
+    config.load()
+    wait_for_write()
+    assert config.get_theme() == "light"
+    assert json.loads(config_file.read_text())["theme"] == "light"
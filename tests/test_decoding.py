@@ -0,0 +1,26 @@
+from tools.subtitleconverter.decoding import detect_encoding, read_text
+from tools.subtitleconverter.srt_converter import read_srt
+
+
+def write_srt_file(tmp_path, text, encoding):
+    path = tmp_path / "input.srt"
+    path.write_bytes(f"1\r\n00:00:01,000 --> 00:00:02,000\r\n{text}\r\n".encode(encoding))
+    return str(path)
+
+
+def test_short_shift_jis_srt_is_not_read_as_cp1252(tmp_path):
+    for text in ["こんにちは", "テスト", "東京"]:
+        cues = read_srt(read_text(write_srt_file(tmp_path, text, 'shift_jis')))
+        assert [cue.text for cue in cues] == [text]
+
+
+def test_cp1252_srt_that_also_decodes_as_shift_jis_stays_cp1252(tmp_path):
+    # Each of these is valid Shift-JIS too, as half-width katakana or a stray kanji
+    for text in ["Ça va, Émile", "très bien", "ÉTÉ"]:
+        assert detect_encoding(text.encode('cp1252'), True) == 'cp1252'
+        cues = read_srt(read_text(write_srt_file(tmp_path, text, 'cp1252')))
+        assert [cue.text for cue in cues] == [text]
+
+
+def test_utf8_is_still_preferred():
+    assert detect_encoding("こんにちは".encode('utf-8'), True) == 'utf-8'
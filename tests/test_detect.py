@@ -0,0 +1,18 @@
+import pytest
+
+from tools.subtitleconverter.detect import sniff_format
+
+
+def test_content_wins_over_the_extension():
+    assert sniff_format("1\n00:00:01,000 --> 00:00:02,000\nHello\n", "notes.txt") == "srt"
+    assert sniff_format("WEBVTT\n\n00:01.000 --> 00:02.000\nHello\n", "input.bin") == "vtt"
+
+
+def test_extension_is_used_when_the_content_says_nothing():
+    assert sniff_format("Hello\n\nWorld\n", "notes.txt") == "txt"
+
+
+@pytest.mark.parametrize("file_name", ["input.bin", "input", None])
+def test_unknown_content_and_extension_is_a_detection_error(file_name):
+    with pytest.raises(ValueError, match="Could not detect the subtitle format"):
+        sniff_format("\x00\x01garbage", file_name)
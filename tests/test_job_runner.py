@@ -0,0 +1,62 @@
+import os
+import threading
+import time
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+from PyQt5.QtCore import QCoreApplication, QEvent, QThreadPool
+
+from assets.modules.job_runner import JobCancelled, JobProgress
+
+
+@pytest.fixture
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def wait(app, condition, seconds=5):
+    deadline = time.monotonic() + seconds
+    while not condition() and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+    return condition()
+
+
+def endless(started, stopped, job=None):
+    started.set()
+    try:
+        while True:
+            job.report(0, 1)
+            time.sleep(0.01)
+    except JobCancelled:
+        stopped.set()
+        raise
+
+
+def test_closing_the_tool_cancels_its_job(app):
+    tool = QtWidgets.QWidget()
+    progress = JobProgress(tool)
+    started, stopped = threading.Event(), threading.Event()
+    progress.start(endless, started, stopped)
+    assert started.wait(5)
+
+    tool.deleteLater()
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+    assert stopped.wait(5)
+    QThreadPool.globalInstance().waitForDone(5000)
+
+
+def test_finished_jobs_are_not_cancelled_later(app):
+    tool = QtWidgets.QWidget()
+    progress = JobProgress(tool)
+    results = []
+    job = progress.start(lambda job=None: 42, on_finished=results.append)
+    assert wait(app, lambda: results == [42])
+    assert not progress.is_running()
+
+    tool.deleteLater()
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    assert not job.cancel_event.is_set()
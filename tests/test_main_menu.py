@@ -0,0 +1,91 @@
+import os
+import time
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+pytest.importorskip("qtawesome")
+from PyQt5.QtCore import QCoreApplication, QEvent
+
+from assets.modules.config import Config
+
+
+@pytest.fixture
+def window(tmp_path, monkeypatch):
+    # Nothing the test does should touch the real config.json
+    monkeypatch.setattr(Config, "CONFIG_FILE", str(tmp_path / "config.json"))
+    import main
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    window = main.MainWindow(app)
+    window.show()
+    deadline = time.monotonic() + 5
+    while not window.startup_done and time.monotonic() < deadline:
+        app.processEvents()
+    assert window.startup_done
+    yield window
+    window.close()
+    window.deleteLater()
+    settle(app)
+
+
+def settle(app):
+    app.processEvents()
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    app.processEvents()
+
+
+def popups(window):
+    return [child for child in window.children() if isinstance(child, QtWidgets.QLabel)]
+
+
+def hover_tools(menu):
+    for button in menu.tool_buttons:
+        button.enterEvent(None)
+        button.leaveEvent(None)
+
+
+def cycle(window, app):
+    """Opens a tab, searches and hovers its menu, rebuilds the menus and closes the tab again."""
+    window.custom_window_bar.add_tab("Subtl")
+    settle(app)
+    menu = window.current_menu()
+    menu.search_field.setText("merge")
+    menu.search_field.setText("")
+    hover_tools(menu)
+    window.load_tool(QtWidgets.QWidget(), menu.parentWidget().layout())
+    window.invalidate_menus()
+    window.main_menu()
+    hover_tools(window.current_menu())
+    window.custom_window_bar.close_tab(window.custom_window_bar.tab_bar.count() - 1)
+    settle(app)
+
+
+def test_tool_descriptions_share_one_popup(window):
+    app = QtWidgets.QApplication.instance()
+    hover_tools(window.current_menu())
+    assert len(popups(window)) == 1
+
+    cycle(window, app)
+    widget_count = len(QtWidgets.QApplication.allWidgets())
+    for _ in range(30):
+        cycle(window, app)
+
+    assert popups(window) == [window.description_label]
+    assert not window.description_label.isVisible()
+    assert len(QtWidgets.QApplication.allWidgets()) == widget_count
+
+
+def test_rebuilt_menu_stays_cached_when_the_old_one_is_destroyed(window):
+    app = QtWidgets.QApplication.instance()
+    splitter = window.tab_contents.currentWidget()
+    old_menu = window.current_menu()
+    window.load_tool(QtWidgets.QWidget(), old_menu.parentWidget().layout())
+    window.invalidate_menus()
+    window.main_menu()
+    new_menu = window.menus[splitter]
+    assert new_menu is not old_menu
+
+    # The old menu is only deleted now, after its replacement is cached
+    settle(app)
+    assert window.menus.get(splitter) is new_menu
@@ -0,0 +1,71 @@
+import io
+
+import pytest
+
+from tools.smprocessing import merge_overlaps, merge_subtitles, merge_tracks, split_at_boundaries
+from tools.subtitleconverter.cues import Cue
+from tools.subtitleconverter.srt_converter import read_srt
+
+
+def timings(cues):
+    return [(cue.start, cue.end, cue.text) for cue in cues]
+
+
+def test_touching_cues_are_merged_but_not_split():
+    cues = [Cue(0, 1000, "a"), Cue(1000, 2000, "b")]
+    assert timings(merge_overlaps(cues)) == [(0, 2000, "a\nb")]
+    assert timings(split_at_boundaries(cues)) == [(0, 1000, "a"), (1000, 2000, "b")]
+
+
+def test_cues_apart_are_only_merged_within_the_tolerance():
+    cues = [Cue(0, 1000, "a"), Cue(1001, 2000, "b")]
+    assert timings(merge_overlaps(cues)) == [(0, 1000, "a"), (1001, 2000, "b")]
+    assert timings(merge_overlaps(cues, tolerance=1)) == [(0, 2000, "a\nb")]
+
+
+def test_nested_overlaps():
+    cues = [Cue(0, 3000, "a"), Cue(1000, 2000, "b"), Cue(1500, 2500, "c")]
+    assert timings(merge_overlaps(cues)) == [(0, 3000, "a\nb\nc")]
+    assert timings(split_at_boundaries(cues)) == [
+        (0, 1000, "a"), (1000, 1500, "a\nb"), (1500, 2000, "a\nb\nc"), (2000, 2500, "a\nc"), (2500, 3000, "a"),
+    ]
+
+
+def test_split_snaps_nearby_boundaries_instead_of_leaving_slivers():
+    overlapping = [Cue(0, 1000, "a"), Cue(995, 2000, "b")]
+    assert timings(split_at_boundaries(overlapping)) == [(0, 995, "a"), (995, 1000, "a\nb"), (1000, 2000, "b")]
+    assert timings(split_at_boundaries(overlapping, tolerance=10)) == [(0, 995, "a"), (995, 2000, "b")]
+
+    apart = [Cue(0, 1000, "a"), Cue(1005, 2000, "b")]
+    assert timings(split_at_boundaries(apart, tolerance=10)) == [(0, 1000, "a"), (1000, 2000, "b")]
+
+
+def test_three_tracks_merge_in_start_order_with_ties_in_track_order():
+    tracks = [
+        [Cue(0, 1000, "m1"), Cue(5000, 6000, "m2")],
+        [Cue(500, 1500, "x1")],
+        [Cue(0, 800, "y1"), Cue(7000, 8000, "y2")],
+    ]
+    assert timings(merge_tracks(tracks)) == [(0, 1500, "m1\ny1\nx1"), (5000, 6000, "m2"), (7000, 8000, "y2")]
+    assert timings(merge_tracks(tracks, 'split')) == [
+        (0, 500, "m1\ny1"), (500, 800, "m1\ny1\nx1"), (800, 1000, "m1\nx1"), (1000, 1500, "x1"),
+        (5000, 6000, "m2"), (7000, 8000, "y2"),
+    ]
+
+
+def test_merge_subtitles_colors_every_secondary_track():
+    main = io.StringIO("1\n00:00:01,000 --> 00:00:02,000\nMain\n")
+    first = [Cue(1000, 2000, "One")]
+    second = [Cue(3000, 4000, "Two")]
+    merged = read_srt(merge_subtitles(main, [first, second], ["#FF0000", "#00FF00"]))
+    assert timings(merged) == [
+        (1000, 2000, 'Main\n<font color="#FF0000">One</font>'),
+        (3000, 4000, '<font color="#00FF00">Two</font>'),
+    ]
+    # The caller's cues are left alone
+    assert first[0].text == "One"
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError, match="Unknown overlap policy"):
+        list(merge_tracks([[Cue(0, 1000, "a")]], 'stack'))
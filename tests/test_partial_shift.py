@@ -0,0 +1,67 @@
+import pytest
+
+from tools.srt_transforms import shift_subtitle_partial
+from tools.subtitleconverter import timeline
+from tools.subtitleconverter.cue_index import CueIndex
+from tools.subtitleconverter.srt_converter import read_srt
+from tools.subtitleconverter.timeline import Timeline
+
+SOURCE = (
+    "1\r\n00:00:01,000 --> 00:00:02,000\r\nBefore\r\n\r\n"
+    "2\r\n00:00:05,000 --> 00:00:06,000\r\nInside\r\n\r\n"
+    "3\r\n00:00:09,500 --> 00:00:10,500\r\nCrosses the end\r\n\r\n"
+    "4\r\n00:00:07,000 --> 00:00:08,000\r\nInside, out of order\r\n\r\n"
+)
+
+
+def test_cue_index_finds_cues_inside_a_range_in_track_order():
+    index = CueIndex([1000, 5000, 9500, 7000], [2000, 6000, 10500, 8000])
+    assert list(index.within(4000, 10000)) == [1, 3]
+    assert list(index.within(20000, 30000)) == []
+
+
+def test_partial_shift_only_changes_the_timestamps_inside_the_range(tmp_path):
+    source = tmp_path / "input.srt"
+    source.write_bytes(SOURCE.encode('utf-8'))
+    output = tmp_path / "output.srt"
+    shift_subtitle_partial(str(source), "00:00:04,000", "00:00:10,000", 1500, str(output))
+
+    expected = SOURCE.replace("00:00:05,000 --> 00:00:06,000", "00:00:06,500 --> 00:00:07,500")
+    expected = expected.replace("00:00:07,000 --> 00:00:08,000", "00:00:08,500 --> 00:00:09,500")
+    assert output.read_bytes() == expected.encode('utf-8')
+
+
+def test_partial_shift_without_patching_gives_the_same_cues(tmp_path):
+    source = tmp_path / "input.srt"
+    source.write_bytes(SOURCE.encode('utf-8'))
+    patched, rewritten = tmp_path / "patched.srt", tmp_path / "rewritten.srt"
+    shift_subtitle_partial(str(source), "00:00:04,000", "00:00:10,000", -4500, str(patched))
+    shift_subtitle_partial(str(source), "00:00:04,000", "00:00:10,000", -4500, str(rewritten), in_place=False)
+
+    def timings(path):
+        return [(cue.start, cue.end, cue.text) for cue in read_srt(path.read_text(encoding='utf-8'))]
+    assert timings(patched) == timings(rewritten)
+
+
+@pytest.mark.parametrize("in_place", [True, False])
+def test_partial_shift_rejects_a_range_that_ends_before_it_starts(tmp_path, in_place):
+    source = tmp_path / "input.srt"
+    source.write_bytes(SOURCE.encode('utf-8'))
+    output = tmp_path / "output.srt"
+    with pytest.raises(ValueError, match="ends before it starts"):
+        shift_subtitle_partial(str(source), "00:00:10,000", "00:00:04,000", 1500, str(output), in_place=in_place)
+    assert not output.exists()
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_reversed_range_selects_nothing(monkeypatch, use_numpy):
+    if not use_numpy:
+        monkeypatch.setattr(timeline, "numpy", None)
+    elif timeline.numpy is None:
+        pytest.skip("NumPy is not installed")
+    track = Timeline.from_cues(sorted(read_srt(SOURCE), key=lambda cue: cue.start))
+    first, last, mask = track.select(10000, 4000)
+    assert first == last and len(mask) == 0
+    before = (list(track.starts), list(track.ends))
+    track.shift(1500, 10000, 4000)
+    assert (list(track.starts), list(track.ends)) == before
@@ -0,0 +1,53 @@
+import os
+
+from tools.subtitleconverter import cache, sidecar
+from tools.subtitleconverter.cache import configure_cache
+from tools.subtitleconverter.sidecar import CueSidecar, configure_sidecars, open_cues
+
+SOURCE = "".join(f"{n}\r\n00:00:{n % 60:02d},000 --> 00:00:{n % 60:02d},500\r\nLine {n}\r\n\r\n" for n in range(1, 50))
+
+
+def read_cues(path):
+    cues = open_cues(str(path))
+    timings = [(cue.start, cue.end, cue.text) for cue in cues]
+    if isinstance(cues, CueSidecar):
+        cues.close()
+    return cues, timings
+
+
+def test_sidecars_go_into_the_cache_and_not_next_to_the_source(tmp_path, monkeypatch):
+    monkeypatch.setattr(sidecar, "SIDECAR_SETTINGS", dict(sidecar.SIDECAR_SETTINGS))
+    monkeypatch.setattr(cache, "CACHE_SETTINGS", dict(cache.CACHE_SETTINGS))
+    source = tmp_path / "subtitles" / "input.srt"
+    source.parent.mkdir()
+    source.write_bytes(SOURCE.encode('utf-8'))
+    configure_cache(str(tmp_path / "cache"), 1024 * 1024)
+    configure_sidecars(True, min_bytes=0)
+
+    parsed, expected = read_cues(source)
+    assert not isinstance(parsed, CueSidecar)
+    assert os.listdir(source.parent) == ["input.srt"]
+    assert [name.endswith(".subtl") for name in os.listdir(tmp_path / "cache")] == [True]
+
+    reopened, timings = read_cues(source)
+    assert isinstance(reopened, CueSidecar)
+    assert timings == expected
+
+
+def test_sidecars_next_to_the_source_only_when_asked_for(tmp_path, monkeypatch):
+    monkeypatch.setattr(sidecar, "SIDECAR_SETTINGS", dict(sidecar.SIDECAR_SETTINGS))
+    monkeypatch.setattr(cache, "CACHE_SETTINGS", dict(cache.CACHE_SETTINGS))
+    source = tmp_path / "input.srt"
+    source.write_bytes(SOURCE.encode('utf-8'))
+    configure_cache(None)
+
+    configure_sidecars(True, min_bytes=0)
+    read_cues(source)
+    assert os.listdir(tmp_path) == ["input.srt"]
+
+    configure_sidecars(True, min_bytes=0, next_to_source=True)
+    _, expected = read_cues(source)
+    assert sorted(os.listdir(tmp_path)) == ["input.srt", "input.srt.subtl"]
+    reopened, timings = read_cues(source)
+    assert isinstance(reopened, CueSidecar)
+    assert timings == expected
@@ -0,0 +1,71 @@
+from tools.subtitleconverter.cap_converter import read_cap
+import pytest
+
+from tools.subtitleconverter.timestamps import (FRAME_RATES, format_timecode, format_times, frames_to_ms, parse_timecode,
+                                                parse_timecodes, parse_times)
+from tools.subtitleconverter.vtt_converter import read_vtt
+
+
+def test_parse_times_reads_every_notation():
+    assert parse_times(["00:00:01,000", "01:02:03.456", "0:00:05.25", "02:03.4"]) == [1000, 3723456, 5250, 123400]
+    assert parse_times(iter([])) == []
+
+
+def test_format_times_round_trips_with_parse_times():
+    times = [0, 999, 61001, 3723456, 360000000]
+    assert format_times(times) == ["00:00:00,000", "00:00:00,999", "00:01:01,001", "01:02:03,456", "100:00:00,000"]
+    assert parse_times(format_times(times, '.')) == times
+    assert format_times([5250], '.', 1, 2) == ["0:00:05.25"]
+
+
+def test_parse_timecodes_uses_the_frame_rate():
+    assert parse_timecodes(["00:00:01:00", "00:00:01:12"], 25) == [1000, 1480]
+    assert parse_timecodes(["00:00:01:15"], 30) == [1500]
+
+
+def test_readers_parse_whole_tracks():
+    cues = read_vtt("WEBVTT\n\n00:01.000 --> 00:02.500\nOne\n\n00:03.000 --> 00:04.000\nTwo\n")
+    assert [(cue.start, cue.end, cue.text) for cue in cues] == [(1000, 2500, "One"), (3000, 4000, "Two")]
+    cues = read_cap("00:00:01:00 - 00:00:02:00 One\n00:00:03:00 - 00:00:04:12 Two|lines\n", fps=25)
+    assert [(cue.start, cue.end, cue.text) for cue in cues] == [(1000, 2000, "One"), (3000, 4480, "Two\nlines")]
+
+
+NTSC_30 = FRAME_RATES["29.97"]
+NTSC_60 = 60000 / 1001
+
+
+@pytest.mark.parametrize("timecode, frame", [
+    ("00:00:00;00", 0),
+    ("00:00:59;29", 1799),
+    ("00:01:00;02", 1800),  # ;00 and ;01 are skipped at the start of the minute
+    ("00:09:59;29", 17981),
+    ("00:10:00;00", 17982),  # but not at the start of every tenth minute
+    ("00:10:59;29", 19781),
+    ("00:11:00;02", 19782),
+    ("01:00:00;00", 107892),
+])
+def test_drop_frame_29_97_at_minute_boundaries(timecode, frame):
+    assert parse_timecode(timecode, NTSC_30) == frames_to_ms(frame, NTSC_30)
+    assert format_timecode(frames_to_ms(frame, NTSC_30), NTSC_30, True) == timecode
+
+
+@pytest.mark.parametrize("timecode, frame", [
+    ("00:00:59;59", 3599),
+    ("00:01:00;04", 3600),
+    ("00:09:59;59", 35963),
+    ("00:10:00;00", 35964),
+])
+def test_drop_frame_59_94_at_minute_boundaries(timecode, frame):
+    assert parse_timecode(timecode, NTSC_60) == frames_to_ms(frame, NTSC_60)
+    assert format_timecode(frames_to_ms(frame, NTSC_60), NTSC_60, True) == timecode
+
+
+@pytest.mark.parametrize("fps, timecode, ms", [
+    (24, "00:00:01:12", 1500),
+    (25, "00:00:59:24", 59960),
+    (30, "00:01:00:00", 60000),
+    (FRAME_RATES["23.976"], "00:00:00:12", 500),
+])
+def test_non_drop_timecodes_round_trip(fps, timecode, ms):
+    assert parse_timecode(timecode, fps) == ms
+    assert format_timecode(ms, fps) == timecode
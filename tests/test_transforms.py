@@ -0,0 +1,45 @@
+import os
+
+import pytest
+
+from tools import srt_transforms
+from tools.srt_transforms import extend_subtitle, shift_subtitle
+from tools.subtitleconverter import inplace, timeline
+from tools.subtitleconverter.inplace import patch_srt_times
+
+# The streaming rewrite writes canonical SRT with the platform's line endings, so the source does too
+SOURCE = "".join(f"{n}\n00:{n // 60:02d}:{n % 60:02d},{n * 7 % 500:03d} --> 00:{n // 60:02d}:{n % 60:02d},{n * 7 % 500 + 400:03d}\nLine {n}\n\n"
+                 for n in range(1, 200)).replace("\n", os.linesep)
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "input.srt"
+    path.write_bytes(SOURCE.encode('utf-8'))
+    return path
+
+
+def test_in_place_whole_file_shift_matches_the_streaming_rewrite(tmp_path, source):
+    if timeline.numpy is None:
+        pytest.skip("whole-file patching is only used with NumPy")
+    patched, streamed = tmp_path / "patched.srt", tmp_path / "streamed.srt"
+    shift_subtitle(str(source), 1500, str(patched), in_place=True)
+    shift_subtitle(str(source), 1500, str(streamed), in_place=False)
+    assert patched.read_bytes() == streamed.read_bytes()
+
+
+def test_pure_python_patching_matches_the_streaming_rewrite(tmp_path, source, monkeypatch):
+    monkeypatch.setattr(inplace, "numpy", None)
+    monkeypatch.setattr(timeline, "numpy", None)
+    monkeypatch.setattr(srt_transforms, "numpy", None)
+    patched, streamed = tmp_path / "patched.srt", tmp_path / "streamed.srt"
+    assert patch_srt_times(str(source), str(patched), lambda track, next_start: track.shift(-250))
+    shift_subtitle(str(source), -250, str(streamed))
+    assert patched.read_bytes() == streamed.read_bytes()
+
+
+def test_in_place_extend_matches_the_streaming_rewrite(tmp_path, source):
+    patched, streamed = tmp_path / "patched.srt", tmp_path / "streamed.srt"
+    assert patch_srt_times(str(source), str(patched), lambda track, next_start: track.extend(800, True, next_start))
+    extend_subtitle(str(source), 0.8, str(streamed), clamp=True)
+    assert patched.read_bytes() == streamed.read_bytes()
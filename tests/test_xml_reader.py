@@ -0,0 +1,78 @@
+from xml.parsers.expat import ExpatError
+
+import pytest
+
+from tools.subtitleconverter import xml_reader
+from tools.subtitleconverter.dfp_converter import read_dfxp
+from tools.subtitleconverter.ttml_converter import read_ttml
+from tools.subtitleconverter.xml_reader import cue_elements
+
+TTML = '<tt xmlns="http://www.w3.org/ns/ttml" xmlns:ttp="http://www.w3.org/ns/ttml#parameter" {rates}><body><div>{body}</div></body></tt>'
+
+
+def timings(cues):
+    return [(cue.start, cue.end, cue.text) for cue in cues]
+
+
+def ttml(body, rates=''):
+    return TTML.format(rates=rates, body=body)
+
+
+def test_tick_times_use_the_tick_rate():
+    content = ttml('<p begin="10000000t" end="25000000t">Ticks</p>', 'ttp:tickRate="10000000"')
+    assert timings(read_ttml(content)) == [(1000, 2500, "Ticks")]
+
+
+def test_frame_times_use_the_frame_rate():
+    content = ttml('<p begin="50f" end="00:00:03:12">Frames</p>', 'ttp:frameRate="25"')
+    assert timings(read_ttml(content)) == [(2000, 3480, "Frames")]
+
+
+def test_frame_rate_multiplier_gives_ntsc_rates():
+    content = ttml('<p begin="30f" dur="1s">NTSC</p>', 'ttp:frameRate="30" ttp:frameRateMultiplier="1000 1001"')
+    assert timings(read_ttml(content)) == [(1001, 2001, "NTSC")]
+
+
+def test_offset_and_clock_times_without_rates():
+    content = ttml('<p begin="1.5s" end="00:00:02.750">Seconds</p><p begin="100ms" dur="0.4s">Short</p>')
+    assert timings(read_dfxp(content)) == [(1500, 2750, "Seconds"), (100, 500, "Short")]
+
+
+def test_nested_spans_and_line_breaks():
+    content = ttml('<p begin="1s" end="2s"><span style="a">One <span style="b">two</span></span><br/>'
+                   'three\n      four</p>')
+    assert timings(read_ttml(content)) == [(1000, 2000, "One two\nthree four")]
+
+
+def test_begin_is_inherited_from_body_and_div():
+    content = ('<tt xmlns="http://www.w3.org/ns/ttml"><body begin="10s">'
+               '<div begin="5s"><p begin="1s" end="2s">Offset</p></div>'
+               '<div><p begin="0s" dur="1s">Body only</p></div>'
+               '</body></tt>')
+    assert timings(read_ttml(content)) == [(16000, 17000, "Offset"), (10000, 11000, "Body only")]
+
+
+def test_paragraph_without_its_own_times_takes_the_div_timing():
+    content = ttml('</div><div begin="3s" end="4s"><p>From the div</p>')
+    assert timings(read_ttml(content)) == [(3000, 4000, "From the div")]
+
+
+def test_cues_crossing_chunk_boundaries(monkeypatch):
+    monkeypatch.setattr(xml_reader, "CHUNK_SIZE", 7)
+    body = ''.join(f'<p begin="{n}s" end="{n}.5s">Line <span>{n}</span></p>' for n in range(20))
+    assert timings(read_ttml(ttml(body))) == [(n * 1000, n * 1000 + 500, f"Line {n}") for n in range(20)]
+
+
+def test_malformed_documents_fall_back_to_scanning_paragraphs():
+    content = ttml('<p begin="1s" end="2s">Fish & chips</p>')
+    assert timings(read_ttml(content)) == [(1000, 2000, "Fish & chips")]
+
+
+def test_cue_elements_lowercases_attributes_and_keeps_breaks():
+    content = '<root><Subtitle TC_IN="00:00:01:00" TC_OUT="00:00:02:00">One<br/>Two</Subtitle></root>'
+    assert list(cue_elements(content, "subtitle")) == [({"tc_in": "00:00:01:00", "tc_out": "00:00:02:00"}, "One\nTwo")]
+
+
+def test_truncated_documents_raise():
+    with pytest.raises(ExpatError):
+        list(cue_elements('<root><Subtitle>One', "subtitle"))
@@ -1,8 +1,9 @@
 import os
-import re
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QFileDialog, QMessageBox, QListWidget, QLabel, QComboBox
 from PyQt5.QtGui import QFont, QPalette
 from assets.modules.config import Config
+from assets.modules.job_runner import JobProgress, JobCancelled
+from tools.srt_transforms import extend_subtitle
 
 class LongerAppearanceSRT(QWidget):
     def __init__(self, parent=None, back_callback=None):
@@ -56,6 +57,10 @@ class LongerAppearanceSRT(QWidget):
 
         layout.addLayout(dropdown_layout)
 
+        # Exports run in the background; this shows their progress and lets them be cancelled
+        self.job_progress = JobProgress(self)
+        layout.addWidget(self.job_progress)
+
     def apply_theme(self):
         # Retrieve the current palette colors
         palette = self.parent().palette()
@@ -105,37 +110,50 @@ class LongerAppearanceSRT(QWidget):
         if not file_paths:
             QMessageBox.critical(self, "Error", "No files selected.")
             return
+        if self.job_progress.is_running():
+            return
 
-        converted_files = 0
+        # Ask for every save location up front; dialogs have to stay on the GUI thread
+        file_pairs = []
         for file_path in file_paths:
-            try:
-                with open(file_path, 'r', encoding='utf-8') as file:
-                    srt_data = file.read()
-
-                def adjust_stop_time(match):
-                    stop_time = match.group(2)
-                    hours, minutes, seconds, milliseconds = map(int, re.split('[:,]', stop_time))
-                    total_seconds = hours * 3600 + minutes * 60 + seconds + add_seconds
-                    new_hours = total_seconds // 3600
-                    new_minutes = (total_seconds % 3600) // 60
-                    new_seconds = total_seconds % 60
-                    new_time = f"{new_hours:02}:{new_minutes:02}:{new_seconds:02},{milliseconds:03}"
-                    return f"{match.group(1)} --> {new_time}"
-
-                updated_srt = re.sub(r"(\d{2}:\d{2}:\d{2},\d{3}) --> (\d{2}:\d{2}:\d{2},\d{3})", adjust_stop_time, srt_data)
-
-                save_path, _ = QFileDialog.getSaveFileName(self, "Save Modified File", f"modified_{os.path.basename(file_path)}", "Subtitle Files (*.srt)")
-                if save_path:
-                    with open(save_path, 'w', encoding='utf-8') as file:
-                        file.write(updated_srt)
-                    converted_files += 1
-                else:
-                    print(f"Save operation cancelled for {file_path}")
-
-            except Exception as e:
-                print(f"Failed to process {file_path}: {e}")
-
+            save_path, _ = QFileDialog.getSaveFileName(self, "Save Modified File", f"modified_{os.path.basename(file_path)}", "Subtitle Files (*.srt)")
+            if save_path:
+                file_pairs.append((file_path, save_path))
+            else:
+                print(f"Save operation cancelled for {file_path}")
+
+        self.export_button.setEnabled(False)
+        self.job_progress.start(extend_files, file_pairs, add_seconds,
+                                on_finished=self.export_finished, on_failed=self.export_failed, on_cancelled=self.export_cancelled)
+
+    def export_finished(self, converted_files):
+        self.export_button.setEnabled(True)
         if converted_files == 0:
             QMessageBox.information(self, "No Files Converted", "No files were successfully converted.")
         else:
             QMessageBox.information(self, "Success", f"{converted_files} files converted successfully!")
+
+    def export_failed(self, message):
+        self.export_button.setEnabled(True)
+        QMessageBox.critical(self, "Error", message)
+
+    def export_cancelled(self):
+        self.export_button.setEnabled(True)
+
+def extend_files(file_pairs, add_seconds, job=None):
+    """Adds add_seconds to the stop time of every cue in each (source, save) pair; returns how many succeeded."""
+    converted_files = 0
+    for index, (file_path, save_path) in enumerate(file_pairs):
+        if job:
+            job.report(index, len(file_pairs), os.path.basename(file_path))
+        try:
+            extend_subtitle(file_path, add_seconds, save_path, job=job)
+            converted_files += 1
+        except JobCancelled:
+            raise
+        except Exception as e:
+            print(f"Failed to process {file_path}: {e}")
+
+    if job:
+        job.report(len(file_pairs), len(file_pairs))
+    return converted_files
@@ -3,7 +3,9 @@ from PyQt5.QtWidgets import QWidget, QComboBox, QVBoxLayout, QHBoxLayout, QPushB
 from PyQt5.QtGui import QFont, QColor, QIcon, QPixmap, QPalette
 from PyQt5.QtCore import Qt
 from .smprocessing import merge_subtitles, read_file, write_file
+from tools.subtitleconverter.timestamps import parse_time, format_time
 from assets.modules.config import Config
+from assets.modules.job_runner import JobProgress
 from assets.buttons.toggle_switch import ToggleSwitch
 
 class MergeSRT(QWidget):
@@ -61,6 +63,10 @@ class MergeSRT(QWidget):
         # Stacked Merge mode
         self.setup_stacked_merge_mode(button_font_size, label_font_size, input_font_size, self.button_color, self.button_text_color, self.highlight_color, self.hover_color, self.text_color)
     
+        # Merges run in the background; this shows their progress and lets them be cancelled
+        self.job_progress = JobProgress(self)
+        layout.addWidget(self.job_progress)
+
         # Show the Glue End to End mode by default
         self.show_glue_end_to_end()
     
@@ -288,8 +294,7 @@ class MergeSRT(QWidget):
             return False
 
     def time_to_seconds(self, time_str):
-        hours, minutes, seconds = map(int, time_str.split(':'))
-        return hours * 3600 + minutes * 60 + seconds
+        return parse_time(time_str) // 1000
 
     def merge_subtitles_end_to_end(self, main_path, secondary_path, offset_seconds):
         try:
@@ -319,12 +324,7 @@ class MergeSRT(QWidget):
             return line
 
     def add_seconds_to_time(self, time_str, seconds):
-        hours, minutes, secs, millis = map(int, time_str.replace(',', ':').split(':'))
-        total_seconds = hours * 3600 + minutes * 60 + secs + seconds
-        new_hours = total_seconds // 3600
-        new_minutes = (total_seconds % 3600) // 60
-        new_seconds = total_seconds % 60
-        return f"{new_hours:02}:{new_minutes:02}:{new_seconds:02},{millis:03}"
+        return format_time(parse_time(time_str) + seconds * 1000)
 
     def toggle_color_options(self):
         is_visible = self.color_toggle.get_state() == "dark"
@@ -352,15 +352,26 @@ class MergeSRT(QWidget):
             self.show_error("Please select the main subtitle and at least one secondary subtitle file.")
             return
 
+        if self.job_progress.is_running():
+            return
+
         color_hex = self.get_selected_color()
-        try:
-            merged_content = merge_subtitles(self.main_subtitle_path, self.secondary_subtitle_paths, color_hex)
-            save_path = self.save_file("Save Merged File", "merged.srt")
-            if save_path:
-                write_file(save_path, merged_content)
-                self.show_success("Merged file saved successfully!")
-        except Exception as e:
-            self.show_error(f"An error occurred while merging the files.\n\n{e}")
+        save_path = self.save_file("Save Merged File", "merged.srt")
+        if save_path:
+            self.stacked_export_button.setEnabled(False)
+            self.job_progress.start(merge_to_file, self.main_subtitle_path, self.secondary_subtitle_paths, color_hex, save_path,
+                                    on_finished=self.stacked_merge_finished, on_failed=self.stacked_merge_failed, on_cancelled=self.stacked_merge_cancelled)
+
+    def stacked_merge_finished(self, result):
+        self.stacked_export_button.setEnabled(True)
+        self.show_success("Merged file saved successfully!")
+
+    def stacked_merge_failed(self, message):
+        self.stacked_export_button.setEnabled(True)
+        self.show_error(f"An error occurred while merging the files.\n\n{message}")
+
+    def stacked_merge_cancelled(self):
+        self.stacked_export_button.setEnabled(True)
 
     def get_selected_color(self):
         if self.color_toggle.get_state() == "dark":
@@ -388,3 +399,7 @@ class MergeSRT(QWidget):
 
     def show_success(self, message):
         QMessageBox.information(self, "Success", message)
+
+def merge_to_file(main_path, secondary_paths, color_hex, save_path, job=None):
+    """Runs a stacked merge and writes the result to save_path."""
+    write_file(save_path, merge_subtitles(main_path, secondary_paths, color_hex, job=job))
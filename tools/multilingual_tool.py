@@ -1,10 +1,11 @@
 import os
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QFileDialog, 
-                             QMessageBox, QLabel, QListWidget, QColorDialog, QListWidgetItem, QStyledItemDelegate)
+                             QMessageBox, QLabel, QListWidget, QColorDialog, QListWidgetItem, QStyledItemDelegate, QComboBox)
 from PyQt5.QtGui import QFont, QColor, QPalette
 from PyQt5.QtCore import Qt
 from assets.modules.config import Config
-from .smprocessing import merge_subtitles, read_file, write_file
+from assets.modules.job_runner import JobProgress
+from .smprocessing import merge_subtitles, write_file
 
 class MultilingualTool(QWidget):
     def __init__(self, parent=None, back_callback=None):
@@ -38,10 +39,26 @@ class MultilingualTool(QWidget):
         self.list_widget.setStyleSheet(f"background-color: {self.button_color}; color: {self.text_color};")
         layout.addWidget(self.list_widget)
 
+        # How lines that are on screen at the same time are combined
+        overlap_layout = QHBoxLayout()
+        overlap_label = QLabel("Overlapping lines:")
+        overlap_label.setStyleSheet(f"color: {self.text_color};")
+        overlap_layout.addWidget(overlap_label)
+        self.overlap_combo = QComboBox()
+        self.overlap_combo.addItem("Merge into one block", 'merge')
+        self.overlap_combo.addItem("Split at every start and end", 'split')
+        self.overlap_combo.setStyleSheet(f"background-color: {self.button_color}; color: {self.text_color};")
+        overlap_layout.addWidget(self.overlap_combo)
+        layout.addLayout(overlap_layout)
+
         # Export button
-        self.add_button(layout, "Export", self.export_merged, 
+        self.export_button = self.add_button(layout, "Export", self.export_merged, 
                        f"background-color: {self.button_color}; color: {self.button_text_color}; border-radius: 5px; padding: 10px;")
 
+        # Progress of a running export, with a Cancel button
+        self.job_progress = JobProgress(self)
+        layout.addWidget(self.job_progress)
+
     def add_button(self, layout, text, callback, style):
         button = QPushButton(text)
         button.setStyleSheet(style)
@@ -78,23 +95,27 @@ class MultilingualTool(QWidget):
             QMessageBox.critical(self, "Error", "Please select at least one subtitle file.")
             return
 
-        # Create a dummy main subtitle (empty content)
-        dummy_main = "dummy_main.srt"
-        with open(dummy_main, 'w') as f:
-            f.write("")
-
-        try:
-            merged_content = merge_subtitles(
-                dummy_main,
-                self.subtitle_paths,
-                self.colors
-            )
-            save_path, _ = QFileDialog.getSaveFileName(self, "Save Merged File", "multilingual.srt", "Subtitle Files (*.srt)")
-            if save_path:
-                write_file(save_path, merged_content)
-                QMessageBox.information(self, "Success", "Merged file saved successfully!")
-            os.remove(dummy_main)  # Cleanup
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"An error occurred:\n\n{str(e)}")
-            if os.path.exists(dummy_main):
-                os.remove(dummy_main)
+        if self.job_progress.is_running():
+            return
+
+        save_path, _ = QFileDialog.getSaveFileName(self, "Save Merged File", "multilingual.srt", "Subtitle Files (*.srt)")
+        if save_path:
+            self.export_button.setEnabled(False)
+            self.job_progress.start(export_to_file, list(self.subtitle_paths), list(self.colors), self.overlap_combo.currentData(), save_path,
+                                    on_finished=self.export_finished, on_failed=self.export_failed, on_cancelled=self.export_cancelled)
+
+    def export_finished(self, result):
+        self.export_button.setEnabled(True)
+        QMessageBox.information(self, "Success", "Merged file saved successfully!")
+
+    def export_failed(self, message):
+        self.export_button.setEnabled(True)
+        QMessageBox.critical(self, "Error", f"An error occurred:\n\n{message}")
+
+    def export_cancelled(self):
+        self.export_button.setEnabled(True)
+
+def export_to_file(subtitle_paths, colors, policy, save_path, job=None):
+    """Merges every file with its own color and writes the result to save_path."""
+    # No main track: every selected file is merged with its own color, straight from memory
+    write_file(save_path, merge_subtitles(None, subtitle_paths, colors, policy, job=job))
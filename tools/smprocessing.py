@@ -1,112 +1,137 @@
-import re
-from datetime import datetime, timedelta
+import os
+import heapq
+from tools.subtitleconverter.cues import Cue
+from tools.subtitleconverter.srt_converter import read_srt, write_srt
+from tools.subtitleconverter.decoding import read_text
+from tools.subtitleconverter.sidecar import open_cues
 
 def read_file(file_path):
-    """Reads the content of a subtitle file."""
-    with open(file_path, 'r', encoding='utf-8') as file:
-        return file.read()
+    """Reads the content of a subtitle file, whatever its encoding."""
+    return read_text(file_path)
 
 def write_file(file_path, content):
     """Writes content to a subtitle file."""
     with open(file_path, 'w', encoding='utf-8') as file:
         file.write(content)
 
-def merge_subtitles(main_file_path, secondary_file_paths, color_hex=None):
-    """Merges multiple subtitle files into one, ensuring blocks with overlapping timestamps are unified."""
-    main_content = read_file(main_file_path)
-    secondary_contents = [read_file(path) for path in secondary_file_paths]
-
-    if color_hex:
-        if isinstance(color_hex, list):
-            if len(color_hex) != len(secondary_contents):
-                raise ValueError("Number of colors must match number of secondary files.")
-            secondary_contents = [color_subtitles(content, hex) for content, hex in zip(secondary_contents, color_hex)]
-        secondary_contents = [color_subtitles(content, color_hex) for content in secondary_contents]
-
-    merged_blocks = parse_subtitle_blocks(main_content)
-    for content in secondary_contents:
-        secondary_blocks = parse_subtitle_blocks(content)
-        for timestamp, text in secondary_blocks.items():
-            if timestamp in merged_blocks:
-                merged_blocks[timestamp] += '\n' + text
-            else:
-                merged_blocks[timestamp] = text
-
-    unified_blocks = unify_overlapping_blocks(merged_blocks)
-    sorted_unified_blocks = dict(sorted(unified_blocks.items(), key=lambda x: parse_timestamp(x[0].split(' --> ')[0])))
-    merged_content = format_subtitle_blocks(sorted_unified_blocks)
-    return merged_content
-
-def parse_subtitle_blocks(content):
-    """Parses subtitle content into blocks and removes existing numbering."""
-    blocks = {}
-    pattern = re.compile(r'\d+\n(\d{2}:\d{2}:\d{2},\d{3} --> \d{2}:\d{2}:\d{2},\d{3})\n(.+?)(?=\n\d+\n|\Z)', re.DOTALL)
-    matches = pattern.findall(content)
-    for match in matches:
-        timestamp, text = match
-        text = text.strip()
-        if timestamp in blocks:
-            blocks[timestamp] += '\n' + text
+def merge_subtitles(main_source, secondary_sources, color_hex=None, policy='merge', tolerance=0, job=None):
+    """Merges multiple subtitle tracks into one, ensuring blocks with overlapping timestamps are unified."""
+    # Every source is a file path, a text buffer with SRT content or an iterable of cues; main_source may be None
+    # color_hex is one color for every secondary source or a list with one color per secondary source
+    if isinstance(color_hex, list):
+        if len(color_hex) != len(secondary_sources):
+            raise ValueError("Number of colors must match number of secondary files.")
+        colors = list(color_hex)
+    else:
+        colors = [color_hex] * len(secondary_sources)
+    sources = list(secondary_sources)
+    if main_source is not None:
+        sources.insert(0, main_source)
+        colors.insert(0, None)
+
+    # job, when given, is a background Job that gets told about every track read
+    tracks = []
+    for index, (source, color) in enumerate(zip(sources, colors)):
+        if job:
+            job.report(index, len(sources), source_name(source, index))
+        tracks.append(read_track(source, color))
+
+    if job:
+        job.report(len(sources), len(sources), "Merging")
+    return write_srt(merge_tracks(tracks, policy, tolerance))
+
+def source_name(source, index):
+    """Name shown for a merge source in progress messages."""
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.basename(source)
+    return f"Track {index + 1}"
+
+def read_track(source, color_hex=None):
+    """Loads a track into a list of cues sorted by start time, optionally colored."""
+    if isinstance(source, (str, os.PathLike)):
+        # Straight from the file's .subtl sidecar when it has an up-to-date one
+        cues = open_cues(os.fspath(source))
+        if not isinstance(cues, list):
+            with cues:
+                cues = list(cues)
+    elif hasattr(source, 'read'):
+        cues = read_srt(source.read())
+    else:
+        # Copies, so coloring never changes the caller's cues
+        cues = [Cue(cue.start, cue.end, cue.text, cue.style) for cue in source]
+
+    # Subtitle files are nearly always in order already, so only sort the ones that are not
+    if any(cue.start > next_cue.start for cue, next_cue in zip(cues, cues[1:])):
+        cues.sort(key=lambda cue: cue.start)
+    for cue in cues:
+        cue.text = cue.text.strip()
+        if color_hex:
+            cue.text = f'<font color="{color_hex}">{cue.text}</font>'
+    return cues
+
+def merge_tracks(tracks, policy='merge', tolerance=0):
+    """Combines sorted cue tracks with a k-way heap merge and unifies overlapping cues in one sweep."""
+    # On equal starts heapq.merge keeps track order, so the main track's text comes first
+    return unify_overlapping_cues(heapq.merge(*tracks, key=lambda cue: cue.start), policy, tolerance)
+
+def unify_overlapping_cues(cues, policy='merge', tolerance=0):
+    """Unifies overlapping cues, given in start order, using one of OVERLAP_POLICIES."""
+    if policy not in OVERLAP_POLICIES:
+        raise ValueError(f"Unknown overlap policy: {policy}")
+    return OVERLAP_POLICIES[policy](cues, tolerance)
+
+def merge_overlaps(cues, tolerance=0):
+    """Joins every chain of overlapping cues (or cues less than tolerance ms apart) into one cue."""
+    start = end = None
+    texts = []
+    for cue in cues:
+        if texts and cue.start <= end + tolerance:
+            end = max(end, cue.end)
+            texts.append(cue.text)
         else:
-            blocks[timestamp] = text
-    return blocks
-
-def format_subtitle_blocks(blocks):
-    """Formats subtitle blocks into content with corrected numbering."""
-    formatted_content = ""
-    for index, (timestamp, text) in enumerate(blocks.items(), start=1):
-        formatted_content += f"{index}\n{timestamp}\n{text}\n\n"
-    return formatted_content.strip()
-
-def color_subtitles(content, color_hex):
-    """Colors the subtitle text with the given hex color."""
-    def replace_text_with_color(match):
-        text = match.group(2).strip()
-        return f'{match.group(1)}\n<font color="{color_hex}">{text}</font>'
-
-    colored_content = re.sub(r'(\d{2}:\d{2}:\d{2},\d{3} --> \d{2}:\d{2}:\d{2},\d{3})\n(.+?)(?=\n\d+\n|\Z)', replace_text_with_color, content, flags=re.DOTALL)
-    return colored_content
-
-def unify_overlapping_blocks(blocks):
-    """Combines subtitle blocks with overlapping timestamps into unified blocks."""
-    sorted_blocks = sorted(blocks.items(), key=lambda x: parse_timestamp(x[0].split(' --> ')[0]))
-    unified_blocks = {}
-    
-    current_start = None
-    current_end = None
-    current_text = ""
-    
-    for timestamp, text in sorted_blocks:
-        start, end = timestamp.split(' --> ')
-        start_time = parse_timestamp(start)
-        end_time = parse_timestamp(end)
-        
-        if current_start is None:
-            current_start = start_time
-            current_end = end_time
-            current_text = text
+            if texts:
+                yield Cue(start, end, '\n'.join(texts))
+            start, end, texts = cue.start, cue.end, [cue.text]
+    if texts:
+        yield Cue(start, end, '\n'.join(texts))
+
+def split_at_boundaries(cues, tolerance=0):
+    """Cuts overlapping cues at every start and end, yielding one cue per stretch with the texts on screen during it.
+
+    Boundaries less than tolerance ms after the previous one are snapped onto it, so nearly equal
+    timings do not produce slivers only a few milliseconds long.
+    """
+    cues = iter(cues)
+    pending = next(cues, None)
+    active = {}  # Cues on screen by arrival number; dicts keep arrival order, which is the text order
+    ends = []  # Heap of (end, arrival number) for the cues in active
+    arrivals = 0
+    position = None
+    while pending is not None or ends:
+        # The next boundary is whichever comes first: the next cue starting or an active cue ending
+        boundary = ends[0][0] if ends else pending.start
+        if pending is not None and pending.start < boundary:
+            boundary = pending.start
+        if position is not None and boundary - position <= tolerance:
+            snapped = position
         else:
-            if start_time <= current_end:
-                current_end = max(current_end, end_time)
-                current_text += '\n' + text
-            else:
-                unified_blocks[f"{format_timestamp(current_start)} --> {format_timestamp(current_end)}"] = current_text
-                current_start = start_time
-                current_end = end_time
-                current_text = text
-    
-    if current_start is not None:
-        unified_blocks[f"{format_timestamp(current_start)} --> {format_timestamp(current_end)}"] = current_text
-        
-    return unified_blocks
-
-def parse_timestamp(timestamp):
-    """Parses a timestamp string into a datetime object."""
-    return datetime.strptime(timestamp, "%H:%M:%S,%f")
-
-def format_timestamp(timestamp):
-    """Formats a datetime object into a timestamp string."""
-    return timestamp.strftime("%H:%M:%S,%f")[:-3]
+            snapped = boundary
+        if active and snapped > position:
+            yield Cue(position, snapped, '\n'.join(cue.text for cue in active.values()))
+
+        while ends and ends[0][0] <= boundary:
+            del active[heapq.heappop(ends)[1]]
+        while pending is not None and pending.start <= boundary:
+            active[arrivals] = pending
+            heapq.heappush(ends, (pending.end, arrivals))
+            arrivals += 1
+            pending = next(cues, None)
+        position = snapped
+
+OVERLAP_POLICIES = {
+    'merge': merge_overlaps,
+    'split': split_at_boundaries,
+}
 
 # Example usage:
 if __name__ == "__main__":
@@ -0,0 +1,53 @@
+from tools.subtitleconverter.srt_converter import rewrite_srt_stream
+from tools.subtitleconverter.inplace import patch_srt_times, patch_srt_range
+from tools.subtitleconverter.timestamps import parse_time
+from tools.subtitleconverter.timeline import apply_in_batches, numpy
+
+# Whole-file SRT transforms shared by the GUI tools and the command line; nothing here imports Qt.
+# job, when given, is a background Job whose track() wrapper reports per-cue progress.
+
+def transform_srt(file_path, save_path, operation, encoding=None, in_place=False, job=None):
+    """Streams file_path into save_path, running operation(timeline, next_start) on each batch of cues.
+
+    With in_place, fixed-width timestamps are patched directly in the file bytes when every new time keeps its width.
+    """
+    # Patching every timestamp of the file digit by digit in pure Python is slower than streaming it (about 5 s
+    # against 4 s for 200,000 cues), so whole-file patching is only worth it with NumPy
+    if in_place and numpy is not None and patch_srt_times(file_path, save_path, operation, job):
+        return
+
+    def process(cues):
+        return apply_in_batches(job.track(cues) if job else cues, operation)
+
+    rewrite_srt_stream(file_path, save_path, process, encoding)
+
+def shift_subtitle(file_path, ms_shift, save_path, in_place=True, job=None):
+    transform_srt(file_path, save_path, lambda timeline, next_start: timeline.shift(ms_shift), in_place=in_place, job=job)
+
+def shift_subtitle_partial(file_path, start_time, end_time, ms_shift, save_path, in_place=True, job=None):
+    start_ms = parse_time(start_time)
+    end_ms = parse_time(end_time)
+    if start_ms > end_ms:
+        raise ValueError(f"The range ends before it starts: {start_time} is after {end_time}")
+    # Only the cues inside the range are looked up and patched; the rest of the file is copied untouched. Unlike
+    # the whole-file transforms this pays off without NumPy too, since only the cues in the range are rewritten.
+    if in_place and patch_srt_range(file_path, save_path, start_ms, end_ms, ms_shift, job):
+        return
+    transform_srt(file_path, save_path, lambda timeline, next_start: timeline.shift(ms_shift, start_ms, end_ms), job=job)
+
+def stretch_subtitle(file_path, factor, save_path, in_place=True, job=None):
+    """Scales every timestamp by factor, e.g. to follow a frame-rate conversion of the video."""
+    transform_srt(file_path, save_path, lambda timeline, next_start: timeline.stretch(factor), in_place=in_place, job=job)
+
+def conform_subtitle(file_path, source_fps, target_fps, save_path, in_place=True, job=None):
+    """Retimes a subtitle made for video at source_fps to the same video played at target_fps, e.g. 25 -> 23.976."""
+    transform_srt(file_path, save_path, lambda timeline, next_start: timeline.conform(source_fps, target_fps),
+                  in_place=in_place, job=job)
+
+def extend_subtitle(file_path, add_seconds, save_path, clamp=False, job=None):
+    """Keeps every cue on screen add_seconds longer by moving its stop time (Longer Appearance).
+
+    With clamp, a cue is only extended up to the start of the cue after it.
+    """
+    add_ms = round(add_seconds * 1000)
+    transform_srt(file_path, save_path, lambda timeline, next_start: timeline.extend(add_ms, clamp, next_start), job=job)
@@ -1,19 +1,10 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QFileDialog, QMessageBox, QListWidget, QComboBox
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QFileDialog, QMessageBox, QListWidget,
+                             QListWidgetItem, QComboBox, QLineEdit)
 from PyQt5.QtGui import QFont, QPalette
-from tools.subtitleconverter.vtt_converter import convert_to_vtt
-from tools.subtitleconverter.ass_converter import convert_to_ass
-from tools.subtitleconverter.sub_converter import convert_to_sub
-from tools.subtitleconverter.ssa_converter import convert_to_ssa
-from tools.subtitleconverter.sbv_converter import convert_to_sbv
-from tools.subtitleconverter.dfp_converter import convert_to_dfxp
-from tools.subtitleconverter.stl_converter import convert_to_stl
-from tools.subtitleconverter.mpl_converter import convert_to_mpl
-from tools.subtitleconverter.usf_converter import convert_to_usf
-from tools.subtitleconverter.lrc_converter import convert_to_lrc
-from tools.subtitleconverter.rt_converter import convert_to_rt
-from tools.subtitleconverter.ttml_converter import convert_to_ttml
-from tools.subtitleconverter.cap_converter import convert_to_cap
+from PyQt5.QtCore import Qt
+from tools.subtitleconverter.batch import convert_file, convert_fan_out, DEFAULT_NAME_TEMPLATE
 from assets.modules.config import Config
+from assets.modules.job_runner import JobProgress, JobCancelled
 import os
 
 class SubtitleConverter(QWidget):
@@ -56,7 +47,7 @@ class SubtitleConverter(QWidget):
         # Target format dropdown
         format_layout = QHBoxLayout()
 
-        self.format_label = QLabel("Select Source Format:")
+        self.format_label = QLabel("Select Target Format:")
         format_layout.addWidget(self.format_label)
 
         self.format_dropdown = QComboBox()
@@ -71,14 +62,47 @@ class SubtitleConverter(QWidget):
         layout.addLayout(format_layout)
 
         # Convert button
-        self.convert_button = QPushButton("Convert to CAP")
+        self.convert_button = QPushButton("Convert to SRT")
         self.convert_button.clicked.connect(self.convert_subtitle)
         layout.addWidget(self.convert_button)
 
+        # Formats to write every file in at once when converting to a folder; none ticked means the format above
+        self.fan_out_label = QLabel("Convert to folder in these formats (each file is read once):")
+        layout.addWidget(self.fan_out_label)
+
+        self.fan_out_list = QListWidget()
+        self.fan_out_list.setFlow(QListWidget.LeftToRight)
+        self.fan_out_list.setWrapping(True)
+        self.fan_out_list.setMaximumHeight(90)
+        for index in range(self.format_dropdown.count()):
+            item = QListWidgetItem(self.format_dropdown.itemText(index).split(' ')[0])
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Unchecked)
+            self.fan_out_list.addItem(item)
+        layout.addWidget(self.fan_out_list)
+
+        template_layout = QHBoxLayout()
+        self.template_label = QLabel("Output names:")
+        template_layout.addWidget(self.template_label)
+        self.template_edit = QLineEdit(DEFAULT_NAME_TEMPLATE)
+        self.template_edit.setToolTip("{stem} is the source name without extension, {format} the target format; "
+                                      "a / makes subfolders, e.g. {format}/{stem}.{format}")
+        template_layout.addWidget(self.template_edit)
+        layout.addLayout(template_layout)
+
+        # Batch conversion into one folder, spread over all CPU cores
+        self.batch_button = QPushButton("Convert All to Folder...")
+        self.batch_button.clicked.connect(self.convert_batch)
+        layout.addWidget(self.batch_button)
+
+        # Conversions run in the background; this shows their progress and lets them be cancelled
+        self.job_progress = JobProgress(self)
+        layout.addWidget(self.job_progress)
+
         self.setLayout(layout)
 
         # Apply the same style to all buttons
-        self.apply_button_styles([self.back_button, self.select_file_button, self.convert_button])
+        self.apply_button_styles([self.back_button, self.select_file_button, self.convert_button, self.batch_button])
 
     def apply_theme(self):
         # Retrieve the current palette colors
@@ -94,6 +118,10 @@ class SubtitleConverter(QWidget):
         self.file_list.setStyleSheet(f"background-color: {background_color}; color: {text_color};")
         self.format_label.setStyleSheet(f"color: {text_color};")
         self.format_dropdown.setStyleSheet(f"background-color: {background_color}; color: {text_color};")
+        self.fan_out_label.setStyleSheet(f"color: {text_color};")
+        self.fan_out_list.setStyleSheet(f"background-color: {background_color}; color: {text_color};")
+        self.template_label.setStyleSheet(f"color: {text_color};")
+        self.template_edit.setStyleSheet(f"background-color: {background_color}; color: {text_color};")
 
         self.back_button.setStyleSheet(f"""
             QPushButton {{
@@ -111,6 +139,7 @@ class SubtitleConverter(QWidget):
 
         self.select_file_button.setStyleSheet(self.back_button.styleSheet())
         self.convert_button.setStyleSheet(self.back_button.styleSheet())
+        self.batch_button.setStyleSheet(self.back_button.styleSheet())
 
     def apply_button_styles(self, buttons):
         for button in buttons:
@@ -132,25 +161,88 @@ class SubtitleConverter(QWidget):
         if self.file_list.count() == 0:
             QMessageBox.warning(self, "Error", "Please select at least one file to convert.")
             return
+        if self.job_progress.is_running():
+            return
 
         target_format = self.format_dropdown.currentText().split(' ')[0].lower()  # Extract format (e.g., "srt")
+        # Ask for every save location up front; dialogs have to stay on the GUI thread
+        file_pairs = []
         for index in range(self.file_list.count()):
             subtitle_path = self.file_list.file_paths[index]
             save_path, _ = QFileDialog.getSaveFileName(self, "Save Converted File", "", f"{target_format.upper()} Files (*.{target_format})")
-            if not save_path:
-                continue
-
-            try:
-                with open(subtitle_path, 'r') as file:
-                    content = file.read()
+            if save_path:
+                file_pairs.append((subtitle_path, save_path))
+        if not file_pairs:
+            return
 
-                # Convert the content to the selected format (example for CAP)
-                converted_content = convert_to_cap(content, target_format)
+        self.target_format = target_format
+        self.convert_button.setEnabled(False)
+        self.batch_button.setEnabled(False)
+        self.job_progress.start(convert_files, file_pairs, target_format,
+                                on_finished=self.conversion_finished, on_failed=self.conversion_failed, on_cancelled=self.conversion_cancelled)
 
-                with open(save_path, 'w') as file:
-                    file.write(converted_content)
+    def convert_batch(self):
+        if self.file_list.count() == 0:
+            QMessageBox.warning(self, "Error", "Please select at least one file to convert.")
+            return
+        if self.job_progress.is_running():
+            return
 
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to convert file: {e}")
+        output_dir = QFileDialog.getExistingDirectory(self, "Select Output Folder")
+        if not output_dir:
+            return
 
-        QMessageBox.information(self, "Success", f"Subtitle files converted to {target_format.upper()} successfully!")
+        target_formats = self.checked_formats() or [self.format_dropdown.currentText().split(' ')[0].lower()]
+        self.target_format = ", ".join(target_formats)
+        self.convert_button.setEnabled(False)
+        self.batch_button.setEnabled(False)
+        self.job_progress.start(convert_fan_out, list(self.file_list.file_paths), output_dir, target_formats,
+                                self.template_edit.text().strip() or DEFAULT_NAME_TEMPLATE,
+                                on_finished=self.batch_finished, on_failed=self.conversion_failed, on_cancelled=self.conversion_cancelled)
+
+    def checked_formats(self):
+        return [self.fan_out_list.item(index).text().lower() for index in range(self.fan_out_list.count())
+                if self.fan_out_list.item(index).checkState() == Qt.Checked]
+
+    def batch_finished(self, report):
+        self.convert_button.setEnabled(True)
+        self.batch_button.setEnabled(True)
+        if report.failed:
+            QMessageBox.warning(self, "Batch Conversion", report.summary())
+        else:
+            QMessageBox.information(self, "Success", f"{len(report.converted)} subtitle files written as {self.target_format.upper()} successfully!")
+
+    def conversion_finished(self, failures):
+        self.convert_button.setEnabled(True)
+        self.batch_button.setEnabled(True)
+        for failure in failures:
+            QMessageBox.critical(self, "Error", f"Failed to convert file: {failure}")
+        QMessageBox.information(self, "Success", f"Subtitle files converted to {self.target_format.upper()} successfully!")
+
+    def conversion_failed(self, message):
+        self.convert_button.setEnabled(True)
+        self.batch_button.setEnabled(True)
+        QMessageBox.critical(self, "Error", f"Failed to convert file: {message}")
+
+    def conversion_cancelled(self):
+        self.convert_button.setEnabled(True)
+        self.batch_button.setEnabled(True)
+        QMessageBox.information(self, "Cancelled", "Conversion cancelled.")
+
+def convert_files(file_pairs, target_format, job=None):
+    """Converts each (source, save) path pair and returns the errors of the files that failed."""
+    failures = []
+    for index, (subtitle_path, save_path) in enumerate(file_pairs):
+        if job:
+            job.report(index, len(file_pairs), os.path.basename(subtitle_path))
+        try:
+            # Each file is sniffed on its own, so a batch can mix formats freely
+            convert_file(subtitle_path, save_path, target_format, job.track if job else None)
+        except JobCancelled:
+            raise
+        except Exception as e:
+            failures.append(f"{os.path.basename(subtitle_path)}: {e}")
+
+    if job:
+        job.report(len(file_pairs), len(file_pairs))
+    return failures
@@ -1,9 +1,10 @@
 import os
-import re
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QFileDialog, QMessageBox, QLabel, QLineEdit, QStackedWidget, QFrame
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QPalette, QColor, QFont
 from assets.modules.config import Config
+from assets.modules.job_runner import JobProgress
+from tools.srt_transforms import shift_subtitle, shift_subtitle_partial
 
 class SubtitleShifter(QWidget):
     def __init__(self, parent=None, back_callback=None):
@@ -39,6 +40,10 @@ class SubtitleShifter(QWidget):
         # Partial Shift mode
         self.setup_partial_shift_mode()
 
+        # Shifts run in the background; this shows their progress and lets them be cancelled
+        self.job_progress = JobProgress(self)
+        layout.addWidget(self.job_progress)
+
     def add_button(self, layout, text, callback):
         button = QPushButton(text)
         button.clicked.connect(callback)
@@ -211,21 +216,38 @@ class SubtitleShifter(QWidget):
 
     def whole_shift(self):
         ms_shift = int(self.ms_input.text())
-        if self.subtitle_path:
+        if self.subtitle_path and not self.job_progress.is_running():
             save_path, _ = QFileDialog.getSaveFileName(self, "Save Shifted Subtitles", "", "Subtitle Files (*.srt)")
             if save_path:
-                shift_subtitle(self.subtitle_path, ms_shift, save_path)
-                self.show_success_message("Subtitles shifted successfully!")
+                self.start_shift(shift_subtitle, self.subtitle_path, ms_shift, save_path)
 
     def partial_shift(self):
         start_time = self.start_input.text()
         end_time = self.end_input.text()
         ms_shift = int(self.ms_input_partial.text())
-        if self.subtitle_path:
+        if self.subtitle_path and not self.job_progress.is_running():
             save_path, _ = QFileDialog.getSaveFileName(self, "Save Shifted Subtitles", "", "Subtitle Files (*.srt)")
             if save_path:
-                shift_subtitle_partial(self.subtitle_path, start_time, end_time, ms_shift, save_path)
-                self.show_success_message("Subtitles shifted successfully!")
+                self.start_shift(shift_subtitle_partial, self.subtitle_path, start_time, end_time, ms_shift, save_path)
+
+    def start_shift(self, function, *args):
+        self.shift_button.setEnabled(False)
+        self.shift_button_partial.setEnabled(False)
+        self.job_progress.start(function, *args, on_finished=self.shift_finished, on_failed=self.shift_failed, on_cancelled=self.shift_cancelled)
+
+    def shift_finished(self, result):
+        self.shift_button.setEnabled(True)
+        self.shift_button_partial.setEnabled(True)
+        self.show_success_message("Subtitles shifted successfully!")
+
+    def shift_failed(self, message):
+        self.shift_button.setEnabled(True)
+        self.shift_button_partial.setEnabled(True)
+        QMessageBox.critical(self, "Error", f"Failed to shift subtitles: {message}")
+
+    def shift_cancelled(self):
+        self.shift_button.setEnabled(True)
+        self.shift_button_partial.setEnabled(True)
 
     def show_success_message(self, message):
         msg_box = QMessageBox()
@@ -251,57 +273,3 @@ class SubtitleShifter(QWidget):
             formatted_text = text[:8] + ',' + text[8:]
         if text != formatted_text:
             input_box.setText(formatted_text)
-
-def shift_subtitle(file_path, ms_shift, save_path):
-    with open(file_path, 'r') as file:
-        content = file.readlines()
-
-    shifted_content = []
-    for line in content:
-        if '-->' in line:
-            start, end = line.split(' --> ')
-            new_start = shift_time(start, ms_shift)
-            new_end = shift_time(end, ms_shift)
-            shifted_content.append(f'{new_start} --> {new_end}\n')
-        else:
-            shifted_content.append(line)
-
-    with open(save_path, 'w') as file:
-        file.writelines(shifted_content)
-
-def shift_subtitle_partial(file_path, start_time, end_time, ms_shift, save_path):
-    with open(file_path, 'r') as file:
-        content = file.readlines()
-
-    shifted_content = []
-    for line in content:
-        if '-->' in line:
-            start, end = line.split(' --> ')
-            if start >= start_time and end <= end_time:
-                new_start = shift_time(start, ms_shift)
-                new_end = shift_time(end, ms_shift)
-                shifted_content.append(f'{new_start} --> {new_end}\n')
-            else:
-                shifted_content.append(line)
-        else:
-            shifted_content.append(line)
-
-    with open(save_path, 'w') as file:
-        file.writelines(shifted_content)
-
-def shift_time(time_str, ms_shift):
-    time_pattern = re.compile(r'(\d+):(\d+):(\d+),(\d+)')
-    match = time_pattern.match(time_str)
-    if match:
-        hours, minutes, seconds, milliseconds = map(int, match.groups())
-        total_ms = (hours * 3600 + minutes * 60 + seconds) * 1000 + milliseconds + ms_shift
-
-        new_hours = total_ms // 3600000
-        total_ms %= 3600000
-        new_minutes = total_ms // 60000
-        total_ms %= 60000
-        new_seconds = total_ms // 1000
-        new_ms = total_ms % 1000
-
-        return f'{new_hours:02}:{new_minutes:02}:{new_seconds:02},{new_ms:03}'
-    return time_str
@@ -0,0 +1,173 @@
+import os
+import shutil
+import multiprocessing
+from .formats import dump_cues
+from .decoding import set_legacy_encodings, LEGACY_ENCODINGS
+from .cache import cache_enabled, cache_key, cached_output, store_output, enforce_limit, configure_cache, cache_settings
+from .sidecar import open_cues, configure_sidecars, sidecar_settings
+
+# Output names for batch conversions; {stem} is the source name without its extension and {format} the target
+# format. A template may name subfolders, e.g. "{format}/{stem}.{format}".
+DEFAULT_NAME_TEMPLATE = "{stem}.{format}"
+
+class BatchReport:
+    """Collects the outcome of a batch conversion."""
+    def __init__(self):
+        self.converted = []  # (source path, output path)
+        self.failed = []  # (source path, error message)
+
+    def add(self, source_path, save_paths, error):
+        """Records one source; save_paths maps each target format to the file written for it."""
+        if error is None:
+            self.converted.extend((source_path, save_path) for save_path in save_paths.values())
+        else:
+            self.failed.append((source_path, error))
+
+    def summary(self):
+        lines = [f"{len(self.converted)} converted, {len(self.failed)} failed."]
+        for source_path, error in self.failed:
+            lines.append(f"{os.path.basename(source_path)}: {error}")
+        return '\n'.join(lines)
+
+def convert_file(source_path, save_path, target_format, track=None, frame_rate=None, target_frame_rate=None):
+    """Converts one file on disk, sniffing its source format; track can wrap the cue list for progress.
+
+    frame_rate and target_frame_rate are (fps, drop_frame) pairs for frame-based sources and targets.
+    """
+    convert_file_to_many(source_path, {target_format: save_path}, track, frame_rate, target_frame_rate)
+
+def convert_file_to_many(source_path, save_paths, track=None, frame_rate=None, target_frame_rate=None):
+    """Parses one file once and writes it in every format of save_paths, a {target format: save path} dict.
+
+    With the conversion cache on, outputs of byte-identical sources converted with the same options are copied
+    from the cache, and the file is only parsed if some target is missing from it.
+    """
+    with open(source_path, 'rb') as file:
+        data = file.read()
+    key = None
+    if cache_enabled():
+        # The extension decides the format of files whose content does not give it away
+        extension = os.path.splitext(source_path)[1].lower()
+        key = cache_key(data, extension, frame_rate, target_frame_rate, LEGACY_ENCODINGS)
+    cues = None
+
+    # Temporary files keep a cancelled or failed conversion from leaving half a file behind
+    temp_paths = {target_format: save_path + '.part' for target_format, save_path in save_paths.items()}
+    try:
+        for target_format, temp_path in temp_paths.items():
+            if key and copy_cached_output(key, target_format, temp_path):
+                continue
+            if cues is None:
+                # Read from the file's .subtl sidecar if it has an up-to-date one
+                cues = open_cues(source_path, frame_rate, data)
+            # UTF-8 whatever the source was, which is also what the XML writers declare
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                dump_cues(track(cues) if track else cues, target_format, file, target_frame_rate)
+            if key:
+                store_output(key, target_format, temp_path)
+        # Only once every target is written, so a failure never leaves some of the outputs updated
+        for target_format, temp_path in temp_paths.items():
+            os.replace(temp_path, save_paths[target_format])
+    finally:
+        if hasattr(cues, 'close'):
+            cues.close()
+        for temp_path in temp_paths.values():
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+def copy_cached_output(key, target_format, temp_path):
+    """Copies the cached output for key to temp_path; False if there is none."""
+    cached_path = cached_output(key, target_format)
+    if cached_path is None:
+        return False
+    try:
+        shutil.copyfile(cached_path, temp_path)
+    except FileNotFoundError:
+        # Evicted by another worker in the meantime
+        return False
+    return True
+
+def init_worker(encodings, cache, sidecars):
+    """Pool initializer: workers on spawn platforms start from the module defaults, so hand them the settings."""
+    set_legacy_encodings(encodings)
+    configure_cache(*cache)
+    configure_sidecars(*sidecars)
+
+def convert_task(task):
+    """Pool worker: converts one (source, save paths, frame rate, target frame rate) task and returns (source, save paths, error or None)."""
+    source_path, save_paths, frame_rate, target_frame_rate = task
+    try:
+        convert_file_to_many(source_path, save_paths, None, frame_rate, target_frame_rate)
+        return source_path, save_paths, None
+    except Exception as e:
+        return source_path, save_paths, str(e)
+
+def fan_out_paths(source_paths, output_dir, target_formats, template=DEFAULT_NAME_TEMPLATE):
+    """Returns a {target format: save path} dict per source, named from template inside output_dir.
+
+    Names that would collide, within the batch or because the template leaves a field out, are numbered.
+    """
+    taken = set()
+    paths = []
+    for source_path in source_paths:
+        stem = os.path.splitext(os.path.basename(source_path))[0]
+        save_paths = {}
+        for target_format in target_formats:
+            try:
+                name = os.path.normpath(template.format(stem=stem, format=target_format))
+            except (KeyError, IndexError, ValueError):
+                raise ValueError(f"Invalid output name template: {template!r} (use {{stem}} and {{format}})") from None
+            root, extension = os.path.splitext(name)
+            counter = 2
+            while name.lower() in taken:
+                name = f"{root} ({counter}){extension}"
+                counter += 1
+            taken.add(name.lower())
+            save_paths[target_format] = os.path.join(output_dir, name)
+        paths.append(save_paths)
+    return paths
+
+def convert_fan_out(source_paths, output_dir, target_formats, template=DEFAULT_NAME_TEMPLATE, processes=None, job=None,
+                    frame_rate=None, target_frame_rate=None):
+    """Parses every file once and writes it in each of target_formats into output_dir; returns a BatchReport.
+
+    Files are spread over a process pool sized to the machine.
+    """
+    tasks = [(source_path, save_paths, frame_rate, target_frame_rate)
+             for source_path, save_paths in zip(source_paths, fan_out_paths(source_paths, output_dir, target_formats, template))]
+    # The template may put outputs in subfolders of output_dir
+    for directory in {os.path.dirname(save_path) for _, save_paths, _, _ in tasks for save_path in save_paths.values()}:
+        os.makedirs(directory, exist_ok=True)
+    processes = min(processes or os.cpu_count() or 1, len(tasks))
+    report = BatchReport()
+
+    if processes <= 1:
+        # Starting worker processes costs more than converting a single file
+        for done, task in enumerate(tasks, start=1):
+            result = convert_task(task)
+            report.add(*result)
+            if job:
+                job.report(done, len(tasks), os.path.basename(result[0]))
+    else:
+        # Leaving the with block terminates the pool, so a cancelled job stops the workers too. Workers are
+        # spawned rather than forked: the GUI starts batches from a Qt worker thread, and forking a threaded
+        # process can leave locks held in the child.
+        try:
+            with multiprocessing.get_context('spawn').Pool(processes, init_worker, (list(LEGACY_ENCODINGS), cache_settings(), sidecar_settings())) as pool:
+                for done, result in enumerate(pool.imap_unordered(convert_task, tasks), start=1):
+                    report.add(*result)
+                    if job:
+                        job.report(done, len(tasks), os.path.basename(result[0]))
+        finally:
+            # Workers terminated mid-write leave their temporary files behind
+            for _, save_paths, _, _ in tasks:
+                for save_path in save_paths.values():
+                    if os.path.exists(save_path + '.part'):
+                        os.remove(save_path + '.part')
+
+    # Each worker only knows about its own additions to the cache, so check the total once they are done
+    if cache_enabled():
+        enforce_limit()
+    if job:
+        job.report(len(tasks), len(tasks))
+    return report
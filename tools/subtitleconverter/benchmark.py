@@ -0,0 +1,49 @@
+"""Times the subtitle serializers on synthetic cue lists of growing size.
+
+Run with: python -m tools.subtitleconverter.benchmark [--formats srt vtt ...] [--max-cues 1000000]
+
+The time per cue should stay roughly flat as the cue count grows; a rising
+per-cue cost means a serializer has gone quadratic again.
+"""
+import argparse
+import os
+import time
+from .cues import Cue
+from .formats import FORMATS, write_cues, dump_cues
+
+DEFAULT_FORMATS = ["srt", "vtt", "ass", "dfxp", "cap"]
+SIZES = [1000, 10000, 100000, 1000000]
+
+def make_cues(count):
+    """Builds count back-to-back two-line cues."""
+    return [Cue(index * 2000, index * 2000 + 1500, f"Line {index}\nSecond line & <more>") for index in range(count)]
+
+def time_call(function, *args):
+    """Returns the wall-clock seconds taken by function(*args)."""
+    started = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - started
+
+def dump_to_null(cues, format):
+    with open(os.devnull, 'w', encoding='utf-8') as file:
+        dump_cues(cues, format, file)
+
+def run(formats, max_cues):
+    sizes = [size for size in SIZES if size <= max_cues] or [max_cues]
+    print(f"{'format':<6} {'cues':>9} {'join (s)':>10} {'us/cue':>8} {'dump (s)':>10} {'us/cue':>8}")
+    for count in sizes:
+        cues = make_cues(count)
+        for format in formats:
+            joined = time_call(write_cues, cues, format)
+            dumped = time_call(dump_to_null, cues, format)
+            print(f"{format:<6} {count:>9} {joined:>10.3f} {joined / count * 1e6:>8.2f} {dumped:>10.3f} {dumped / count * 1e6:>8.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark subtitle serializers from 1k to 1M cues.")
+    parser.add_argument("--formats", nargs="+", default=DEFAULT_FORMATS, choices=sorted(FORMATS))
+    parser.add_argument("--max-cues", type=int, default=SIZES[-1])
+    args = parser.parse_args()
+    run(args.formats, args.max_cues)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import os
+import json
+import shutil
+import hashlib
+
+# On-disk cache of conversion outputs, keyed by a hash of the source bytes plus every option that changes the
+# output, so converting unchanged files again is a file copy. Entries are plain files named <key>.<format>;
+# their modification time is their last use, and the least recently used go first once the cache outgrows
+# its size limit. The cache stays off until configure_cache() gives it a folder (set from config.json).
+
+# Bump whenever a reader or writer changes its output, so entries written by older code are never used
+CACHE_VERSION = 1
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# directory: cache folder or None when caching is off; size: this process's running estimate of the cache size
+CACHE_SETTINGS = {"directory": None, "max_bytes": DEFAULT_MAX_BYTES, "size": None}
+
+def configure_cache(directory, max_bytes=DEFAULT_MAX_BYTES):
+    """Turns the cache on in directory, bounded to max_bytes; a directory of None or a limit of 0 turns it off."""
+    if not directory or max_bytes <= 0:
+        directory = None
+    CACHE_SETTINGS.update(directory=directory, max_bytes=max_bytes, size=None)
+
+def cache_settings():
+    """(directory, max_bytes) of the current cache, for handing to worker processes."""
+    return CACHE_SETTINGS["directory"], CACHE_SETTINGS["max_bytes"]
+
+def cache_enabled():
+    return CACHE_SETTINGS["directory"] is not None
+
+def cache_key(data, *options):
+    """Hash of the source bytes and the conversion options; options must be JSON-serializable."""
+    digest = hashlib.sha256(data)
+    digest.update(json.dumps([CACHE_VERSION, options]).encode('utf-8'))
+    return digest.hexdigest()
+
+def entry_path(key, target_format):
+    return os.path.join(CACHE_SETTINGS["directory"], f"{key}.{target_format}")
+
+def cached_output(key, target_format):
+    """Path of the cached output for key in target_format, marked as just used; None on a miss."""
+    path = entry_path(key, target_format)
+    try:
+        os.utime(path)
+    except OSError:
+        return None
+    return path
+
+def store_output(key, target_format, file_path):
+    """Copies a finished output into the cache, then evicts old entries if the cache is now too big."""
+    directory = CACHE_SETTINGS["directory"]
+    path = entry_path(key, target_format)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        # Copied under a temporary name, so another process never reads half an entry
+        shutil.copyfile(file_path, path + '.part')
+        os.replace(path + '.part', path)
+    except OSError as e:
+        # A full disk or read-only cache folder only costs the speed-up, never the conversion
+        print(f"Failed to write conversion cache entry: {e}")
+        return
+    entry_stored(path)
+
+def entry_stored(path):
+    """Counts a new entry towards the cache size, then evicts old entries if the cache is now too big."""
+    if CACHE_SETTINGS["size"] is None:
+        enforce_limit()
+    else:
+        CACHE_SETTINGS["size"] += os.path.getsize(path)
+        if CACHE_SETTINGS["size"] > CACHE_SETTINGS["max_bytes"]:
+            enforce_limit()
+
+def enforce_limit():
+    """Deletes least recently used entries until the cache fits in its size limit."""
+    directory = CACHE_SETTINGS["directory"]
+    if directory is None:
+        return
+    entries = []
+    try:
+        with os.scandir(directory) as scan:
+            for entry in scan:
+                if entry.is_file() and not entry.name.endswith('.part'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+    except OSError:
+        entries = []
+
+    size = sum(entry_size for _, entry_size, _ in entries)
+    if size > CACHE_SETTINGS["max_bytes"]:
+        # Down to 90% rather than just under the limit, so the next few stores do not each trigger a scan
+        target = CACHE_SETTINGS["max_bytes"] * 0.9
+        for _, entry_size, path in sorted(entries):
+            if size <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                # Another worker got to it first
+                pass
+            size -= entry_size
+    # Other worker processes add entries too, so this is only an estimate until the next scan
+    CACHE_SETTINGS["size"] = size
@@ -0,0 +1,40 @@
+from bisect import bisect_left, bisect_right
+from .timeline import numpy
+
+class CueIndex:
+    """Cue positions ordered by start time, so range lookups cost O(log n + k) instead of a scan over every cue.
+
+    Built from the start and end times of a track (int64 arrays with NumPy, lists without); lookups return
+    positions in the track, in track order. Tracks out of order are indexed too.
+    """
+
+    def __init__(self, starts, ends):
+        if numpy is not None:
+            starts = numpy.asarray(starts, dtype=numpy.int64)
+            # Sorting already-sorted input (the usual case for subtitle files) is linear
+            self.order = numpy.argsort(starts, kind='stable')
+            self.starts = starts[self.order]
+            self.ends = numpy.asarray(ends, dtype=numpy.int64)
+        else:
+            self.order = sorted(range(len(starts)), key=starts.__getitem__)
+            self.starts = [starts[position] for position in self.order]
+            self.ends = ends
+
+    def __len__(self):
+        return len(self.order)
+
+    def span(self, start_ms, end_ms):
+        """Returns the (first, last + 1) places in start order of the cues that start inside [start_ms, end_ms]."""
+        if numpy is not None:
+            first, last = int(numpy.searchsorted(self.starts, start_ms, 'left')), int(numpy.searchsorted(self.starts, end_ms, 'right'))
+        else:
+            first, last = bisect_left(self.starts, start_ms), bisect_right(self.starts, end_ms)
+        return first, max(first, last)
+
+    def within(self, start_ms, end_ms):
+        """Positions of the cues lying completely inside [start_ms, end_ms]."""
+        first, last = self.span(start_ms, end_ms)
+        if numpy is not None:
+            positions = self.order[first:last]
+            return numpy.sort(positions[self.ends[positions] <= end_ms])
+        return sorted(position for position in self.order[first:last] if self.ends[position] <= end_ms)
@@ -0,0 +1,42 @@
+import re
+
+class Cue:
+    """A single subtitle cue with integer-millisecond timing."""
+    __slots__ = ("start", "end", "text", "style")
+
+    def __init__(self, start, end, text, style=None):
+        self.start = start
+        self.end = end
+        self.text = text
+        self.style = style
+
+    def __eq__(self, other):
+        if not isinstance(other, Cue):
+            return NotImplemented
+        return (self.start, self.end, self.text, self.style) == (other.start, other.end, other.text, other.style)
+
+    def __repr__(self):
+        return f"Cue({self.start}, {self.end}, {self.text!r}, style={self.style!r})"
+
+TAG_PATTERN = re.compile(r'<[^>]+>')
+BREAK_PATTERN = re.compile(r'<br\s*/?>', re.IGNORECASE)
+
+def strip_markup(text):
+    """Turns the inner markup of an XML cue into plain text with newlines."""
+    text = BREAK_PATTERN.sub('\n', text)
+    text = TAG_PATTERN.sub('', text)
+    text = text.replace('&lt;', '<').replace('&gt;', '>').replace('&quot;', '"').replace('&amp;', '&')
+    return '\n'.join(line.strip() for line in text.strip().splitlines())
+
+def escape_markup(text):
+    """Escapes cue text for XML-based formats."""
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+def fill_missing_ends(cues, last_duration=2000):
+    """Gives cues without an end time (LRC, IDX) the start of the next cue as their end."""
+    for cue, next_cue in zip(cues, cues[1:]):
+        if cue.end is None:
+            cue.end = max(next_cue.start, cue.start)
+    if cues and cues[-1].end is None:
+        cues[-1].end = cues[-1].start + last_duration
+    return cues
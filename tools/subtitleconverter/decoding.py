@@ -0,0 +1,110 @@
+import codecs
+
+# How much of a file the encoding is guessed from; the rest is decoded as it is read
+SAMPLE_SIZE = 65536
+
+# Tried when a file is not UTF-8, double-byte codecs first: CP1252 decodes nearly any bytes, so short Japanese
+# text such as "テスト" would otherwise come out as mojibake. Set from config.json at startup.
+LEGACY_ENCODINGS = ['shift_jis', 'cp1252']
+
+# Codecs where most non-ASCII characters take two bytes. Western text rarely decodes in them, but when it does
+# by chance the result is checked with looks_double_byte() before it is taken.
+DOUBLE_BYTE_ENCODINGS = {'shift_jis', 'cp932', 'euc_jp', 'euc_kr', 'cp949', 'gbk', 'gb2312', 'gb18030', 'big5', 'big5hkscs'}
+
+# Checked longest first: the UTF-32-LE mark starts with the UTF-16-LE one
+BOMS = [
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+def set_legacy_encodings(encodings):
+    """Replaces the fallback codecs tried after UTF-8, skipping names Python does not know."""
+    known = []
+    for encoding in encodings:
+        try:
+            codecs.lookup(encoding)
+        except LookupError:
+            print(f"Unknown encoding in config: {encoding}")
+            continue
+        known.append(encoding)
+    LEGACY_ENCODINGS[:] = known
+
+def is_double_byte(encoding):
+    return codecs.lookup(encoding).name.replace('-', '_') in DOUBLE_BYTE_ENCODINGS
+
+def looks_double_byte(text):
+    """Whether the non-ASCII characters of text look like real CJK text rather than Western bytes read wrongly.
+
+    Western text misread as Shift-JIS turns into half-width katakana and the odd stray kanji, so the text has
+    to contain kana or CJK punctuation, or at least two ideographs and no half-width katakana.
+    """
+    kana = ideographs = half_width = 0
+    for char in text:
+        if char < '\x80':
+            continue
+        if '\u3000' <= char <= '\u30ff' or '\uff01' <= char <= '\uff5e':
+            kana += 1
+        elif '\uff61' <= char <= '\uff9f':
+            half_width += 1
+        elif '\u3400' <= char <= '\u9fff' or '\uac00' <= char <= '\ud7af':
+            ideographs += 1
+    return kana > 0 or (ideographs >= 2 and half_width == 0)
+
+def legacy_candidates():
+    """LEGACY_ENCODINGS with the double-byte codecs moved to the front, keeping their order otherwise."""
+    return sorted(LEGACY_ENCODINGS, key=lambda encoding: not is_double_byte(encoding))
+
+def decodes(sample, encoding, final):
+    """Whether sample is valid in encoding; unless final, a character cut off at the end of the sample is fine."""
+    try:
+        codecs.getincrementaldecoder(encoding)().decode(sample, final)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+def detect_encoding(sample, final=False):
+    """Guesses the codec of a file from its first bytes; final says the sample is the whole file."""
+    for bom, encoding in BOMS:
+        if sample.startswith(bom):
+            return encoding
+
+    # UTF-16 without a mark: text that is mostly ASCII has a zero in every other byte
+    half = len(sample) // 2
+    if half:
+        odd_zeros = sample[1::2].count(0)
+        even_zeros = sample[0::2].count(0)
+        if odd_zeros > half * 0.3 and even_zeros < half * 0.05:
+            return 'utf-16-le'
+        if even_zeros > half * 0.3 and odd_zeros < half * 0.05:
+            return 'utf-16-be'
+
+    if decodes(sample, 'utf-8', final):
+        return 'utf-8'
+    for encoding in legacy_candidates():
+        if not decodes(sample, encoding, final):
+            continue
+        if is_double_byte(encoding) and not looks_double_byte(sample.decode(encoding, errors='ignore')):
+            continue
+        return encoding
+    # Every byte is valid Latin-1, so a file is always readable in the end
+    return 'latin-1'
+
+def file_encoding(file_path):
+    """Guesses the codec of file_path from its first SAMPLE_SIZE bytes."""
+    with open(file_path, 'rb') as file:
+        sample = file.read(SAMPLE_SIZE)
+    return detect_encoding(sample, len(sample) < SAMPLE_SIZE)
+
+def read_text(file_path, encoding=None):
+    """Reads a whole text file, detecting its encoding unless one is given; the bytes are read and decoded once."""
+    with open(file_path, 'rb') as file:
+        return decode_bytes(file.read(), encoding)
+
+def decode_bytes(data, encoding=None):
+    """Decodes the whole content of a file, detecting its encoding unless one is given."""
+    if encoding:
+        return data.decode(encoding)
+    return data.decode(detect_encoding(data[:SAMPLE_SIZE], len(data) <= SAMPLE_SIZE), errors='replace')
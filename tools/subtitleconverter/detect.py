@@ -0,0 +1,63 @@
+import os
+import re
+from .formats import FORMATS
+
+# How much of a file is looked at; every signature below shows up well within the first few KB
+SNIFF_SIZE = 4096
+
+XML_FORMATS = [
+    (re.compile(r'<tt[\s>]'), "ttml"),
+    (re.compile(r'<usf[\s>]'), "usf"),
+    (re.compile(r'<(?:rt|window)[\s>]'), "rt"),
+    (re.compile(r'TC_IN="'), "stl"),
+]
+
+# Line signatures in the order they are tried; the earlier ones are the more specific
+LINE_FORMATS = [
+    (re.compile(r'timestamp:\s*\d+:\d{2}:\d{2}:\d{3}'), "idx"),
+    (re.compile(r'\{\d+\}\{\d*\}'), "sub"),
+    (re.compile(r'\[\d+\]\[\d*\]'), "mpl"),
+    (re.compile(r'\[\d+:\d{2}(?:[.:]\d+)?\]'), "lrc"),
+    (re.compile(r'\d+:\d{2}:\d{2}[.,]\d+\s*,\s*\d+:\d{2}:\d{2}[.,]\d+\s*$'), "sbv"),
+    (re.compile(r'(?:\d+:)?\d{2}:\d{2}\.\d+\s*-->'), "vtt"),
+    (re.compile(r'(?:\d+:)?\d{2}:\d{2}(?:[.,]\d+)?\s*-->'), "srt"),
+    (re.compile(r'\d+:\d{2}:\d{2}[:;]\d{2}\s*,\s*\d+:\d{2}:\d{2}[:;]\d{2}\s*,'), "stl"),
+    (re.compile(r'\d+:\d{2}:\d{2}[:;]\d{2}\s*-\s*\d+:\d{2}:\d{2}[:;]\d{2}'), "cap"),
+]
+
+def sniff_format(sample, file_name=None):
+    """Guesses the format of subtitle content from its first few KB, falling back to the file extension.
+
+    Raises ValueError when neither the content nor the extension names a supported format.
+    """
+    sample = sample[:SNIFF_SIZE].lstrip('\ufeff \t\r\n')
+    extension = os.path.splitext(file_name)[1].lstrip('.').lower() if file_name else None
+
+    if sample.startswith('WEBVTT'):
+        return "vtt"
+    if sample.startswith('# VobSub index file'):
+        return "idx"
+    if sample.startswith('[Script Info]'):
+        # SSA and ASS share the header; ASS declares v4.00+ and uses a [V4+ Styles] section
+        return "ass" if 'v4.00+' in sample or '[V4+ Styles]' in sample else "ssa"
+    if sample.startswith('<'):
+        for pattern, format in XML_FORMATS:
+            if pattern.search(sample):
+                # DFXP is the older name of TTML and both share one parser, so keep whichever the file claims
+                if format == "ttml" and extension == "dfxp":
+                    return "dfxp"
+                return format
+
+    for line in sample.splitlines():
+        line = line.strip()
+        if not line or line.startswith(('$', '//')):
+            continue
+        for pattern, format in LINE_FORMATS:
+            if pattern.match(line):
+                return format
+
+    if extension in FORMATS:
+        return extension
+    name = os.path.basename(file_name) if file_name else "the input"
+    raise ValueError(f"Could not detect the subtitle format of {name}: its content matches no known format "
+                     f"and its extension is not a supported one")
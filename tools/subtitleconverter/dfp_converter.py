@@ -1,285 +1,138 @@
 import re
-
-def srt_to_dfxp(content):
-    dfxp_content = '<?xml version="1.0" encoding="UTF-8"?>\n'
-    dfxp_content += '<tt xmlns="http://www.w3.org/ns/ttml">\n'
-    dfxp_content += '  <body>\n'
-    dfxp_content += '    <div>\n'
-
-    for line in content.splitlines():
-        if re.match(r'\d+', line):
-            continue
-        elif re.match(r'\d{2}:\d{2}:\d{2},\d{3}', line):
-            times = line.replace(',', '.').split(' --> ')
-            start_time = f't{times[0]}s'
-            end_time = f't{times[1]}s'
+from xml.parsers.expat import ExpatError
+from .cues import Cue, strip_markup, escape_markup
+from .timestamps import parse_time_expression, format_time
+from .xml_reader import parse, local_name, segments_text
+
+# Elements whose begin/end/dur take part in TTML timing; others (such as <set> animations) inherit it
+TIMED_ELEMENTS = {"body", "div", "p", "span"}
+# TTML defaults when the document does not set ttp:frameRate / ttp:tickRate
+TTML_FRAME_RATE = 30
+
+P_PATTERN = re.compile(r'<(?:\w+:)?p\b([^>]*)>(.*?)</(?:\w+:)?p>', re.DOTALL)
+ATTRIBUTE_PATTERN = re.compile(r'(\w+)="([^"]*)"')
+
+def read_timed_text(content):
+    """Parses the <p begin end> paragraphs shared by DFXP and TTML into a list of cues."""
+    try:
+        return list(iter_timed_text(content))
+    except ExpatError:
+        # Not well-formed XML (a stray & or an unclosed tag, say); scan for the paragraphs instead
+        return scan_timed_text(content)
+
+def iter_timed_text(content):
+    """Yields a cue per timed <p> as soon as it closes.
+
+    Times may be clock values, frames or ticks at the document's ttp: rates, and are offset by
+    the begin of every enclosing <body> and <div>.
+    """
+    collected = []
+    rates = (TTML_FRAME_RATE, 1)  # (frames per second, ticks per second)
+    timing = []  # (begin, end or None, timed) of every open element outside <p>
+    paragraph = None  # [begin, end, style, text segments, open child elements] while inside a timed <p>
+
+    def start(tag, attributes):
+        nonlocal rates, paragraph
+        name = local_name(tag)
+        if paragraph is not None:
+            # Spans and other markup inside a paragraph only add text; a <br/> starts a new line
+            if name == "br":
+                paragraph[3].append([])
+            paragraph[4] += 1
+            return
+
+        if name == "tt":
+            rates = timing_rates({local_name(key): value for key, value in attributes.items()})
+        begin, end, timed = timing[-1] if timing else (0, None, False)
+        if name in TIMED_ELEMENTS:
+            # Times are relative to the begin of the parent element
+            parent_begin = begin
+            if "begin" in attributes:
+                begin = parent_begin + parse_time_expression(attributes["begin"], *rates)
+                timed = True
+            if "end" in attributes:
+                end = parent_begin + parse_time_expression(attributes["end"], *rates)
+                timed = True
+            elif "dur" in attributes:
+                end = begin + parse_time_expression(attributes["dur"], *rates)
+                timed = True
+        if name == "p" and timed:
+            paragraph = [begin, end, attributes.get("style"), [[]], 0]
         else:
-            text = line.replace('\n', ' ')
-            dfxp_content += f'      <p begin="{start_time}" end="{end_time}">{text}</p>\n'
-
-    dfxp_content += '    </div>\n'
-    dfxp_content += '  </body>\n'
-    dfxp_content += '</tt>'
-
-    return dfxp_content
-
-def vtt_to_dfxp(content):
-    dfxp_content = '<?xml version="1.0" encoding="UTF-8"?>\n'
-    dfxp_content += '<tt xmlns="http://www.w3.org/ns/ttml">\n'
-    dfxp_content += '  <body>\n'
-    dfxp_content += '    <div>\n'
-
-    lines = content.splitlines()
-    for i in range(len(lines)):
-        if '-->' in lines[i]:
-            times = lines[i].replace('.', ',').split(' --> ')
-            start_time = f't{times[0]}s'
-            end_time = f't{times[1]}s'
-            text = lines[i+1].replace('\n', ' ')
-            dfxp_content += f'      <p begin="{start_time}" end="{end_time}">{text}</p>\n'
-
-    dfxp_content += '    </div>\n'
-    dfxp_content += '  </body>\n'
-    dfxp_content += '</tt>'
-
-    return dfxp_content
-
-def txt_to_dfxp(content):
-    dfxp_content = '<?xml version="1.0" encoding="UTF-8"?>\n'
-    dfxp_content += '<tt xmlns="http://www.w3.org/ns/ttml">\n'
-    dfxp_content += '  <body>\n'
-    dfxp_content += '    <div>\n'
-
-    lines = content.splitlines()
-    for i in range(0, len(lines), 2):
-        if i + 1 < len(lines):
-            start_time = f't0:00:0{i//2}.00s'
-            end_time = f't0:00:0{i//2 + 1}.00s'
-            text = lines[i].replace('\n', ' ')
-            dfxp_content += f'      <p begin="{start_time}" end="{end_time}">{text}</p>\n'
-
-    dfxp_content += '    </div>\n'
-    dfxp_content += '  </body>\n'
-    dfxp_content += '</tt>'
-
-    return dfxp_content
-
-def sbv_to_dfxp(content):
-    dfxp_content = '<?xml version="1.0" encoding="UTF-8"?>\n'
-    dfxp_content += '<tt xmlns="http://www.w3.org/ns/ttml">\n'
-    dfxp_content += '  <body>\n'
-    dfxp_content += '    <div>\n'
-
-    lines = content.splitlines()
-    for i in range(len(lines)):
-        if re.match(r'\d{2}:\d{2}:\d{2}\.\d{3}', lines[i]):
-            times = lines[i].split(',')
-            start_time = f't{times[0].replace(".", ":")}s'
-            end_time = f't{times[1].replace(".", ":")}s'
-            text = lines[i + 1].replace('\n', ' ')
-            dfxp_content += f'      <p begin="{start_time}" end="{end_time}">{text}</p>\n'
-
-    dfxp_content += '    </div>\n'
-    dfxp_content += '  </body>\n'
-    dfxp_content += '</tt>'
-
-    return dfxp_content
-
-def sub_to_dfxp(content):
-    dfxp_content = '<?xml version="1.0" encoding="UTF-8"?>\n'
-    dfxp_content += '<tt xmlns="http://www.w3.org/ns/ttml">\n'
-    dfxp_content += '  <body>\n'
-    dfxp_content += '    <div>\n'
-    
-    for line in content.splitlines():
-        if re.match(r'\d{2}:\d{2}:\d{2}:\d{2}', line):
-            times = line.split(',')
-            start_time = f't{times[0].replace(":", ".")}s'
-            end_time = f't{times[1].replace(":", ".")}s'
+            timing.append((begin, end, timed))
+
+    def end(tag):
+        nonlocal paragraph
+        if paragraph is None:
+            timing.pop()
+        elif paragraph[4]:
+            paragraph[4] -= 1
         else:
-            text = line.replace('\n', ' ')
-            dfxp_content += f'      <p begin="{start_time}" end="{end_time}">{text}</p>\n'
-
-    dfxp_content += '    </div>\n'
-    dfxp_content += '  </body>\n'
-    dfxp_content += '</tt>'
-    
-    return dfxp_content
-
-def ass_to_dfxp(content):
-    dfxp_content = '<?xml version="1.0" encoding="UTF-8"?>\n'
-    dfxp_content += '<tt xmlns="http://www.w3.org/ns/ttml">\n'
-    dfxp_content += '  <body>\n'
-    dfxp_content += '    <div>\n'
-    
-    for line in content.splitlines():
-        if line.startswith("Dialogue:"):
-            parts = line.split(',')
-            start_time = f't{parts[1].replace(".", ":")}s'
-            end_time = f't{parts[2].replace(".", ":")}s'
-            text = ','.join(parts[9:]).replace('\\N', ' ').replace('{\\', '').replace('}', '')
-            dfxp_content += f'      <p begin="{start_time}" end="{end_time}">{text}</p>\n'
-
-    dfxp_content += '    </div>\n'
-    dfxp_content += '  </body>\n'
-    dfxp_content += '</tt>'
-    
-    return dfxp_content
-
-def ssa_to_dfxp(content):
-    # SSA and ASS have a similar structure, so we can reuse the ASS conversion logic.
-    return ass_to_dfxp(content)
-
-def stl_to_dfxp(content):
-    dfxp_content = '<?xml version="1.0" encoding="UTF-8"?>\n'
-    dfxp_content += '<tt xmlns="http://www.w3.org/ns/ttml">\n'
-    dfxp_content += '  <body>\n'
-    dfxp_content += '    <div>\n'
-    
-    matches = re.findall(r'TC_IN="([^"]+)" TC_OUT="([^"]+)"[^>]*>(.*?)</Subtitle>', content, re.DOTALL)
-    for index, (start, end, text) in enumerate(matches):
-        start_time = f't{start.replace(".", ":")}s'
-        end_time = f't{end.replace(".", ":")}s'
-        text = re.sub(r'<[^>]+>', '', text).replace('\n', ' ')
-        dfxp_content += f'      <p begin="{start_time}" end="{end_time}">{text}</p>\n'
-
-    dfxp_content += '    </div>\n'
-    dfxp_content += '  </body>\n'
-    dfxp_content += '</tt>'
-    
-    return dfxp_content
-
-def idx_to_dfxp(content):
-    # IDX typically works with SUB files, so this function will assume the IDX file provided contains similar timing information
-    return sub_to_dfxp(content)
-
-def mpl_to_dfxp(content):
-    dfxp_content = '<?xml version="1.0" encoding="UTF-8"?>\n'
-    dfxp_content += '<tt xmlns="http://www.w3.org/ns/ttml">\n'
-    dfxp_content += '  <body>\n'
-    dfxp_content += '    <div>\n'
-    
-    matches = re.findall(r'\[(\d+)\]\s*(\d{2}:\d{2}:\d{2}:\d{2})\s*-\s*(\d{2}:\d{2}:\d{2}:\d{2})\s*(.*)', content)
-    for index, (num, start, end, text) in enumerate(matches):
-        start_time = f't{start.replace(":", ".")}s'
-        end_time = f't{end.replace(":", ".")}s'
-        dfxp_content += f'      <p begin="{start_time}" end="{end_time}">{text}</p>\n'
-
-    dfxp_content += '    </div>\n'
-    dfxp_content += '  </body>\n'
-    dfxp_content += '</tt>'
-    
-    return dfxp_content
-
-def usf_to_dfxp(content):
-    dfxp_content = '<?xml version="1.0" encoding="UTF-8"?>\n'
-    dfxp_content += '<tt xmlns="http://www.w3.org/ns/ttml">\n'
-    dfxp_content += '  <body>\n'
-    dfxp_content += '    <div>\n'
-    
-    matches = re.findall(r'<subtitle start="([^"]+)" end="([^"]+)"[^>]*>(.*?)</subtitle>', content, re.DOTALL)
-    for index, (start, end, text) in enumerate(matches):
-        start_time = f't{start.replace(".", ":")}s'
-        end_time = f't{end.replace(".", ":")}s'
-        text = re.sub(r'<[^>]+>', '', text).replace('\n', ' ')
-        dfxp_content += f'      <p begin="{start_time}" end="{end_time}">{text}</p>\n'
-
-    dfxp_content += '    </div>\n'
-    dfxp_content += '  </body>\n'
-    dfxp_content += '</tt>'
-    
-    return dfxp_content
-
-def lrc_to_dfxp(content):
-    dfxp_content = '<?xml version="1.0" encoding="UTF-8"?>\n'
-    dfxp_content += '<tt xmlns="http://www.w3.org/ns/ttml">\n'
-    dfxp_content += '  <body>\n'
-    dfxp_content += '    <div>\n'
-    
-    matches = re.findall(r'\[(\d{2}):(\d{2})\.(\d{2})\](.*)', content)
-    for index, (minutes, seconds, centiseconds, text) in enumerate(matches):
-        start_time = f't0:{minutes}:{seconds}.{centiseconds}s'
-        end_time = f't0:{minutes}:{int(seconds) + 1}.{centiseconds}s'
-        dfxp_content += f'      <p begin="{start_time}" end="{end_time}">{text}</p>\n'
-
-    dfxp_content += '    </div>\n'
-    dfxp_content += '  </body>\n'
-    dfxp_content += '</tt>'
-    
-    return dfxp_content
-
-def rt_to_dfxp(content):
-    dfxp_content = '<?xml version="1.0" encoding="UTF-8"?>\n'
-    dfxp_content += '<tt xmlns="http://www.w3.org/ns/ttml">\n'
-    dfxp_content += '  <body>\n'
-    dfxp_content += '    <div>\n'
-    
-    matches = re.findall(r'<Time begin="([^"]+)" end="([^"]+)"[^>]*>(.*?)</Time>', content, re.DOTALL)
-    for index, (start, end, text) in enumerate(matches):
-        start_time = f't{start.replace(".", ":")}s'
-        end_time = f't{end.replace(".", ":")}s'
-        text = re.sub(r'<[^>]+>', '', text).replace('\n', ' ')
-        dfxp_content += f'      <p begin="{start_time}" end="{end_time}">{text}</p>\n'
-
-    dfxp_content += '    </div>\n'
-    dfxp_content += '  </body>\n'
-    dfxp_content += '</tt>'
-    
-    return dfxp_content
-
-def ttml_to_dfxp(content):
-    # TTML is already in the DFXP (TTML) format, so no conversion is needed.
-    return content
-
-def cap_to_dfxp(content):
-    dfxp_content = '<?xml version="1.0" encoding="UTF-8"?>\n'
-    dfxp_content += '<tt xmlns="http://www.w3.org/ns/ttml">\n'
-    dfxp_content += '  <body>\n'
-    dfxp_content += '    <div>\n'
-    
-    matches = re.findall(r'<Caption time="([^"]+)"[^>]*>(.*?)</Caption>', content, re.DOTALL)
-    for index, (time, text) in enumerate(matches):
-        start_time = f't{time.replace(".", ":")}s'
-        end_time = f't0:{int(time.split(":")[1]) + 1}:{time.split(":")[2]}s'
-        text = re.sub(r'<[^>]+>', '', text).replace('\n', ' ')
-        dfxp_content += f'      <p begin="{start_time}" end="{end_time}">{text}</p>\n'
-
-    dfxp_content += '    </div>\n'
-    dfxp_content += '  </body>\n'
-    dfxp_content += '</tt>'
-    
-    return dfxp_content
+            begin, end, style, segments, _ = paragraph
+            collected.append(Cue(begin, end if end is not None else begin, segments_text(segments, collapse=True), style))
+            paragraph = None
+
+    def data(text):
+        if paragraph is not None:
+            paragraph[3][-1].append(text)
+
+    return parse(content, start, end, data, collected)
+
+def timing_rates(attributes):
+    """Returns the (frames per second, ticks per second) set by the ttp: attributes of <tt>."""
+    frame_rate = attributes.get("frameRate")
+    fps = float(frame_rate) if frame_rate else TTML_FRAME_RATE
+    if "frameRateMultiplier" in attributes:
+        numerator, denominator = attributes["frameRateMultiplier"].split()
+        fps = fps * int(numerator) / int(denominator)
+    if "tickRate" in attributes:
+        tick_rate = int(attributes["tickRate"])
+    elif frame_rate:
+        tick_rate = float(frame_rate) * int(attributes.get("subFrameRate", 1))
+    else:
+        tick_rate = 1
+    return fps, tick_rate
+
+def scan_timed_text(content):
+    """Regex fallback for documents the XML parser rejects; only sees <p> elements and their own times."""
+    cues = []
+    for attributes, text in P_PATTERN.findall(content):
+        attributes = dict(ATTRIBUTE_PATTERN.findall(attributes))
+        if "begin" not in attributes:
+            continue
+        start = parse_time_expression(attributes["begin"])
+        if "end" in attributes:
+            end = parse_time_expression(attributes["end"])
+        elif "dur" in attributes:
+            end = start + parse_time_expression(attributes["dur"])
+        else:
+            end = start
+        cues.append(Cue(start, end, strip_markup(text), attributes.get("style")))
+    return cues
+
+def timed_text_paragraphs(cues, indent):
+    """Yields the <p> elements shared by the DFXP and TTML writers."""
+    for cue in cues:
+        text = '<br/>'.join(escape_markup(line) for line in cue.text.split('\n'))
+        yield f'{indent}<p begin="{format_time(cue.start, ".")}" end="{format_time(cue.end, ".")}">{text}</p>\n'
+
+def read_dfxp(content):
+    """Parses DFXP content into a list of cues."""
+    return read_timed_text(content)
+
+def dfxp_chunks(cues):
+    """Yields the DFXP document piece by piece, one <p> per cue."""
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield '<tt xmlns="http://www.w3.org/ns/ttml">\n'
+    yield '  <body>\n'
+    yield '    <div>\n'
+    yield from timed_text_paragraphs(cues, '      ')
+    yield '    </div>\n  </body>\n</tt>'
+
+def write_dfxp(cues):
+    """Serializes cues as DFXP content."""
+    return ''.join(dfxp_chunks(cues))
 
 def convert_to_dfxp(format, content):
-    if format == "sub":
-        return sub_to_dfxp(content)
-    elif format == "srt":
-        return srt_to_dfxp(content)
-    elif format == "vtt":
-        return vtt_to_dfxp(content)
-    elif format == "txt":
-        return txt_to_dfxp(content)
-    elif format == "sbv":
-        return sbv_to_dfxp(content)
-    elif format == "ass":
-        return ass_to_dfxp(content)
-    elif format == "ssa":
-        return ssa_to_dfxp(content)
-    elif format == "stl":
-        return stl_to_dfxp(content)
-    elif format == "idx":
-        return idx_to_dfxp(content)
-    elif format == "mpl":
-        return mpl_to_dfxp(content)
-    elif format == "usf":
-        return usf_to_dfxp(content)
-    elif format == "lrc":
-        return lrc_to_dfxp(content)
-    elif format == "rt":
-        return rt_to_dfxp(content)
-    elif format == "ttml":
-        return ttml_to_dfxp(content)
-    elif format == "cap":
-        return cap_to_dfxp(content)
-    else:
-        raise ValueError("Unsupported format")
\ No newline at end of file
+    from .formats import convert
+    return convert(content, format, "dfxp")
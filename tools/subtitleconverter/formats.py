@@ -0,0 +1,137 @@
+# Every format has exactly one reader (content -> cues) and one chunk writer (cues -> str pieces).
+# A format's module is only imported the first time the format is used. The imports are spelled out in one
+# loader per format, rather than built from module names, so that PyInstaller finds them for the frozen build.
+
+def load_srt():
+    from .srt_converter import read_srt, srt_chunks
+    return read_srt, srt_chunks
+
+def load_sub():
+    from .sub_converter import read_sub, sub_chunks
+    return read_sub, sub_chunks
+
+def load_txt():
+    from .txt_converter import read_txt, txt_chunks
+    return read_txt, txt_chunks
+
+def load_ass():
+    from .ass_converter import read_ass, ass_chunks
+    return read_ass, ass_chunks
+
+def load_ssa():
+    from .ssa_converter import read_ssa, ssa_chunks
+    return read_ssa, ssa_chunks
+
+def load_vtt():
+    from .vtt_converter import read_vtt, vtt_chunks
+    return read_vtt, vtt_chunks
+
+def load_sbv():
+    from .sbv_converter import read_sbv, sbv_chunks
+    return read_sbv, sbv_chunks
+
+def load_dfxp():
+    from .dfp_converter import read_dfxp, dfxp_chunks
+    return read_dfxp, dfxp_chunks
+
+def load_stl():
+    from .stl_converter import read_stl, stl_chunks
+    return read_stl, stl_chunks
+
+def load_idx():
+    from .idx_converter import read_idx, idx_chunks
+    return read_idx, idx_chunks
+
+def load_mpl():
+    from .mpl_converter import read_mpl, mpl_chunks
+    return read_mpl, mpl_chunks
+
+def load_usf():
+    from .usf_converter import read_usf, usf_chunks
+    return read_usf, usf_chunks
+
+def load_lrc():
+    from .lrc_converter import read_lrc, lrc_chunks
+    return read_lrc, lrc_chunks
+
+def load_rt():
+    from .rt_converter import read_rt, rt_chunks
+    return read_rt, rt_chunks
+
+def load_ttml():
+    from .ttml_converter import read_ttml, ttml_chunks
+    return read_ttml, ttml_chunks
+
+def load_cap():
+    from .cap_converter import read_cap, cap_chunks
+    return read_cap, cap_chunks
+
+# Format name -> loader returning its (reader, chunks) pair
+FORMATS = {
+    "srt": load_srt,
+    "sub": load_sub,
+    "txt": load_txt,
+    "ass": load_ass,
+    "ssa": load_ssa,
+    "vtt": load_vtt,
+    "sbv": load_sbv,
+    "dfxp": load_dfxp,
+    "stl": load_stl,
+    "idx": load_idx,
+    "mpl": load_mpl,
+    "usf": load_usf,
+    "lrc": load_lrc,
+    "rt": load_rt,
+    "ttml": load_ttml,
+    "cap": load_cap,
+}
+
+# Formats timed in video frames; their readers and chunk writers take fps, and the timecode ones drop_frame too
+FRAME_FORMATS = {"sub", "cap", "stl"}
+TIMECODE_FORMATS = {"cap", "stl"}
+
+# Format name -> (reader, chunks) for the formats that have been loaded so far
+loaded_formats = {}
+
+def get_format(format):
+    """Returns the (reader, chunks) pair registered for a format name, importing its module if needed."""
+    format = format.lower()
+    if format not in loaded_formats:
+        try:
+            loader = FORMATS[format]
+        except KeyError:
+            raise ValueError(f"Unsupported format: {format}") from None
+        loaded_formats[format] = loader()
+    return loaded_formats[format]
+
+def frame_options(format, frame_rate=None):
+    """Keyword arguments handing an (fps, drop_frame) frame rate to a format's reader or writer.
+
+    Empty for formats timed in clock time, and when frame_rate is None so readers detect the rate themselves.
+    """
+    if frame_rate is None or format.lower() not in FRAME_FORMATS:
+        return {}
+    fps, drop_frame = frame_rate
+    if format.lower() in TIMECODE_FORMATS:
+        return {"fps": fps, "drop_frame": drop_frame}
+    return {"fps": fps}
+
+def read_cues(content, format, frame_rate=None):
+    """Parses content in the given format into a list of cues; frame_rate only matters to frame-based formats."""
+    reader, _ = get_format(format)
+    return reader(content, **frame_options(format, frame_rate))
+
+def write_cues(cues, format, frame_rate=None):
+    """Serializes cues into the given format."""
+    _, chunks = get_format(format)
+    return ''.join(chunks(cues, **frame_options(format, frame_rate)))
+
+def dump_cues(cues, format, file, frame_rate=None):
+    """Writes cues to an open file in the given format without building the whole output in memory."""
+    _, chunks = get_format(format)
+    for chunk in chunks(cues, **frame_options(format, frame_rate)):
+        file.write(chunk)
+
+def convert(content, source_format, target_format, frame_rate=None, target_frame_rate=None):
+    """Converts content from one format to another through the cue model."""
+    return write_cues(read_cues(content, source_format, frame_rate), target_format, target_frame_rate)
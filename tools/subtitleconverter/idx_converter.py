@@ -0,0 +1,36 @@
+import re
+from .cues import Cue, fill_missing_ends
+from .timestamps import format_time
+
+TIMESTAMP_PATTERN = re.compile(r'timestamp:\s*(\d+):(\d{2}):(\d{2}):(\d{3})')
+
+IDX_HEADER = (
+    "# VobSub index file, v7 (do not modify this line!)\n"
+    "size: 720x480\n"
+    "langidx: 0\n"
+    "id: en, index: 0\n"
+)
+
+def read_idx(content):
+    """Parses the timestamps of a VobSub index; the images themselves live in the .sub file."""
+    cues = []
+    for line in content.splitlines():
+        match = TIMESTAMP_PATTERN.match(line.strip())
+        if match:
+            hours, minutes, seconds, ms = map(int, match.groups())
+            cues.append(Cue(((hours * 60 + minutes) * 60 + seconds) * 1000 + ms, None, ""))
+    return fill_missing_ends(cues)
+
+def idx_chunks(cues):
+    """Yields the VobSub index header followed by one timestamp line per cue."""
+    yield IDX_HEADER
+    for cue in cues:
+        yield f"timestamp: {format_time(cue.start, ':')}, filepos: 000000000\n"
+
+def write_idx(cues):
+    """Serializes cue start times as a VobSub index."""
+    return ''.join(idx_chunks(cues))
+
+def convert_to_idx(content, format):
+    from .formats import convert
+    return convert(content, format, "idx")
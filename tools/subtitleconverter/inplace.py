@@ -0,0 +1,199 @@
+import os
+import re
+import mmap
+import shutil
+from array import array
+from .timestamps import parse_times, format_times
+from .timeline import Timeline, BATCH_SIZE, numpy
+from .decoding import detect_encoding, SAMPLE_SIZE
+from .cue_index import CueIndex
+
+# SRT timestamps are fixed width, so a retimed file differs from the original only in its timestamp digits.
+# Patching those digits through a memory map skips parsing and re-writing everything else.
+
+# Every line with an arrow; group 1 and 2 are only set when it is a fixed-width timing line that can be patched
+TIMING_PATTERN = re.compile(rb'^(?:[ \t]*(\d\d:\d\d:\d\d[,.]\d\d\d)[ \t]*-->[ \t]*(\d\d:\d\d:\d\d[,.]\d\d\d)(?!\d)|.*-->)', re.MULTILINE)
+# The largest time that still fits in two hour digits
+MAX_MS = 100 * 3600000 - 1
+
+# Offsets of the digits inside HH:MM:SS,mmm, with the milliseconds each one is worth and how many values it takes
+DIGIT_OFFSETS = (0, 1, 3, 4, 6, 7, 9, 10, 11)
+DIGIT_PLACES = (36000000, 3600000, 600000, 60000, 10000, 1000, 100, 10, 1)
+DIGIT_RANGES = (10, 10, 6, 10, 6, 10, 10, 10, 10)
+
+def patch_srt_times(file_path, save_path, operation, job=None):
+    """Runs operation(timeline, next_start) over the timings of an SRT file, rewriting only the timestamp bytes.
+
+    Returns False without writing anything when the file cannot be patched in place: UTF-16/32 text, a timing
+    line that is not fixed-width HH:MM:SS,mmm, or a new time outside 00:00:00,000-99:59:59,999.
+    Only the first pass is cancellable, so a cancel never leaves a file half patched.
+    """
+    with open(file_path, 'rb') as file:
+        if not patchable(file):
+            return False
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            offsets = timing_offsets(view)
+            if offsets is None:
+                return False
+            # Check every new time fits before the first byte changes
+            for batch, timeline in retimed_batches(view, offsets, operation):
+                if job:
+                    job.check_cancelled()
+                if not fits(timeline):
+                    return False
+
+    def patch(view):
+        for batch, timeline in retimed_batches(view, offsets, operation):
+            write_timeline(view, batch, timeline)
+
+    write_patched(file_path, save_path, patch)
+    return True
+
+def patch_srt_range(file_path, save_path, start_ms, end_ms, ms_shift, job=None):
+    """Shifts the cues of an SRT file lying completely inside [start_ms, end_ms] by ms_shift (clamped at zero).
+
+    The cues to move are looked up in a CueIndex of the file's timings, and only their timestamp digits are
+    written; every other byte is copied as it is. Returns False without writing anything when the file
+    cannot be patched, for the same reasons as patch_srt_times.
+    """
+    with open(file_path, 'rb') as file:
+        if not patchable(file):
+            return False
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            offsets = timing_offsets(view)
+            if offsets is None:
+                return False
+            batch, moved = range_batch(view, offsets, start_ms, end_ms, ms_shift)
+            if job:
+                job.check_cancelled()
+            if len(batch) and not fits(moved):
+                return False
+
+    def patch(view):
+        if len(batch):
+            write_timeline(view, batch, moved)
+
+    write_patched(file_path, save_path, patch)
+    return True
+
+def range_batch(view, offsets, start_ms, end_ms, ms_shift):
+    """The offset pairs of the cues lying completely inside [start_ms, end_ms] and a Timeline of their shifted times."""
+    if not offsets:
+        return [], None
+    pairs = next(offset_batches(offsets, len(offsets) // 2))
+    timings = read_timeline(view, pairs)
+    positions = CueIndex(timings.starts, timings.ends).within(start_ms, end_ms)
+    if numpy is not None:
+        return pairs[positions], Timeline(timings.starts[positions], timings.ends[positions], [], []).shift(ms_shift)
+    starts = [timings.starts[position] for position in positions]
+    ends = [timings.ends[position] for position in positions]
+    return [pairs[position] for position in positions], Timeline(starts, ends, [], []).shift(ms_shift)
+
+def patchable(file):
+    """Whether an open file's timing lines can be patched as bytes: it is not empty and not UTF-16/32."""
+    # Timing lines are only plain ASCII bytes in ASCII-compatible encodings
+    if os.fstat(file.fileno()).st_size == 0 or detect_encoding(file.read(SAMPLE_SIZE)).startswith(('utf-16', 'utf-32')):
+        return False
+    file.seek(0)
+    return True
+
+def write_patched(file_path, save_path, patch):
+    """Runs patch(view) on a writable map of a copy of file_path that then becomes save_path (or on file_path itself)."""
+    same_file = os.path.exists(save_path) and os.path.samefile(file_path, save_path)
+    target_path = file_path if same_file else save_path + '.part'
+    try:
+        if not same_file:
+            # A plain file copy is still far cheaper than parsing and formatting every cue
+            shutil.copyfile(file_path, target_path)
+        with open(target_path, 'r+b') as file, mmap.mmap(file.fileno(), 0) as view:
+            # The copy has the same bytes, so the offsets found in the source still apply
+            patch(view)
+            view.flush()
+        if not same_file:
+            os.replace(target_path, save_path)
+    finally:
+        if not same_file and os.path.exists(target_path):
+            os.remove(target_path)
+
+def timing_offsets(view):
+    """Offsets of the start and end stamp of every timing line, flattened into one array; None if a line cannot be patched."""
+    offsets = array('q')
+    for match in TIMING_PATTERN.finditer(view):
+        start = match.start(1)
+        if start < 0:
+            return None
+        offsets.append(start)
+        offsets.append(match.start(2))
+    return offsets
+
+def offset_batches(offsets, batch_size=BATCH_SIZE):
+    """Splits the flat offsets into batches of batch_size (start, end) pairs; (n, 2) arrays with NumPy, lists without."""
+    if numpy is not None:
+        pairs = numpy.frombuffer(offsets, dtype=numpy.int64).reshape(-1, 2)
+        for first in range(0, len(pairs), batch_size):
+            yield pairs[first:first + batch_size]
+    else:
+        for first in range(0, len(offsets), 2 * batch_size):
+            batch = offsets[first:first + 2 * batch_size]
+            yield list(zip(batch[0::2], batch[1::2]))
+
+def retimed_batches(view, offsets, operation, batch_size=BATCH_SIZE):
+    """Yields (batch, timeline) pairs after running operation(timeline, next_start) on each batch of timings."""
+    batches = offset_batches(offsets, batch_size)
+    batch = next(batches, None)
+    while batch is not None:
+        next_batch = next(batches, None)
+        timeline = read_timeline(view, batch)
+        operation(timeline, read_stamp(view, next_batch[0][0]) if next_batch is not None else None)
+        yield batch, timeline
+        batch = next_batch
+
+def read_stamp(view, offset):
+    """Milliseconds of the HH:MM:SS,mmm stamp at offset."""
+    offset = int(offset)
+    stamp = view[offset:offset + 12]
+    return ((int(stamp[0:2]) * 60 + int(stamp[3:5])) * 60 + int(stamp[6:8])) * 1000 + int(stamp[9:12])
+
+def stamp_text(view, offset):
+    """The HH:MM:SS,mmm stamp at offset."""
+    offset = int(offset)
+    return bytes(view[offset:offset + 12]).decode('ascii')
+
+def read_timeline(view, batch):
+    if numpy is not None:
+        # Gather all the digits of the batch at once; the fancy index copies, so no view of the map outlives this call
+        data = numpy.frombuffer(view, dtype=numpy.uint8)
+        digits = data[numpy.add.outer(batch, DIGIT_OFFSETS)].astype(numpy.int64) - 48
+        times = digits @ numpy.array(DIGIT_PLACES, dtype=numpy.int64)
+        starts, ends = times[:, 0], times[:, 1]
+    else:
+        starts = parse_times(stamp_text(view, start) for start, _ in batch)
+        ends = parse_times(stamp_text(view, end) for _, end in batch)
+    blanks = [''] * len(batch)
+    return Timeline(starts, ends, blanks, blanks)
+
+def fits(timeline):
+    """Whether every time of the timeline can be written back without changing its width."""
+    if numpy is not None:
+        low = min(timeline.starts.min(), timeline.ends.min())
+        high = max(timeline.starts.max(), timeline.ends.max())
+    else:
+        low = min(min(timeline.starts), min(timeline.ends))
+        high = max(max(timeline.starts), max(timeline.ends))
+    return 0 <= low and high <= MAX_MS
+
+def write_timeline(view, batch, timeline):
+    if numpy is not None:
+        data = numpy.frombuffer(view, dtype=numpy.uint8)
+        times = numpy.stack([timeline.starts, timeline.ends], axis=1)
+        digits = times[..., None] // numpy.array(DIGIT_PLACES) % numpy.array(DIGIT_RANGES) + 48
+        # Only the digits are written, so separators, spacing and line endings stay exactly as they were
+        data[numpy.add.outer(batch, DIGIT_OFFSETS)] = digits.astype(numpy.uint8)
+    else:
+        offsets = [offset for pair in batch for offset in pair]
+        times = [ms for pair in zip(timeline.starts, timeline.ends) for ms in pair]
+        for offset, stamp in zip(offsets, format_times(times)):
+            # Only the digits are written, so the separator already in the file stays
+            stamp = stamp.encode('ascii')
+            view[offset:offset + 8] = stamp[:8]
+            view[offset + 9:offset + 12] = stamp[9:]
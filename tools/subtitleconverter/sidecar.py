@@ -0,0 +1,257 @@
+import os
+import sys
+import json
+import mmap
+import struct
+import hashlib
+from array import array
+from itertools import accumulate
+from .cues import Cue
+from .formats import read_cues
+from .detect import sniff_format
+from .decoding import decode_bytes, LEGACY_ENCODINGS
+from .timeline import numpy
+from .cache import cache_enabled, cache_key, entry_path, entry_stored
+
+# A .subtl sidecar keeps the parsed cues of a subtitle file next to it, so opening the file again skips decoding
+# and parsing. Layout, all little-endian:
+#   header     HEADER_FORMAT, then the reader options as UTF-8 JSON, padded to 8 bytes
+#   starts     int64 per cue
+#   ends       int64 per cue
+#   texts      uint64 offsets per cue + 1 into the text blob
+#   styles     uint64 offsets per cue + 1 into the style blob (an empty style is None)
+#   blobs      the UTF-8 text blob, then the style blob
+# Sidecars are kept in the conversion cache, named by a hash of the source bytes and the reader options, so they
+# never end up in the user's folders and are evicted with the other cache entries. Only when asked for do they go
+# next to their source as <file>.subtl instead; the header then records the size, modification time and SHA-256
+# of the source, and a sidecar whose source no longer matches is ignored and rewritten.
+
+MAGIC = b'SUBTLCUE'
+VERSION = 1
+# magic, version, cue count, source size, source mtime (ns), source SHA-256, length of the options JSON
+HEADER_FORMAT = '<8sIQQq32sI'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+# enabled: whether files get sidecars at all; min_bytes: smaller files parse faster than a sidecar pays off;
+# next_to_source: write them next to the source files rather than into the conversion cache
+SIDECAR_SETTINGS = {"enabled": False, "min_bytes": 1024 * 1024, "next_to_source": False}
+
+def configure_sidecars(enabled, min_bytes=1024 * 1024, next_to_source=False):
+    """Turns .subtl sidecars on or off for files of at least min_bytes (set from config.json at startup).
+
+    Unless next_to_source, sidecars are only kept while the conversion cache is on.
+    """
+    SIDECAR_SETTINGS.update(enabled=enabled, min_bytes=min_bytes, next_to_source=next_to_source)
+
+def sidecar_settings():
+    """(enabled, min_bytes, next_to_source) of the current settings, for handing to worker processes."""
+    return SIDECAR_SETTINGS["enabled"], SIDECAR_SETTINGS["min_bytes"], SIDECAR_SETTINGS["next_to_source"]
+
+def sidecar_path(source_path):
+    return source_path + '.subtl'
+
+def reader_options(source_path, frame_rate):
+    """Everything besides the source bytes that decides what the cues are read as."""
+    options = {"extension": os.path.splitext(source_path)[1].lower(), "frame_rate": frame_rate, "encodings": LEGACY_ENCODINGS}
+    # Compared with what the sidecar's JSON reads back as, where tuples have become lists
+    return json.loads(json.dumps(options))
+
+class TextTable:
+    """Read-only sequence of the strings in a blob, decoded one at a time as they are asked for."""
+
+    def __init__(self, blob, offsets, empty=''):
+        self.blob = blob
+        self.offsets = offsets
+        self.empty = empty
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return str(self.blob[start:end], 'utf-8') if end > start else self.empty
+
+    def __iter__(self):
+        blob, empty = self.blob, self.empty
+        offsets = self.offsets.tolist()
+        # Decoding the whole blob at once is much faster, but byte offsets are only character offsets in ASCII text
+        decoded = str(blob, 'utf-8')
+        if len(decoded) == len(blob):
+            blob = decoded
+            for start, end in zip(offsets, offsets[1:]):
+                yield blob[start:end] if end > start else empty
+        else:
+            for start, end in zip(offsets, offsets[1:]):
+                yield str(blob[start:end], 'utf-8') if end > start else empty
+
+class CueSidecar:
+    """The cues of a .subtl file, read in place from a memory map.
+
+    starts and ends are int64 views of the mapped arrays, not copies; a Cue object is only built for the cues
+    that are asked for. Close it (or use it as a context manager) to release the map.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self.read_header()
+        except Exception:
+            self.map.close()
+            raise
+
+    def read_header(self):
+        if sys.byteorder != 'little' or len(self.map) < HEADER_SIZE:
+            raise ValueError("Not a cue sidecar")
+        magic, version, count, self.source_size, self.source_mtime, self.source_hash, options_length = \
+            struct.unpack_from(HEADER_FORMAT, self.map)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a cue sidecar of this version")
+        self.options = json.loads(self.map[HEADER_SIZE:HEADER_SIZE + options_length].decode('utf-8'))
+
+        view = memoryview(self.map)
+        position = HEADER_SIZE + options_length
+        position += -position % 8
+        arrays = []
+        for length in (count, count, count + 1, count + 1):
+            arrays.append(view[position:position + 8 * length].cast('q'))
+            position += 8 * length
+        self.starts, self.ends, text_offsets, style_offsets = arrays
+        if numpy is not None:
+            self.starts = numpy.frombuffer(self.starts, dtype=numpy.int64)
+            self.ends = numpy.frombuffer(self.ends, dtype=numpy.int64)
+        text_size = text_offsets[count]
+        self.texts = TextTable(view[position:position + text_size], text_offsets)
+        position += text_size
+        self.styles = TextTable(view[position:position + style_offsets[count]], style_offsets, None)
+        if position + style_offsets[count] > len(self.map):
+            raise ValueError("Truncated cue sidecar")
+
+    def __len__(self):
+        return len(self.texts)
+
+    def __getitem__(self, index):
+        return Cue(int(self.starts[index]), int(self.ends[index]), self.texts[index], self.styles[index])
+
+    def __iter__(self):
+        for start, end, text, style in zip(self.starts.tolist(), self.ends.tolist(), self.texts, self.styles):
+            yield Cue(start, end, text, style)
+
+    def matches(self, source_path, options, data=None):
+        """Whether this sidecar was written for the current bytes of source_path, read with options."""
+        stat = os.stat(source_path)
+        if stat.st_size != self.source_size or options != self.options:
+            return False
+        if stat.st_mtime_ns == self.source_mtime:
+            return True
+        # Touched but maybe not changed, e.g. copied or checked out again
+        if data is None:
+            with open(source_path, 'rb') as file:
+                data = file.read()
+        return hashlib.sha256(data).digest() == self.source_hash
+
+    def close(self):
+        # The views into the map have to go before the map can be closed
+        self.starts = self.ends = self.texts = self.styles = None
+        try:
+            self.map.close()
+        except BufferError:
+            # Someone still holds a view into the map; it is closed once that is gone too
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def write_sidecar(path, cues, options, source_size, source_mtime, source_hash):
+    """Writes a list of cues and the identity of their source to a .subtl file."""
+    starts = array('q', [cue.start for cue in cues])
+    ends = array('q', [cue.end for cue in cues])
+    texts = [cue.text.encode('utf-8') for cue in cues]
+    styles = [cue.style.encode('utf-8') if cue.style else b'' for cue in cues]
+    text_offsets = array('q', accumulate(map(len, texts), initial=0))
+    style_offsets = array('q', accumulate(map(len, styles), initial=0))
+
+    options = json.dumps(options).encode('utf-8')
+    header = struct.pack(HEADER_FORMAT, MAGIC, VERSION, len(starts), source_size, source_mtime, source_hash, len(options))
+    header += options + b'\0' * (-(len(header) + len(options)) % 8)
+    # Written under a temporary name, so a reader never maps half a file
+    with open(path + '.part', 'wb') as file:
+        file.write(header)
+        for table in (starts, ends, text_offsets, style_offsets):
+            table.tofile(file)
+        file.write(b''.join(texts))
+        file.write(b''.join(styles))
+    os.replace(path + '.part', path)
+
+def open_sidecar(source_path, options, data=None):
+    """The CueSidecar of source_path if there is one that is up to date, otherwise None."""
+    try:
+        sidecar = CueSidecar(sidecar_path(source_path))
+    except (OSError, ValueError):
+        return None
+    try:
+        if sidecar.matches(source_path, options, data):
+            return sidecar
+    except OSError:
+        pass
+    sidecar.close()
+    return None
+
+def open_cached_sidecar(path, options):
+    """The CueSidecar at path in the conversion cache, marked as just used; None if there is none for options."""
+    try:
+        os.utime(path)
+        sidecar = CueSidecar(path)
+    except (OSError, ValueError):
+        return None
+    if sidecar.options == options:
+        return sidecar
+    sidecar.close()
+    return None
+
+def open_cues(source_path, frame_rate=None, data=None):
+    """The cues of a subtitle file: straight from its sidecar when that is up to date, otherwise parsed.
+
+    Parsing a file of at least the configured size writes a sidecar for next time. data, when the caller has
+    already read the file, saves reading it again. The result is a CueSidecar or a list of cues; both iterate
+    as cues, and a CueSidecar should be closed when done.
+    """
+    options = reader_options(source_path, frame_rate)
+    enabled, min_bytes, next_to_source = sidecar_settings()
+    if enabled and next_to_source:
+        sidecar = open_sidecar(source_path, options, data)
+        if sidecar is not None:
+            return sidecar
+
+    if data is None:
+        with open(source_path, 'rb') as file:
+            data = file.read()
+    path = None
+    if enabled and len(data) >= min_bytes and sys.byteorder == 'little':
+        if next_to_source:
+            path = sidecar_path(source_path)
+        elif cache_enabled():
+            path = entry_path(cache_key(data, 'cues', options), 'subtl')
+            sidecar = open_cached_sidecar(path, options)
+            if sidecar is not None:
+                return sidecar
+
+    content = decode_bytes(data)
+    cues = read_cues(content, sniff_format(content, source_path), frame_rate)
+    if path is not None:
+        try:
+            if not next_to_source:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            write_sidecar(path, cues, options, len(data), os.stat(source_path).st_mtime_ns, hashlib.sha256(data).digest())
+        except OSError as e:
+            # A read-only folder only costs the speed-up next time
+            print(f"Failed to write cue sidecar: {e}")
+        else:
+            if not next_to_source:
+                entry_stored(path)
+    return cues
@@ -1,199 +1,93 @@
+import os
 import re
+from .cues import Cue
+from .timestamps import parse_time, format_time
+from .decoding import file_encoding
 
-def vtt_to_srt(content):
-    # Remove WEBVTT header and replace VTT timestamps with SRT timestamps
-    srt_content = re.sub(r'(\d{2}):(\d{2}):(\d{2})\.(\d{3})', r'\1:\2:\3,\4', content)
-    srt_content = srt_content.replace("WEBVTT\n\n", "")
-    return srt_content
+TIMING_PATTERN = re.compile(r'\s*(\S+)\s*-->\s*(\S+)')
+BLANK_LINE_PATTERN = re.compile(r'\n[^\S\n]*\n')
+# The timing line almost every SRT file uses; anything else goes through TIMING_PATTERN and parse_time
+CANONICAL_TIMING_PATTERN = re.compile(r'\s*(\d+):(\d\d):(\d\d)[,.](\d\d\d)\s*-->\s*(\d+):(\d\d):(\d\d)[,.](\d\d\d)(?:\s|$)')
 
-def ass_to_srt(content):
-    # Convert ASS format to SRT format
-    srt_content = ""
-    events_section = False
-    for line in content.splitlines():
-        if line.strip().startswith("[Events]"):
-            events_section = True
+def stream_srt(lines):
+    """Yields cues one at a time from an iterable of SRT lines, such as an open file."""
+    timing = None
+    text_lines = []
+    for line in lines:
+        line = line.rstrip('\r\n').lstrip('\ufeff')
+        if not line.strip():
+            if timing:
+                yield Cue(timing[0], timing[1], '\n'.join(text_lines))
+                timing = None
+                text_lines = []
             continue
-        if events_section and line.strip().startswith("Dialogue:"):
-            parts = line.split(',', 9)
-            start_time = parts[1].replace('.', ',')
-            end_time = parts[2].replace('.', ',')
-            text = parts[9].replace('\N', '\n').replace('{\\', '').replace('}', '')
-            srt_content += f"{start_time} --> {end_time}\n{text}\n\n"
-    return srt_content
-
-def sub_to_srt(content):
-    # Convert SUB format to SRT format
-    srt_content = ""
-    for index, line in enumerate(content.splitlines()):
-        if line.strip().isdigit():
-            srt_content += f"{line}\n"
-        elif re.match(r'\d{2}:\d{2}:\d{2}:\d{2}', line):
-            start_time, end_time = line.split(',')
-            srt_content += f"{start_time.replace(':', ',', 1)} --> {end_time.replace(':', ',', 1)}\n"
+        if timing is None:
+            # The numbering line is optional; the timing line is what starts a cue
+            match = TIMING_PATTERN.match(line)
+            if match and '-->' in line:
+                start, end = match.groups()
+                timing = (parse_time(start), parse_time(end))
         else:
-            srt_content += f"{line}\n"
-    return srt_content
-
-def txt_to_srt(content):
-    # Example logic for converting TXT to SRT
-    srt_content = ""
-    lines = content.splitlines()
-    for i in range(0, len(lines), 2):
-        if i + 1 < len(lines):
-            srt_content += f"{i//2 + 1}\n"
-            srt_content += f"{lines[i]}\n{lines[i+1]}\n\n"
-    return srt_content
-
-def ssa_to_srt(content):
-    # Convert SSA format to SRT format
-    srt_content = ""
-    events_section = False
-    for line in content.splitlines():
-        if line.strip().startswith("[Events]"):
-            events_section = True
-            continue
-        if events_section and line.strip().startswith("Dialogue:"):
-            parts = line.split(',', 9)
-            start_time = parts[1].replace('.', ',')
-            end_time = parts[2].replace('.', ',')
-            text = parts[9].replace('\N', '\n').replace('{\\', '').replace('}', '')
-            srt_content += f"{start_time} --> {end_time}\n{text}\n\n"
-    return srt_content
-
-def sbv_to_srt(content):
-    # Convert SBV format to SRT format
-    srt_content = ""
-    for index, line in enumerate(content.splitlines()):
-        if re.match(r'\d{2}:\d{2}:\d{2}\.\d{3},\d{2}:\d{2}:\d{2}\.\d{3}', line):
-            start_time, end_time = line.split(',')
-            srt_content += f"{index + 1}\n"
-            srt_content += f"{start_time.replace('.', ',')} --> {end_time.replace('.', ',')}\n"
-        else:
-            srt_content += f"{line}\n"
-    return srt_content
-
-def dfxp_to_srt(content):
-    # Convert DFXP (TTML) format to SRT format
-    srt_content = ""
-    matches = re.findall(r'<p begin="([^"]+)" end="([^"]+)"[^>]*>(.*?)</p>', content, re.DOTALL)
-    for index, (start, end, text) in enumerate(matches):
-        start_time = start.replace('.', ',')
-        end_time = end.replace('.', ',')
-        text = re.sub(r'<[^>]+>', '', text)  # Remove HTML tags
-        srt_content += f"{index + 1}\n"
-        srt_content += f"{start_time} --> {end_time}\n{text}\n\n"
-    return srt_content
-
-def stl_to_srt(content):
-    # Convert STL format to SRT format
-    srt_content = ""
-    matches = re.findall(r'TC_IN="([^"]+)" TC_OUT="([^"]+)"[^>]*>(.*?)</Subtitle>', content, re.DOTALL)
-    for index, (start, end, text) in enumerate(matches):
-        start_time = start.replace('.', ',')
-        end_time = end.replace('.', ',')
-        text = re.sub(r'<[^>]+>', '', text)  # Remove HTML tags
-        srt_content += f"{index + 1}\n"
-        srt_content += f"{start_time} --> {end_time}\n{text}\n\n"
-    return srt_content
-
-def mpl_to_srt(content):
-    # Convert MPL format to SRT format
-    srt_content = ""
-    matches = re.findall(r'\[(\d+)\]\s*(\d{2}:\d{2}:\d{2}:\d{2})\s*-\s*(\d{2}:\d{2}:\d{2}:\d{2})\s*(.*)', content)
-    for index, (num, start, end, text) in enumerate(matches):
-        start_time = start.replace(':', ',', 1)
-        end_time = end.replace(':', ',', 1)
-        srt_content += f"{index + 1}\n"
-        srt_content += f"{start_time} --> {end_time}\n{text}\n\n"
-    return srt_content
+            text_lines.append(line)
+    if timing:
+        yield Cue(timing[0], timing[1], '\n'.join(text_lines))
 
-def usf_to_srt(content):
-    # Convert USF format to SRT format
-    srt_content = ""
-    matches = re.findall(r'<subtitle start="([^"]+)" end="([^"]+)"[^>]*>(.*?)</subtitle>', content, re.DOTALL)
-    for index, (start, end, text) in enumerate(matches):
-        start_time = start.replace('.', ',')
-        end_time = end.replace('.', ',')
-        text = re.sub(r'<[^>]+>', '', text)  # Remove HTML tags
-        srt_content += f"{index + 1}\n"
-        srt_content += f"{start_time} --> {end_time}\n{text}\n\n"
-    return srt_content
+def read_srt(content):
+    """Parses SRT content into a list of cues."""
+    # Same rules as stream_srt, but whole blocks are split off at C speed instead of walking line by line
+    cues = []
+    for block in BLANK_LINE_PATTERN.split(content.replace('\r\n', '\n').replace('\r', '\n').replace('\ufeff', '')):
+        lines = block.split('\n')
+        for index, line in enumerate(lines):
+            if '-->' in line:
+                match = CANONICAL_TIMING_PATTERN.match(line)
+                if match:
+                    h1, m1, s1, f1, h2, m2, s2, f2 = map(int, match.groups())
+                    start = ((h1 * 60 + m1) * 60 + s1) * 1000 + f1
+                    end = ((h2 * 60 + m2) * 60 + s2) * 1000 + f2
+                else:
+                    match = TIMING_PATTERN.match(line)
+                    if not match:
+                        continue
+                    start, end = map(parse_time, match.groups())
+                text_lines = lines[index + 1:]
+                # Only the last block can end in blank lines (the end of the file)
+                while text_lines and not text_lines[-1].strip():
+                    text_lines.pop()
+                cues.append(Cue(start, end, '\n'.join(text_lines)))
+                break
+    return cues
 
-def lrc_to_srt(content):
-    # Convert LRC format to SRT format
-    srt_content = ""
-    matches = re.findall(r'\[(\d{2}):(\d{2})\.(\d{2})\](.*)', content)
-    for index, (minutes, seconds, centiseconds, text) in enumerate(matches):
-        start_time = f"00:{minutes}:{seconds},{centiseconds}00"
-        end_time = f"00:{minutes}:{int(seconds)+1},{centiseconds}00"
-        srt_content += f"{index + 1}\n"
-        srt_content += f"{start_time} --> {end_time}\n{text}\n\n"
-    return srt_content
+def srt_chunks(cues):
+    """Yields the SRT text of each cue, renumbering from 1."""
+    for index, cue in enumerate(cues, start=1):
+        yield f"{index}\n{format_time(cue.start)} --> {format_time(cue.end)}\n{cue.text}\n\n"
 
-def rt_to_srt(content):
-    # Convert RT format to SRT format
-    srt_content = ""
-    matches = re.findall(r'<Time begin="([^"]+)" end="([^"]+)"[^>]*>(.*?)</Time>', content, re.DOTALL)
-    for index, (start, end, text) in enumerate(matches):
-        start_time = start.replace('.', ',')
-        end_time = end.replace('.', ',')
-        text = re.sub(r'<[^>]+>', '', text)  # Remove HTML tags
-        srt_content += f"{index + 1}\n"
-        srt_content += f"{start_time} --> {end_time}\n{text}\n\n"
-    return srt_content
+def write_srt(cues):
+    """Serializes cues as SRT content."""
+    return ''.join(srt_chunks(cues))
 
-def ttml_to_srt(content):
-    # Convert TTML format to SRT format
-    srt_content = ""
-    matches = re.findall(r'<p begin="([^"]+)" end="([^"]+)"[^>]*>(.*?)</p>', content, re.DOTALL)
-    for index, (start, end, text) in enumerate(matches):
-        start_time = start.replace('.', ',')
-        end_time = end.replace('.', ',')
-        text = re.sub(r'<[^>]+>', '', text)  # Remove HTML tags
-        srt_content += f"{index + 1}\n"
-        srt_content += f"{start_time} --> {end_time}\n{text}\n\n"
-    return srt_content
+def dump_srt(cues, file):
+    """Writes cues to an open file as they arrive, without building the whole output in memory."""
+    for chunk in srt_chunks(cues):
+        file.write(chunk)
 
-def cap_to_srt(content):
-    # Convert CAP format to SRT format
-    srt_content = ""
-    matches = re.findall(r'(\d{2}:\d{2}:\d{2}:\d{2})\s*-\s*(\d{2}:\d{2}:\d{2}:\d{2})\s*(.*)', content)
-    for index, (start, end, text) in enumerate(matches):
-        start_time = start.replace(':', ',', 1)
-        end_time = end.replace(':', ',', 1)
-        srt_content += f"{index + 1}\n"
-        srt_content += f"{start_time} --> {end_time}\n{text}\n\n"
-    return srt_content
+def rewrite_srt_stream(file_path, save_path, process, encoding=None):
+    """Streams the cues of file_path through process(cues), which yields the cues to write to save_path."""
+    # The result keeps the encoding of the source unless one is given
+    errors = 'strict' if encoding else 'replace'
+    encoding = encoding or file_encoding(file_path)
+    # Write next to the destination first so that saving over the source file is safe
+    temp_path = save_path + '.part'
+    try:
+        with open(file_path, 'r', encoding=encoding, errors=errors) as source, \
+                open(temp_path, 'w', encoding=encoding, errors=errors) as target:
+            dump_srt(process(stream_srt(source)), target)
+        os.replace(temp_path, save_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
 
 def convert_to_srt(content, format):
-    if format == "vtt":
-        return vtt_to_srt(content)
-    elif format == "ass":
-        return ass_to_srt(content)
-    elif format == "sub":
-        return sub_to_srt(content)
-    elif format == "txt":
-        return txt_to_srt(content)
-    elif format == "ssa":
-        return ssa_to_srt(content)
-    elif format == "sbv":
-        return sbv_to_srt(content)
-    elif format == "dfxp":
-        return dfxp_to_srt(content)
-    elif format == "stl":
-        return stl_to_srt(content)
-    elif format == "mpl":
-        return mpl_to_srt(content)
-    elif format == "usf":
-        return usf_to_srt(content)
-    elif format == "lrc":
-        return lrc_to_srt(content)
-    elif format == "rt":
-        return rt_to_srt(content)
-    elif format == "ttml":
-        return ttml_to_srt(content)
-    elif format == "cap":
-        return cap_to_srt(content)
-    else:
-        raise ValueError(f"Unsupported format: {format}")
\ No newline at end of file
+    from .formats import convert
+    return convert(content, format, "srt")
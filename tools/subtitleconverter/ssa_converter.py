@@ -1,183 +1,29 @@
-import re
-
-def srt_to_ssa(content):
-    ssa_content = "[Script Info]\nTitle: Default SSA\nScriptType: v4.00\n\n[V4 Styles]\nFormat: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, TertiaryColour, BackColour, Bold, Italic, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, AlphaLevel, Encoding\nStyle: Default,Arial,20,16777215,0,16777215,0,-1,0,1,1,0,2,10,10,10,0,0\n\n[Events]\nFormat: Marked, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
-    count = 0
-    for line in content.splitlines():
-        if re.match(r'\d+', line):
-            count += 1
-        elif re.match(r'\d{2}:\d{2}:\d{2},\d{3}', line):
-            times = line.replace(',', '.').split(' --> ')
-            start_time = times[0]
-            end_time = times[1]
-        else:
-            text = line.replace('\n', '\\N')
-            ssa_content += f"Dialogue: Marked=0,{start_time},{end_time},Default,,0,0,0,,{text}\n"
-    return ssa_content
-
-def vtt_to_ssa(content):
-    ssa_content = "[Script Info]\nTitle: Default SSA\nScriptType: v4.00\n\n[V4 Styles]\nFormat: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, TertiaryColour, BackColour, Bold, Italic, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, AlphaLevel, Encoding\nStyle: Default,Arial,20,16777215,0,16777215,0,-1,0,1,1,0,2,10,10,10,0,0\n\n[Events]\nFormat: Marked, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
-    lines = content.splitlines()
-    for i in range(len(lines)):
-        if '-->' in lines[i]:
-            times = lines[i].replace('.', ',').split(' --> ')
-            start_time = times[0]
-            end_time = times[1]
-            text = lines[i+1].replace('\n', '\\N')
-            ssa_content += f"Dialogue: Marked=0,{start_time},{end_time},Default,,0,0,0,,{text}\n"
-    return ssa_content
-
-def ass_to_ssa(content):
-    ssa_content = content.replace("ScriptType: v4.00+", "ScriptType: v4.00")
-    ssa_content = ssa_content.replace("[V4+ Styles]", "[V4 Styles]")
-    ssa_content = ssa_content.replace("Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding", "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, TertiaryColour, BackColour, Bold, Italic, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, AlphaLevel, Encoding")
-    ssa_content = ssa_content.replace("Style: Default,Arial,20,&H00FFFFFF,&H000000FF,&H00000000,&H00000000,-1,0,0,0,100,100,0,0,1,1,0,2,10,10,10,1", "Style: Default,Arial,20,16777215,0,16777215,0,-1,0,1,1,0,2,10,10,10,0,0")
-    ssa_content = ssa_content.replace("Dialogue: 0,", "Dialogue: Marked=0,")
-    return ssa_content
-
-def sub_to_ssa(content):
-    ssa_content = "[Script Info]\nTitle: Default SSA\nScriptType: v4.00\n\n[V4 Styles]\nFormat: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, TertiaryColour, BackColour, Bold, Italic, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, AlphaLevel, Encoding\nStyle: Default,Arial,20,16777215,0,16777215,0,-1,0,1,1,0,2,10,10,10,0,0\n\n[Events]\nFormat: Marked, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
-    for line in content.splitlines():
-        if re.match(r'\d{2}:\d{2}:\d{2}:\d{2}', line):
-            times = line.split(',')
-            start_time = times[0].replace(':', '.', 1)
-            end_time = times[1].replace(':', '.', 1)
-            text = times[2].replace('\n', '\\N')
-            ssa_content += f"Dialogue: Marked=0,{start_time},{end_time},Default,,0,0,0,,{text}\n"
-    return ssa_content
-
-def txt_to_ssa(content):
-    ssa_content = "[Script Info]\nTitle: Default SSA\nScriptType: v4.00\n\n[V4 Styles]\nFormat: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, TertiaryColour, BackColour, Bold, Italic, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, AlphaLevel, Encoding\nStyle: Default,Arial,20,16777215,0,16777215,0,-1,0,1,1,0,2,10,10,10,0,0\n\n[Events]\nFormat: Marked, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
-    lines = content.splitlines()
-    for i in range(0, len(lines), 2):
-        if i + 1 < len(lines):
-            start_time = f"0:00:0{i//2}"
-            end_time = f"0:00:0{i//2 + 1}"
-            text = lines[i].replace('\n', '\\N')
-            ssa_content += f"Dialogue: Marked=0,{start_time},{end_time},Default,,0,0,0,,{text}\n"
-    return ssa_content
-
-def sbv_to_ssa(content):
-    ssa_content = "[Script Info]\nTitle: Default SSA\nScriptType: v4.00\n\n[V4 Styles]\nFormat: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, TertiaryColour, BackColour, Bold, Italic, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, AlphaLevel, Encoding\nStyle: Default,Arial,20,16777215,0,16777215,0,-1,0,1,1,0,2,10,10,10,0,0\n\n[Events]\nFormat: Marked, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
-    for line in content.splitlines():
-        if re.match(r'\d{2}:\d{2}:\d{2}\.\d{3}', line):
-            start_time, end_time = line.split(',')
-            ssa_content += f"Dialogue: Marked=0,{start_time.replace('.', ':')},{end_time.replace('.', ':')},Default,,0,0,0,,\n"
-        else:
-            ssa_content += f"{line}\n"
-    return ssa_content
-
-def dfxp_to_ssa(content):
-    ssa_content = "[Script Info]\nTitle: Default SSA\nScriptType: v4.00\n\n[V4 Styles]\nFormat: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, TertiaryColour, BackColour, Bold, Italic, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, AlphaLevel, Encoding\nStyle: Default,Arial,20,16777215,0,16777215,0,-1,0,1,1,0,2,10,10,10,0,0\n\n[Events]\nFormat: Marked, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
-    matches = re.findall(r'<p begin="([^"]+)" end="([^"]+)"[^>]*>(.*?)</p>', content, re.DOTALL)
-    for index, (start, end, text) in enumerate(matches):
-        start_time = start.replace('.', ':')
-        end_time = end.replace('.', ':')
-        text = re.sub(r'<[^>]+>', '', text).replace('\n', '\\N')  # Remove HTML tags and replace newline
-        ssa_content += f"Dialogue: Marked=0,{start_time},{end_time},Default,,0,0,0,,{text}\n"
-    return ssa_content
-
-def stl_to_ssa(content):
-    ssa_content = "[Script Info]\nTitle: Default SSA\nScriptType: v4.00\n\n[V4 Styles]\nFormat: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, TertiaryColour, BackColour, Bold, Italic, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, AlphaLevel, Encoding\nStyle: Default,Arial,20,16777215,0,16777215,0,-1,0,1,1,0,2,10,10,10,0,0\n\n[Events]\nFormat: Marked, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
-    matches = re.findall(r'TC_IN="([^"]+)" TC_OUT="([^"]+)"[^>]*>(.*?)</Subtitle>', content, re.DOTALL)
-    for index, (start, end, text) in enumerate(matches):
-        start_time = start.replace('.', ':')
-        end_time = end.replace('.', ':')
-        text = re.sub(r'<[^>]+>', '', text).replace('\n', '\\N')  # Remove HTML tags and replace newline
-        ssa_content += f"Dialogue: Marked=0,{start_time},{end_time},Default,,0,0,0,,{text}\n"
-    return ssa_content
-
-def mpl_to_ssa(content):
-    ssa_content = "[Script Info]\nTitle: Default SSA\nScriptType: v4.00\n\n[V4 Styles]\nFormat: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, TertiaryColour, BackColour, Bold, Italic, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, AlphaLevel, Encoding\nStyle: Default,Arial,20,16777215,0,16777215,0,-1,0,1,1,0,2,10,10,10,0,0\n\n[Events]\nFormat: Marked, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
-    matches = re.findall(r'\[(\d+)\]\s*(\d{2}:\d{2}:\d{2}:\d{2})\s*-\s*(\d{2}:\d{2}:\d{2}:\d{2})\s*(.*)', content)
-    for index, (num, start, end, text) in enumerate(matches):
-        start_time = start.replace(':', '.', 1)
-        end_time = end.replace(':', '.', 1)
-        ssa_content += f"Dialogue: Marked=0,{start_time},{end_time},Default,,0,0,0,,{text}\n"
-    return ssa_content
-
-def usf_to_ssa(content):
-    ssa_content = "[Script Info]\nTitle: Default SSA\nScriptType: v4.00\n\n[V4 Styles]\nFormat: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, TertiaryColour, BackColour, Bold, Italic, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, AlphaLevel, Encoding\nStyle: Default,Arial,20,16777215,0,16777215,0,-1,0,1,1,0,2,10,10,10,0,0\n\n[Events]\nFormat: Marked, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
-    matches = re.findall(r'<subtitle start="([^"]+)" end="([^"]+)"[^>]*>(.*?)</subtitle>', content, re.DOTALL)
-    for index, (start, end, text) in enumerate(matches):
-        start_time = start.replace('.', ':')
-        end_time = end.replace('.', ':')
-        text = re.sub(r'<[^>]+>', '', text).replace('\n', '\\N')  # Remove HTML tags and replace newline
-        ssa_content += f"Dialogue: Marked=0,{start_time},{end_time},Default,,0,0,0,,{text}\n"
-    return ssa_content
-
-def lrc_to_ssa(content):
-    ssa_content = "[Script Info]\nTitle: Default SSA\nScriptType: v4.00\n\n[V4 Styles]\nFormat: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, TertiaryColour, BackColour, Bold, Italic, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, AlphaLevel, Encoding\nStyle: Default,Arial,20,16777215,0,16777215,0,-1,0,1,1,0,2,10,10,10,0,0\n\n[Events]\nFormat: Marked, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
-    matches = re.findall(r'\[(\d{2}):(\d{2})\.(\d{2})\](.*)', content)
-    for index, (minutes, seconds, centiseconds, text) in enumerate(matches):
-        start_time = f"0:{minutes}:{seconds}.{centiseconds}"
-        end_time = f"0:{minutes}:{int(seconds)+1}.{centiseconds}"
-        ssa_content += f"Dialogue: Marked=0,{start_time},{end_time},Default,,0,0,0,,{text}\n"
-    return ssa_content
-
-def rt_to_ssa(content):
-    ssa_content = "[Script Info]\nTitle: Default SSA\nScriptType: v4.00\n\n[V4 Styles]\nFormat: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, TertiaryColour, BackColour, Bold, Italic, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, AlphaLevel, Encoding\nStyle: Default,Arial,20,16777215,0,16777215,0,-1,0,1,1,0,2,10,10,10,0,0\n\n[Events]\nFormat: Marked, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
-    matches = re.findall(r'<Time begin="([^"]+)" end="([^"]+)"[^>]*>(.*?)</Time>', content, re.DOTALL)
-    for index, (start, end, text) in enumerate(matches):
-        start_time = start.replace('.', ':')
-        end_time = end.replace('.', ':')
-        text = re.sub(r'<[^>]+>', '', text).replace('\n', '\\N')  # Remove HTML tags and replace newline
-        ssa_content += f"Dialogue: Marked=0,{start_time},{end_time},Default,,0,0,0,,{text}\n"
-    return ssa_content
-
-def ttml_to_ssa(content):
-    ssa_content = "[Script Info]\nTitle: Default SSA\nScriptType: v4.00\n\n[V4 Styles]\nFormat: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, TertiaryColour, BackColour, Bold, Italic, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, AlphaLevel, Encoding\nStyle: Default,Arial,20,16777215,0,16777215,0,-1,0,1,1,0,2,10,10,10,0,0\n\n[Events]\nFormat: Marked, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
-    matches = re.findall(r'<p begin="([^"]+)" end="([^"]+)"[^>]*>(.*?)</p>', content, re.DOTALL)
-    for index, (start, end, text) in enumerate(matches):
-        start_time = start.replace('.', ':')
-        end_time = end.replace('.', ':')
-        text = re.sub(r'<[^>]+>', '', text).replace('\n', '\\N')  # Remove HTML tags and replace newline
-        ssa_content += f"Dialogue: Marked=0,{start_time},{end_time},Default,,0,0,0,,{text}\n"
-    return ssa_content
-
-def cap_to_ssa(content):
-    ssa_content = "[Script Info]\nTitle: Default SSA\nScriptType: v4.00\n\n[V4 Styles]\nFormat: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, TertiaryColour, BackColour, Bold, Italic, Underline, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding\n"
-    ssa_content += "Style: Default,Arial,20,16777215,0,16777215,0,-1,0,0,0,100,100,0,0,1,1,0,2,10,10,10,1\n"
-    ssa_content += "\n[Events]\n"
-    ssa_content += "Format: Marked, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
-
-    matches = re.findall(r'<Caption time="([^"]+)"[^>]*>(.*?)</Caption>', content, re.DOTALL)
-    for index, (time, text) in enumerate(matches):
-        start_time = time.replace('.', ':')
-        end_time = f"0:{int(time.split(':')[1]) + 1}:{time.split(':')[2]}"
-        text = re.sub(r'<[^>]+>', '', text).replace('\n', '\\N')  # Remove HTML tags and replace newline
-        ssa_content += f"Dialogue: Marked=0,{start_time},{end_time},Default,,0,0,0,,{text}\n"
-
-    return ssa_content
+from .ass_converter import read_ass, dialogue_lines
+
+SSA_HEADER = (
+    "[Script Info]\n"
+    "Title: Default SSA\n"
+    "ScriptType: v4.00\n"
+    "\n[V4 Styles]\n"
+    "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, TertiaryColour, BackColour, Bold, Italic, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, AlphaLevel, Encoding\n"
+    "Style: Default,Arial,20,16777215,0,16777215,0,-1,0,1,1,0,2,10,10,10,0,0\n"
+    "\n[Events]\n"
+    "Format: Marked, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
+)
+
+def read_ssa(content):
+    """Parses SSA content into a list of cues (same event layout as ASS)."""
+    return read_ass(content)
+
+def ssa_chunks(cues):
+    """Yields the SSA header followed by one Dialogue line per cue."""
+    yield SSA_HEADER
+    yield from dialogue_lines(cues, "Marked=0")
+
+def write_ssa(cues):
+    """Serializes cues as SSA content."""
+    return ''.join(ssa_chunks(cues))
 
 def convert_to_ssa(format, content):
-    if format == "srt":
-        return srt_to_ssa(content)
-    elif format == "vtt":
-        return vtt_to_ssa(content)
-    elif format == "ass":
-        return ass_to_ssa(content)
-    elif format == "sub":
-        return sub_to_ssa(content)
-    elif format == "txt":
-        return txt_to_ssa(content)
-    elif format == "sbv":
-        return sbv_to_ssa(content)
-    elif format == "dfxp":
-        return dfxp_to_ssa(content)
-    elif format == "stl":
-        return stl_to_ssa(content)
-    elif format == "mpl":
-        return mpl_to_ssa(content)
-    elif format == "usf":
-        return usf_to_ssa(content)
-    elif format == "lrc":
-        return lrc_to_ssa(content)
-    elif format == "rt":
-        return rt_to_ssa(content)
-    elif format == "ttml":
-        return ttml_to_ssa(content)
-    elif format == "cap":
-        return cap_to_ssa(content)
-    else:
-        raise ValueError("Unsupported format")
\ No newline at end of file
+    from .formats import convert
+    return convert(content, format, "ssa")
@@ -1,173 +1,56 @@
 import re
+from .cues import Cue, fill_missing_ends
+from .timestamps import DEFAULT_FPS, ms_to_frames, parse_frame_rate
+from .timeline import frames_to_times
 
-def srt_to_sub(content):
-    sub_content = ""
-    for line in content.splitlines():
-        if re.match(r'\d+', line):
-            continue
-        elif re.match(r'\d{2}:\d{2}:\d{2},\d{3}', line):
-            times = line.replace(',', ':').split(' --> ')
-            start_time = times[0]
-            end_time = times[1]
-            sub_content += f"{start_time},{end_time}\n"
-        else:
-            sub_content += f"{line}\n"
-    return sub_content
-
-def vtt_to_sub(content):
-    sub_content = ""
-    lines = content.splitlines()
-    for i in range(len(lines)):
-        if '-->' in lines[i]:
-            times = lines[i].replace('.', ':').split(' --> ')
-            start_time = times[0]
-            end_time = times[1]
-            sub_content += f"{start_time},{end_time}\n"
-        else:
-            sub_content += f"{lines[i]}\n"
-    return sub_content
-
-def ass_to_sub(content):
-    sub_content = ""
-    for line in content.splitlines():
-        if line.startswith("Dialogue:"):
-            parts = line.split(',')
-            start_time = parts[1].replace('.', ':')
-            end_time = parts[2].replace('.', ':')
-            text = ','.join(parts[9:]).replace('\\N', '\n').replace('{\\', '').replace('}', '')
-            sub_content += f"{start_time},{end_time}\n{text}\n"
-    return sub_content
-
-def txt_to_sub(content):
-    sub_content = ""
-    lines = content.splitlines()
-    for i in range(0, len(lines), 2):
-        if i + 1 < len(lines):
-            start_time = f"0:00:0{i//2}"
-            end_time = f"0:00:0{i//2 + 1}"
-            text = lines[i].replace('\n', '\n')
-            sub_content += f"{start_time},{end_time}\n{text}\n"
-    return sub_content
+LINE_PATTERN = re.compile(r'\{(\d+)\}\{(\d*)\}(.*)')
+STYLE_PATTERN = re.compile(r'\{[yYcCfFsSpP]:[^}]*\}')
 
-def ssa_to_sub(content):
-    # Since SSA and ASS have a similar structure, use the same logic as ASS to SUB conversion
-    return ass_to_sub(content)
+def read_sub(content, fps=None):
+    """Parses MicroDVD content ({start_frame}{end_frame}text) into a list of cues.
 
-def sbv_to_sub(content):
-    sub_content = ""
+    Without an explicit fps, the rate the file declares is used, or DEFAULT_FPS if it declares none.
+    """
+    start_frames, end_frames, texts = [], [], []
     for line in content.splitlines():
-        if re.match(r'\d{2}:\d{2}:\d{2}\.\d{3}', line):
-            start_time, end_time = line.split(',')
-            sub_content += f"{start_time.replace('.', ':')},{end_time.replace('.', ':')}\n"
-        else:
-            sub_content += f"{line}\n"
-    return sub_content
-
-def dfxp_to_sub(content):
-    sub_content = ""
-    matches = re.findall(r'<p begin="([^"]+)" end="([^"]+)"[^>]*>(.*?)</p>', content, re.DOTALL)
-    for index, (start, end, text) in enumerate(matches):
-        start_time = start.replace('.', ':')
-        end_time = end.replace('.', ':')
-        text = re.sub(r'<[^>]+>', '', text).replace('\n', '\n')  # Remove HTML tags and replace newline
-        sub_content += f"{start_time},{end_time}\n{text}\n"
-    return sub_content
-
-def stl_to_sub(content):
-    sub_content = ""
-    matches = re.findall(r'TC_IN="([^"]+)" TC_OUT="([^"]+)"[^>]*>(.*?)</Subtitle>', content, re.DOTALL)
-    for index, (start, end, text) in enumerate(matches):
-        start_time = start.replace('.', ':')
-        end_time = end.replace('.', ':')
-        text = re.sub(r'<[^>]+>', '', text).replace('\n', '\n')  # Remove HTML tags and replace newline
-        sub_content += f"{start_time},{end_time}\n{text}\n"
-    return sub_content
-
-def mpl_to_sub(content):
-    sub_content = ""
-    matches = re.findall(r'\[(\d+)\]\s*(\d{2}:\d{2}:\d{2}:\d{2})\s*-\s*(\d{2}:\d{2}:\d{2}:\d{2})\s*(.*)', content)
-    for index, (num, start, end, text) in enumerate(matches):
-        start_time = start.replace(':', '.', 1)
-        end_time = end.replace(':', '.', 1)
-        sub_content += f"{start_time},{end_time}\n{text}\n"
-    return sub_content
-
-def usf_to_sub(content):
-    sub_content = ""
-    matches = re.findall(r'<subtitle start="([^"]+)" end="([^"]+)"[^>]*>(.*?)</subtitle>', content, re.DOTALL)
-    for index, (start, end, text) in enumerate(matches):
-        start_time = start.replace('.', ':')
-        end_time = end.replace('.', ':')
-        text = re.sub(r'<[^>]+>', '', text).replace('\n', '\n')  # Remove HTML tags and replace newline
-        sub_content += f"{start_time},{end_time}\n{text}\n"
-    return sub_content
-
-def lrc_to_sub(content):
-    sub_content = ""
-    matches = re.findall(r'\[(\d{2}):(\d{2})\.(\d{2})\](.*)', content)
-    for index, (minutes, seconds, centiseconds, text) in enumerate(matches):
-        start_time = f"0:{minutes}:{seconds}.{centiseconds}"
-        end_time = f"0:{minutes}:{int(seconds)+1}.{centiseconds}"
-        sub_content += f"{start_time},{end_time}\n{text}\n"
-    return sub_content
-
-def rt_to_sub(content):
-    sub_content = ""
-    matches = re.findall(r'<Time begin="([^"]+)" end="([^"]+)"[^>]*>(.*?)</Time>', content, re.DOTALL)
-    for index, (start, end, text) in enumerate(matches):
-        start_time = start.replace('.', ':')
-        end_time = end.replace('.', ':')
-        text = re.sub(r'<[^>]+>', '', text).replace('\n', '\n')  # Remove HTML tags and replace newline
-        sub_content += f"{start_time},{end_time}\n{text}\n"
-    return sub_content
-
-def ttml_to_sub(content):
-    sub_content = ""
-    matches = re.findall(r'<p begin="([^"]+)" end="([^"]+)"[^>]*>(.*?)</p>', content, re.DOTALL)
-    for index, (start, end, text) in enumerate(matches):
-        start_time = start.replace('.', ':')
-        end_time = end.replace('.', ':')
-        text = re.sub(r'<[^>]+>', '', text).replace('\n', '\n')  # Remove HTML tags and replace newline
-        sub_content += f"{start_time},{end_time}\n{text}\n"
-    return sub_content
-
-def cap_to_sub(content):
-    sub_content = ""
-    matches = re.findall(r'(\d{2}:\d{2}:\d{2}:\d{2})\s*-\s*(\d{2}:\d{2}:\d{2}:\d{2})\s*(.*)', content)
-    for index, (start, end, text) in enumerate(matches):
-        start_time = start.replace(':', '.', 1)
-        end_time = end.replace(':', '.', 1)
-        sub_content += f"{start_time},{end_time}\n{text}\n"
-    return sub_content
+        match = LINE_PATTERN.match(line.strip())
+        if not match:
+            continue
+        start, end, text = match.groups()
+        # A leading {1}{1}23.976 line declares the frame rate of the file
+        if not texts and start in ("0", "1") and end == start:
+            try:
+                declared_fps, _ = parse_frame_rate(text)
+                if fps is None:
+                    fps = declared_fps
+                continue
+            except ValueError:
+                pass
+        start_frames.append(int(start))
+        end_frames.append(int(end) if end else -1)
+        texts.append(STYLE_PATTERN.sub('', text).replace('|', '\n'))
+
+    # All frame numbers are converted at once rather than cue by cue
+    fps = fps or DEFAULT_FPS
+    starts = frames_to_times(start_frames, fps)
+    ends = frames_to_times(end_frames, fps)
+    cues = [Cue(start, end if end_frame >= 0 else None, text)
+            for start, end, end_frame, text in zip(starts, ends, end_frames, texts)]
+    return fill_missing_ends(cues)
+
+def sub_chunks(cues, fps=None):
+    """Yields one MicroDVD line per cue, after a {1}{1}fps line when fps is given."""
+    if fps is not None:
+        yield f"{{1}}{{1}}{round(fps, 3):g}\n"
+    fps = fps or DEFAULT_FPS
+    for cue in cues:
+        text = cue.text.replace('\n', '|')
+        yield f"{{{ms_to_frames(cue.start, fps)}}}{{{ms_to_frames(cue.end, fps)}}}{text}\n"
+
+def write_sub(cues, fps=None):
+    """Serializes cues as MicroDVD content."""
+    return ''.join(sub_chunks(cues, fps))
 
 def convert_to_sub(content, format):
-    if format == "srt":
-        return srt_to_sub(content)
-    elif format == "vtt":
-        return vtt_to_sub(content)
-    elif format == "ass":
-        return ass_to_sub(content)
-    elif format == "txt":
-        return txt_to_sub(content)
-    elif format == "ssa":
-        return ssa_to_sub(content)
-    elif format == "sbv":
-        return sbv_to_sub(content)
-    elif format == "dfxp":
-        return dfxp_to_sub(content)
-    elif format == "stl":
-        return stl_to_sub(content)
-    elif format == "mpl":
-        return mpl_to_sub(content)
-    elif format == "usf":
-        return usf_to_sub(content)
-    elif format == "lrc":
-        return lrc_to_sub(content)
-    elif format == "rt":
-        return rt_to_sub(content)
-    elif format == "ttml":
-        return ttml_to_sub(content)
-    elif format == "cap":
-        return cap_to_sub(content)
-    else:
-        raise ValueError(f"Unsupported format: {format}")
\ No newline at end of file
+    from .formats import convert
+    return convert(content, format, "sub")
@@ -0,0 +1,158 @@
+from bisect import bisect_left, bisect_right
+from itertools import islice
+from .cues import Cue
+from .timestamps import frames_to_ms
+
+# NumPy is optional; without it the same operations run as plain list comprehensions
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Cues are transformed this many at a time, so even huge files are never held in memory at once
+BATCH_SIZE = 65536
+
+class Timeline:
+    """Cue timings as two parallel int64 arrays (plain lists without NumPy) plus a table of texts and styles."""
+
+    def __init__(self, starts, ends, texts, styles):
+        if numpy is not None:
+            starts = numpy.asarray(starts, dtype=numpy.int64)
+            ends = numpy.asarray(ends, dtype=numpy.int64)
+        self.starts = starts
+        self.ends = ends
+        self.texts = texts
+        self.styles = styles
+        self.sorted = None  # Whether starts are in order; worked out on first use
+
+    @classmethod
+    def from_cues(cls, cues):
+        return cls([cue.start for cue in cues], [cue.end for cue in cues],
+                   [cue.text for cue in cues], [cue.style for cue in cues])
+
+    def __len__(self):
+        return len(self.texts)
+
+    def to_cues(self):
+        starts, ends = self.starts, self.ends
+        if numpy is not None:
+            starts, ends = starts.tolist(), ends.tolist()
+        return [Cue(start, end, text, style) for start, end, text, style in zip(starts, ends, self.texts, self.styles)]
+
+    def is_sorted(self):
+        if self.sorted is None:
+            if numpy is not None:
+                self.sorted = bool((self.starts[1:] >= self.starts[:-1]).all())
+            else:
+                self.sorted = all(a <= b for a, b in zip(self.starts, self.starts[1:]))
+        return self.sorted
+
+    def span(self, start_ms=None, end_ms=None):
+        """Returns the (first, last + 1) positions of the cues that can start inside [start_ms, end_ms].
+
+        Sorted starts (the usual case) are bisected, so a range edit only looks at the cues it can affect.
+        """
+        if not self.is_sorted():
+            return 0, len(self)
+        if numpy is not None:
+            first = 0 if start_ms is None else int(numpy.searchsorted(self.starts, start_ms, 'left'))
+            last = len(self) if end_ms is None else int(numpy.searchsorted(self.starts, end_ms, 'right'))
+        else:
+            first = 0 if start_ms is None else bisect_left(self.starts, start_ms)
+            last = len(self) if end_ms is None else bisect_right(self.starts, end_ms)
+        # A range that ends before it starts holds no cues
+        return first, max(first, last)
+
+    def select(self, start_ms=None, end_ms=None):
+        """Returns (first, last, mask): the mask marks which cues of [first:last] lie completely inside the range."""
+        first, last = self.span(start_ms, end_ms)
+        starts, ends = self.starts[first:last], self.ends[first:last]
+        if numpy is not None:
+            mask = numpy.ones(last - first, dtype=bool)
+            if start_ms is not None:
+                mask &= starts >= start_ms
+            if end_ms is not None:
+                mask &= ends <= end_ms
+            return first, last, mask
+        low = float('-inf') if start_ms is None else start_ms
+        high = float('inf') if end_ms is None else end_ms
+        return first, last, [start >= low and end <= high for start, end in zip(starts, ends)]
+
+    def shift(self, ms, start_ms=None, end_ms=None):
+        """Moves cues by ms (clamped at zero); with a range, only the cues inside it move."""
+        if start_ms is None and end_ms is None:
+            if numpy is not None:
+                self.starts = numpy.maximum(self.starts + ms, 0)
+                self.ends = numpy.maximum(self.ends + ms, 0)
+            else:
+                self.starts = [max(start + ms, 0) for start in self.starts]
+                self.ends = [max(end + ms, 0) for end in self.ends]
+            return self
+
+        first, last, mask = self.select(start_ms, end_ms)
+        starts, ends = self.starts[first:last], self.ends[first:last]
+        if numpy is not None:
+            self.starts[first:last] = numpy.where(mask, numpy.maximum(starts + ms, 0), starts)
+            self.ends[first:last] = numpy.where(mask, numpy.maximum(ends + ms, 0), ends)
+        else:
+            self.starts[first:last] = [max(start + ms, 0) if selected else start for start, selected in zip(starts, mask)]
+            self.ends[first:last] = [max(end + ms, 0) if selected else end for end, selected in zip(ends, mask)]
+        # Moving part of the timeline can put its starts out of order
+        self.sorted = None
+        return self
+
+    def stretch(self, factor, origin=0):
+        """Scales every time around origin, e.g. factor 25 / 23.976 to retime a 25 fps subtitle for 23.976 fps video."""
+        if numpy is not None:
+            self.starts = numpy.maximum(numpy.rint(origin + (self.starts - origin) * factor).astype(numpy.int64), 0)
+            self.ends = numpy.maximum(numpy.rint(origin + (self.ends - origin) * factor).astype(numpy.int64), 0)
+        else:
+            self.starts = [max(round(origin + (start - origin) * factor), 0) for start in self.starts]
+            self.ends = [max(round(origin + (end - origin) * factor), 0) for end in self.ends]
+        return self
+
+    def conform(self, source_fps, target_fps):
+        """Retimes cues made for video at source_fps to the same video played at target_fps, e.g. 25 -> 23.976."""
+        # Every frame is kept and only shown longer or shorter, so all times scale by the ratio of the rates
+        return self.stretch(source_fps / target_fps)
+
+    def extend(self, ms, clamp=False, next_start=None):
+        """Adds ms to every end time; with clamp, an end never runs into the next cue (next_start follows the last one)."""
+        if not clamp:
+            if numpy is not None:
+                self.ends = self.ends + ms
+            else:
+                self.ends = [end + ms for end in self.ends]
+            return self
+
+        # A cue may end at the next cue's start at the latest, but is never made shorter than it was
+        if numpy is not None:
+            limits = numpy.empty_like(self.ends)
+            limits[:-1] = self.starts[1:]
+            if len(limits):
+                limits[-1] = numpy.iinfo(numpy.int64).max if next_start is None else next_start
+            self.ends = numpy.maximum(numpy.minimum(self.ends + ms, limits), self.ends)
+        else:
+            last_limit = float('inf') if next_start is None else next_start
+            limits = list(self.starts[1:]) + [last_limit]
+            self.ends = [max(min(end + ms, limit), end) for end, limit in zip(self.ends, limits)]
+        return self
+
+def frames_to_times(frames, fps):
+    """Converts a whole sequence of frame numbers into a list of milliseconds in one vectorized pass."""
+    if numpy is not None:
+        # Same arithmetic and half-to-even rounding as frames_to_ms, so both give identical results
+        return numpy.rint(numpy.asarray(frames, dtype=numpy.float64) * 1000 / fps).astype(numpy.int64).tolist()
+    return [frames_to_ms(frame, fps) for frame in frames]
+
+def apply_in_batches(cues, operation, batch_size=BATCH_SIZE):
+    """Runs operation(timeline, next_start) over consecutive batches of a cue stream and yields the results."""
+    cues = iter(cues)
+    batch = list(islice(cues, batch_size))
+    while batch:
+        next_batch = list(islice(cues, batch_size))
+        timeline = Timeline.from_cues(batch)
+        # next_start lets operations that look at the following cue work across batch boundaries
+        operation(timeline, next_batch[0].start if next_batch else None)
+        yield from timeline.to_cues()
+        batch = next_batch
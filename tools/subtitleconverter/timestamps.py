@@ -0,0 +1,197 @@
+import re
+
+# Every tool works on integer milliseconds; this module is the only place that turns
+# timestamp text into milliseconds and back.
+
+# Frame rate used for frame-based timecodes (MicroDVD, Spruce STL, CAP) when a file does not say otherwise
+DEFAULT_FPS = 25
+
+# Frame rates by the name they are usually written as; the NTSC rates are exact fractions, not the rounded names
+FRAME_RATES = {
+    "23.976": 24000 / 1001,
+    "24": 24,
+    "25": 25,
+    "29.97": 30000 / 1001,
+    "30": 30,
+    "50": 50,
+    "60": 60,
+}
+
+TIME_PATTERN = re.compile(r'(?:(\d+):)?(\d{1,2}):(\d{1,2})(?:[.,](\d+))?')
+TIMECODE_PATTERN = re.compile(r'(\d+):(\d{2}):(\d{2})[:;](\d{2})')
+OFFSET_PATTERN = re.compile(r'(\d+(?:\.\d+)?)(h|ms|m|s|f|t)')
+# TTML clock time with frames (and optional sub-frames), e.g. 01:02:03:12 or 01:02:03:12.1
+FRAME_CLOCK_PATTERN = re.compile(r'(\d+):(\d{2}):(\d{2}):(\d+)(?:\.\d+)?')
+OFFSET_UNITS = {"h": 3600000, "m": 60000, "s": 1000, "ms": 1}
+
+# Zero-padded renderings of every two- and three-digit field, built once instead of on every format call
+PADDED_2 = tuple(f"{n:02}" for n in range(100))
+PADDED_3 = tuple(f"{n:03}" for n in range(1000))
+
+def parse_time(time_str):
+    """Parses a clock timestamp (HH:MM:SS,mmm / H:MM:SS.cc / MM:SS.xx) into milliseconds."""
+    # Fast path for the fixed-width SRT/VTT form, which is by far the most common
+    if len(time_str) == 12 and time_str[2] == ':' and time_str[5] == ':' and time_str[8] in ',.':
+        try:
+            return ((int(time_str[0:2]) * 60 + int(time_str[3:5])) * 60 + int(time_str[6:8])) * 1000 + int(time_str[9:12])
+        except ValueError:
+            pass
+    match = TIME_PATTERN.fullmatch(time_str.strip())
+    if not match:
+        raise ValueError(f"Invalid timestamp: {time_str!r}")
+    hours, minutes, seconds, fraction = match.groups()
+    ms = int(fraction.ljust(3, '0')[:3]) if fraction else 0
+    return ((int(hours or 0) * 60 + int(minutes)) * 60 + int(seconds)) * 1000 + ms
+
+def parse_times(time_strs):
+    """Parses a whole sequence of clock timestamps, such as every start time of a track, into a list of milliseconds."""
+    return [parse_time(time_str) for time_str in time_strs]
+
+def parse_time_expression(expression, fps=DEFAULT_FPS, tick_rate=1):
+    """Parses an XML time attribute: a clock value (optionally with frames) or an offset such as 12.5s, 50f or 9000t."""
+    expression = expression.strip()
+    match = OFFSET_PATTERN.fullmatch(expression)
+    if match:
+        value, unit = match.groups()
+        if unit == 'f':
+            return frames_to_ms(float(value), fps)
+        if unit == 't':
+            return int(round(float(value) * 1000 / tick_rate))
+        return int(round(float(value) * OFFSET_UNITS[unit]))
+    match = FRAME_CLOCK_PATTERN.fullmatch(expression)
+    if match:
+        hours, minutes, seconds, frames = map(int, match.groups())
+        return ((hours * 60 + minutes) * 60 + seconds) * 1000 + frames_to_ms(frames, fps)
+    return parse_time(expression)
+
+def format_time(ms, separator=',', hour_digits=2, fraction_digits=3):
+    """Formats milliseconds as a clock timestamp, e.g. 00:01:02,345 or 0:01:02.34."""
+    ms = max(ms, 0)
+    hours, ms = divmod(ms, 3600000)
+    minutes, ms = divmod(ms, 60000)
+    seconds, ms = divmod(ms, 1000)
+    if hour_digits == 2 and hours < 100:
+        hours = PADDED_2[hours]
+    else:
+        hours = f"{hours:0{hour_digits}}"
+    fraction = PADDED_3[ms] if fraction_digits == 3 else PADDED_3[ms][:fraction_digits]
+    return f"{hours}:{PADDED_2[minutes]}:{PADDED_2[seconds]}{separator}{fraction}"
+
+def format_times(ms_values, separator=',', hour_digits=2, fraction_digits=3):
+    """Formats a whole sequence of millisecond values into a list of clock timestamps."""
+    return [format_time(ms, separator, hour_digits, fraction_digits) for ms in ms_values]
+
+# Non-drop timecodes are read as clock time plus a frame count, which is how subtitle files use them.
+# Drop-frame timecodes (HH:MM:SS;FF) label 29.97 and 59.94 fps frames with 30 and 60 fps labels, skipping the
+# first labels of every minute except each tenth so they stay within a frame of the clock; they are read as
+# frame numbers instead.
+
+def parse_frame_rate(value):
+    """Parses a frame rate such as 25, '23.976', '30000/1001' or '29.97df' into (fps, drop_frame)."""
+    text = str(value).strip().lower()
+    drop_frame = text.endswith(('df', ';'))
+    text = text.rstrip('df; ')
+    try:
+        if '/' in text:
+            numerator, denominator = text.split('/')
+            fps = int(numerator) / int(denominator)
+        else:
+            fps = FRAME_RATES[text] if text in FRAME_RATES else float(text)
+    except (ValueError, ZeroDivisionError):
+        raise ValueError(f"Invalid frame rate: {value!r}") from None
+    if fps <= 0:
+        raise ValueError(f"Invalid frame rate: {value!r}")
+    # 23.976 and friends mean the NTSC fraction, so frame times do not drift over a long file
+    for nominal in (24, 30, 60):
+        if fps != nominal and abs(fps - nominal * 1000 / 1001) < 0.01:
+            fps = nominal * 1000 / 1001
+    if drop_frame and not supports_drop_frame(fps):
+        raise ValueError(f"Drop-frame timecode needs 29.97 or 59.94 fps, not {value!r}")
+    if fps == int(fps):
+        fps = int(fps)
+    return fps, drop_frame
+
+def supports_drop_frame(fps):
+    """Whether fps is one of the NTSC rates drop-frame timecode exists for (29.97 and 59.94)."""
+    return round(fps) in (30, 60) and fps != round(fps)
+
+def timecode_frame_rate(timecodes, default=DEFAULT_FPS):
+    """Guesses (fps, drop_frame) from a file's timecodes: a ';' means 29.97 drop-frame, otherwise the
+    highest frame field rules out every rate it does not fit in."""
+    highest = -1
+    for timecode in timecodes:
+        match = TIMECODE_PATTERN.fullmatch(timecode.strip())
+        if match:
+            if ';' in timecode:
+                return FRAME_RATES["29.97"], True
+            highest = max(highest, int(match.group(4)))
+    if highest < default:
+        return default, False
+    for name in ("25", "30", "50", "60"):
+        if highest < FRAME_RATES[name]:
+            return FRAME_RATES[name], False
+    raise ValueError(f"Timecode frame field {highest} does not fit any known frame rate")
+
+def parse_timecode(timecode, fps=DEFAULT_FPS, drop_frame=None):
+    """Parses a frame-based timecode (HH:MM:SS:FF, or HH:MM:SS;FF for drop-frame) into milliseconds.
+
+    drop_frame None follows the separator, as long as fps has a drop-frame form.
+    """
+    match = TIMECODE_PATTERN.fullmatch(timecode.strip())
+    if not match:
+        raise ValueError(f"Invalid timecode: {timecode!r}")
+    hours, minutes, seconds, frames = map(int, match.groups())
+    if drop_frame is None:
+        drop_frame = ';' in timecode and supports_drop_frame(fps)
+    return timecode_ms(hours, minutes, seconds, frames, fps, drop_frame)
+
+def parse_timecodes(timecodes, fps=DEFAULT_FPS, drop_frame=None):
+    """Parses a whole sequence of frame-based timecodes into a list of milliseconds."""
+    return [parse_timecode(timecode, fps, drop_frame) for timecode in timecodes]
+
+def timecode_ms(hours, minutes, seconds, frames, fps=DEFAULT_FPS, drop_frame=False):
+    """Milliseconds of the timecode with the given fields."""
+    if not drop_frame:
+        return ((hours * 60 + minutes) * 60 + seconds) * 1000 + frames_to_ms(frames, fps)
+    nominal = round(fps)
+    total_minutes = hours * 60 + minutes
+    # Two labels (four at 59.94) are skipped at the start of every minute not divisible by ten
+    number = (total_minutes * 60 + seconds) * nominal + frames
+    number -= nominal // 15 * (total_minutes - total_minutes // 10)
+    return frames_to_ms(number, fps)
+
+def format_timecode(ms, fps=DEFAULT_FPS, drop_frame=False):
+    """Formats milliseconds as a frame-based timecode (HH:MM:SS:FF, or HH:MM:SS;FF for drop-frame)."""
+    ms = max(ms, 0)
+    nominal = round(fps)
+    if drop_frame:
+        number = ms_to_frames(ms, fps)
+        dropped = nominal // 15
+        per_ten_minutes = 600 * nominal - 9 * dropped
+        tens, rest = divmod(number, per_ten_minutes)
+        # Put back the labels skipped so far to get the number the labels count
+        number += 9 * dropped * tens
+        if rest > dropped:
+            number += dropped * ((rest - dropped) // (60 * nominal - dropped))
+        seconds, frames = divmod(number, nominal)
+        separator = ';'
+    else:
+        seconds, ms = divmod(ms, 1000)
+        frames = ms_to_frames(ms, fps)
+        # The nearest frame of the last few milliseconds of a second is frame 0 of the next one
+        if frames >= nominal:
+            seconds, frames = seconds + 1, 0
+        separator = ':'
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    hours = PADDED_2[hours] if hours < 100 else str(hours)
+    return f"{hours}:{PADDED_2[minutes]}:{PADDED_2[seconds]}{separator}{PADDED_2[frames] if frames < 100 else frames}"
+
+def frames_to_ms(frames, fps=DEFAULT_FPS):
+    """Converts a frame count into milliseconds."""
+    return int(round(frames * 1000 / fps))
+
+def ms_to_frames(ms, fps=DEFAULT_FPS):
+    """Converts milliseconds into the number of the nearest frame."""
+    # Nearest rather than floor: times read from frames are rounded to whole milliseconds, often just under the frame
+    return int(round(ms * fps / 1000))
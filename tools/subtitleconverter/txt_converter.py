@@ -0,0 +1,27 @@
+import re
+from .cues import Cue
+
+# Plain text has no timing, so every paragraph is given a fixed slot
+PARAGRAPH_DURATION = 2000
+
+def read_txt(content):
+    """Parses plain text into cues, one per paragraph, laid out back to back."""
+    cues = []
+    for block in re.split(r'\n\s*\n', content.replace('\r\n', '\n').strip()):
+        if block.strip():
+            start = len(cues) * PARAGRAPH_DURATION
+            cues.append(Cue(start, start + PARAGRAPH_DURATION, block.strip()))
+    return cues
+
+def txt_chunks(cues):
+    """Yields the text of each cue as its own paragraph."""
+    for cue in cues:
+        yield f"{cue.text}\n\n"
+
+def write_txt(cues):
+    """Serializes the cue text as plain paragraphs."""
+    return ''.join(txt_chunks(cues))
+
+def convert_to_txt(content, format):
+    from .formats import convert
+    return convert(content, format, "txt")
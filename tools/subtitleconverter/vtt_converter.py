@@ -1,199 +1,42 @@
 import re
-
-def srt_to_vtt(content):
-    # Add WEBVTT header and replace SRT timestamps with VTT timestamps
-    vtt_content = "WEBVTT\n\n"
-    vtt_content += re.sub(r'(\d{2}):(\d{2}):(\d{2}),(\d{3})', r'\1:\2:\3.\4', content)
-    return vtt_content
-
-def ass_to_vtt(content):
-    # Convert ASS format to VTT format
-    vtt_content = "WEBVTT\n\n"
-    events_section = False
-    for line in content.splitlines():
-        if line.strip().startswith("[Events]"):
-            events_section = True
+from .cues import Cue
+from .timestamps import parse_times, format_time
+
+TIMING_PATTERN = re.compile(r'\s*(\S+)\s*-->\s*(\S+)')
+
+def read_vtt(content):
+    """Parses WebVTT content into a list of cues."""
+    timings, texts = [], []
+    for block in re.split(r'\n\s*\n', content.replace('\r\n', '\n').strip()):
+        lines = block.split('\n')
+        # Skip the header, NOTE/STYLE/REGION blocks and optional cue identifiers
+        while lines and '-->' not in lines[0]:
+            lines = lines[1:]
+        if not lines:
             continue
-        if events_section and line.strip().startswith("Dialogue:"):
-            parts = line.split(',', 9)
-            start_time = parts[1].replace('.', ':')
-            end_time = parts[2].replace('.', ':')
-            text = parts[9].replace(r'\N', '\n').replace(r'{\\', '').replace('}', '')
-            vtt_content += f"{start_time} --> {end_time}\n{text}\n\n"
-    return vtt_content
-
-def sub_to_vtt(content):
-    # Convert SUB format to VTT format
-    vtt_content = "WEBVTT\n\n"
-    for index, line in enumerate(content.splitlines()):
-        if line.strip().isdigit():
-            vtt_content += f"{line}\n"
-        elif re.match(r'\d{2}:\d{2}:\d{2}:\d{2}', line):
-            start_time, end_time = line.split(',')
-            vtt_content += f"{start_time.replace(':', '.', 1)} --> {end_time.replace(':', '.', 1)}\n"
-        else:
-            vtt_content += f"{line}\n"
-    return vtt_content
-
-def txt_to_vtt(content):
-    # Example logic for converting TXT to VTT
-    vtt_content = "WEBVTT\n\n"
-    lines = content.splitlines()
-    for i in range(0, len(lines), 2):
-        if i + 1 < len(lines):
-            vtt_content += f"{i//2 + 1}\n"
-            vtt_content += f"{lines[i]}\n{lines[i+1]}\n\n"
-    return vtt_content
-
-def ssa_to_vtt(content):
-    # Convert SSA format to VTT format
-    vtt_content = "WEBVTT\n\n"
-    events_section = False
-    for line in content.splitlines():
-        if line.strip().startswith("[Events]"):
-            events_section = True
+        match = TIMING_PATTERN.match(lines[0])
+        if not match:
             continue
-        if events_section and line.strip().startswith("Dialogue:"):
-            parts = line.split(',', 9)
-            start_time = parts[1].replace('.', ':')
-            end_time = parts[2].replace('.', ':')
-            text = parts[9].replace(r'\N', '\n').replace(r'{\\', '').replace('}', '')
-            vtt_content += f"{start_time} --> {end_time}\n{text}\n\n"
-    return vtt_content
-
-def sbv_to_vtt(content):
-    # Convert SBV format to VTT format
-    vtt_content = "WEBVTT\n\n"
-    for index, line in enumerate(content.splitlines()):
-        if re.match(r'\d{2}:\d{2}:\d{2}\.\d{3},\d{2}:\d{2}:\d{2}\.\d{3}', line):
-            start_time, end_time = line.split(',')
-            vtt_content += f"{index + 1}\n"
-            vtt_content += f"{start_time.replace('.', ':')} --> {end_time.replace('.', ':')}\n"
-        else:
-            vtt_content += f"{line}\n"
-    return vtt_content
-
-def dfxp_to_vtt(content):
-    # Convert DFXP (TTML) format to VTT format
-    vtt_content = "WEBVTT\n\n"
-    matches = re.findall(r'<p begin="([^"]+)" end="([^"]+)"[^>]*>(.*?)</p>', content, re.DOTALL)
-    for index, (start, end, text) in enumerate(matches):
-        start_time = start.replace('.', ':')
-        end_time = end.replace('.', ':')
-        text = re.sub(r'<[^>]+>', '', text)  # Remove HTML tags
-        vtt_content += f"{index + 1}\n"
-        vtt_content += f"{start_time} --> {end_time}\n{text}\n\n"
-    return vtt_content
-
-def stl_to_vtt(content):
-    # Convert STL format to VTT format
-    vtt_content = "WEBVTT\n\n"
-    matches = re.findall(r'TC_IN="([^"]+)" TC_OUT="([^"]+)"[^>]*>(.*?)</Subtitle>', content, re.DOTALL)
-    for index, (start, end, text) in enumerate(matches):
-        start_time = start.replace('.', ':')
-        end_time = end.replace('.', ':')
-        text = re.sub(r'<[^>]+>', '', text)  # Remove HTML tags
-        vtt_content += f"{index + 1}\n"
-        vtt_content += f"{start_time} --> {end_time}\n{text}\n\n"
-    return vtt_content
-
-def mpl_to_vtt(content):
-    # Convert MPL format to VTT format
-    vtt_content = "WEBVTT\n\n"
-    matches = re.findall(r'\[(\d+)\]\s*(\d{2}:\d{2}:\d{2}:\d{2})\s*-\s*(\d{2}:\d{2}:\d{2}:\d{2})\s*(.*)', content)
-    for index, (num, start, end, text) in enumerate(matches):
-        start_time = start.replace(':', '.', 1)
-        end_time = end.replace(':', '.', 1)
-        vtt_content += f"{index + 1}\n"
-        vtt_content += f"{start_time} --> {end_time}\n{text}\n\n"
-    return vtt_content
-
-def usf_to_vtt(content):
-    # Convert USF format to VTT format
-    vtt_content = "WEBVTT\n\n"
-    matches = re.findall(r'<subtitle start="([^"]+)" end="([^"]+)"[^>]*>(.*?)</subtitle>', content, re.DOTALL)
-    for index, (start, end, text) in enumerate(matches):
-        start_time = start.replace('.', ':')
-        end_time = end.replace('.', ':')
-        text = re.sub(r'<[^>]+>', '', text)  # Remove HTML tags
-        vtt_content += f"{index + 1}\n"
-        vtt_content += f"{start_time} --> {end_time}\n{text}\n\n"
-    return vtt_content
-
-def lrc_to_vtt(content):
-    # Convert LRC format to VTT format
-    vtt_content = "WEBVTT\n\n"
-    matches = re.findall(r'\[(\d{2}):(\d{2})\.(\d{2})\](.*)', content)
-    for index, (minutes, seconds, centiseconds, text) in enumerate(matches):
-        start_time = f"00:{minutes}:{seconds}.{centiseconds}00"
-        end_time = f"00:{minutes}:{int(seconds)+1}.{centiseconds}00"
-        vtt_content += f"{index + 1}\n"
-        vtt_content += f"{start_time} --> {end_time}\n{text}\n\n"
-    return vtt_content
-
-def rt_to_vtt(content):
-    # Convert RT format to VTT format
-    vtt_content = "WEBVTT\n\n"
-    matches = re.findall(r'<Time begin="([^"]+)" end="([^"]+)"[^>]*>(.*?)</Time>', content, re.DOTALL)
-    for index, (start, end, text) in enumerate(matches):
-        start_time = start.replace('.', ':')
-        end_time = end.replace('.', ':')
-        text = re.sub(r'<[^>]+>', '', text)  # Remove HTML tags
-        vtt_content += f"{index + 1}\n"
-        vtt_content += f"{start_time} --> {end_time}\n{text}\n\n"
-    return vtt_content
-
-def ttml_to_vtt(content):
-    # Convert TTML format to VTT format
-    vtt_content = "WEBVTT\n\n"
-    matches = re.findall(r'<p begin="([^"]+)" end="([^"]+)"[^>]*>(.*?)</p>', content, re.DOTALL)
-    for index, (start, end, text) in enumerate(matches):
-        start_time = start.replace('.', ':')
-        end_time = end.replace('.', ':')
-        text = re.sub(r'<[^>]+>', '', text)  # Remove HTML tags
-        vtt_content += f"{index + 1}\n"
-        vtt_content += f"{start_time} --> {end_time}\n{text}\n\n"
-    return vtt_content
-
-def cap_to_vtt(content):
-    # Convert CAP format to VTT format
-    vtt_content = "WEBVTT\n\n"
-    matches = re.findall(r'(\d{2}:\d{2}:\d{2}:\d{2})\s*-\s*(\d{2}:\d{2}:\d{2}:\d{2})\s*(.*)', content)
-    for index, (start, end, text) in enumerate(matches):
-        start_time = start.replace(':', '.', 1)
-        end_time = end.replace(':', '.', 1)
-        vtt_content += f"{index + 1}\n"
-        vtt_content += f"{start_time} --> {end_time}\n{text}\n\n"
-    return vtt_content
+        timings.append(match.groups())
+        texts.append('\n'.join(lines[1:]))
+    return cues_from_timings(timings, texts)
+
+def cues_from_timings(timings, texts):
+    """Cues from (start, end) timestamp strings and their texts, parsing all the times in one go."""
+    starts = parse_times(start for start, _ in timings)
+    ends = parse_times(end for _, end in timings)
+    return [Cue(start, end, text) for start, end, text in zip(starts, ends, texts)]
+
+def vtt_chunks(cues):
+    """Yields the WEBVTT header followed by one block per cue."""
+    yield "WEBVTT\n\n"
+    for cue in cues:
+        yield f"{format_time(cue.start, '.')} --> {format_time(cue.end, '.')}\n{cue.text}\n\n"
+
+def write_vtt(cues):
+    """Serializes cues as WebVTT content."""
+    return ''.join(vtt_chunks(cues))
 
 def convert_to_vtt(content, format):
-    if format == "srt":
-        return srt_to_vtt(content)
-    elif format == "ass":
-        return ass_to_vtt(content)
-    elif format == "sub":
-        return sub_to_vtt(content)
-    elif format == "txt":
-        return txt_to_vtt(content)
-    elif format == "ssa":
-        return ssa_to_vtt(content)
-    elif format == "sbv":
-        return sbv_to_vtt(content)
-    elif format == "dfxp":
-        return dfxp_to_vtt(content)
-    elif format == "stl":
-        return stl_to_vtt(content)
-    elif format == "mpl":
-        return mpl_to_vtt(content)
-    elif format == "usf":
-        return usf_to_vtt(content)
-    elif format == "lrc":
-        return lrc_to_vtt(content)
-    elif format == "rt":
-        return rt_to_vtt(content)
-    elif format == "ttml":
-        return ttml_to_vtt(content)
-    elif format == "cap":
-        return cap_to_vtt(content)
-    else:
-        raise ValueError(f"Unsupported format: {format}")
\ No newline at end of file
+    from .formats import convert
+    return convert(content, format, "vtt")
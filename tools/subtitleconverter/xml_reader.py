@@ -0,0 +1,71 @@
+import re
+from xml.parsers import expat
+
+# Incremental XML reading shared by the TTML/DFXP, USF, RealText and STL readers. The document is fed to expat
+# in chunks and handlers pick the cues out as elements open and close, without building a tree, so memory
+# holds only the cue being read. Malformed documents raise expat.ExpatError.
+
+CHUNK_SIZE = 65536
+# Line breaks in the source, with the indentation around them
+SOURCE_BREAK_PATTERN = re.compile(r'\s*\n\s*')
+
+def local_name(name):
+    """Tag or attribute name without its namespace, e.g. 'http://www.w3.org/ns/ttml}p' -> 'p'."""
+    return name.rpartition('}')[2]
+
+def parse(content, start, end, data, collected):
+    """Runs content through expat with the given element handlers, yielding what they add to collected as it comes."""
+    # Expat refuses anything, even whitespace, before the XML declaration
+    content = content.lstrip('\ufeff \t\r\n')
+    parser = expat.ParserCreate(namespace_separator='}')
+    parser.buffer_text = True
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.CharacterDataHandler = data
+    for position in range(0, len(content), CHUNK_SIZE):
+        parser.Parse(content[position:position + CHUNK_SIZE], False)
+        yield from collected
+        collected.clear()
+    # Raises for truncated or empty documents
+    parser.Parse('', True)
+    yield from collected
+    collected.clear()
+
+def segments_text(segments, collapse=False):
+    """Joins the text gathered for a cue, one segment per <br/>-separated line, into plain cue text.
+
+    With collapse, line breaks in the source become spaces, as in TTML where only <br/> breaks a line;
+    otherwise they are kept.
+    """
+    lines = [''.join(segment) for segment in segments]
+    if collapse:
+        lines = [SOURCE_BREAK_PATTERN.sub(' ', line) if '\n' in line else line for line in lines]
+    text = '\n'.join(lines)
+    return '\n'.join(line.strip() for line in text.strip().splitlines())
+
+def cue_elements(content, name):
+    """Yields (attributes, text) for every element whose local name is name (any case); attribute names are lowercased."""
+    name = name.lower()
+    collected = []
+    current = None  # (attributes, text segments) of the cue element being read
+
+    def start(tag, attributes):
+        nonlocal current
+        tag = local_name(tag).lower()
+        if current is not None:
+            if tag == 'br':
+                current[1].append([])
+        elif tag == name:
+            current = ({local_name(key).lower(): value for key, value in attributes.items()}, [[]])
+
+    def end(tag):
+        nonlocal current
+        if current is not None and local_name(tag).lower() == name:
+            collected.append((current[0], segments_text(current[1])))
+            current = None
+
+    def data(text):
+        if current is not None:
+            current[1][-1].append(text)
+
+    return parse(content, start, end, data, collected)